@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""Load benchmark of the sync and async OAI-PMH record views.
+
+Compares one sync worker, which serves requests one at a time, with one
+ASGI event loop serving the async variants concurrently. The database is
+simulated by a fixed latency on the record fetch; the XSLT transformation
+is real. Each request targets a distinct record so the rendering caches
+are bypassed.
+
+Run from the repository root:
+
+    python benchmarks/async_views.py --view detail --requests 200 \\
+        --concurrency 50 --db-latency 0.02 --xml-size 2000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.test_settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from asgiref.sync import ThreadSensitiveContext  # noqa: E402
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from core_explore_oaipmh_app.rest.result import (  # noqa: E402
+    views as result_views,
+)
+from core_explore_oaipmh_app.views.user import ajax as user_ajax  # noqa: E402
+
+VIEWS = {
+    "detail": (
+        user_ajax,
+        user_ajax.change_data_display,
+        user_ajax.change_data_display_async,
+    ),
+    "result": (
+        result_views,
+        result_views.get_result_from_data_id,
+        result_views.get_result_from_data_id_async,
+    ),
+}
+
+
+def build_record(record_id, xml_size):
+    """Build an in-memory record with xml_size elements"""
+    xml_content = "<root>{0}</root>".format(
+        "".join(
+            f"<item><name>item {index}</name><value>{index}</value></item>"
+            for index in range(xml_size)
+        )
+    )
+    return SimpleNamespace(
+        id=record_id,
+        last_modification_date=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        harvester_metadata_format=SimpleNamespace(
+            template=SimpleNamespace(id=None, hash="benchmark")
+        ),
+        harvester_metadata_format_id=1,
+        xml_content=xml_content,
+        content=xml_content,
+    )
+
+
+def build_request(view_name, record_id):
+    """Build the request of a view"""
+    factory = RequestFactory()
+    if view_name == "detail":
+        request = factory.post("/", data={"data_id": record_id})
+    else:
+        request = factory.get("/", data={"id": record_id})
+    request.user = AnonymousUser()
+
+    async def auser():
+        return request.user
+
+    request.auser = auser
+    return request
+
+
+def get_by_id_with_latency(records, db_latency):
+    """Return a get_by_id simulating the database latency"""
+
+    def get_by_id(record_id, user):
+        time.sleep(db_latency)
+        return records[int(record_id)]
+
+    return get_by_id
+
+
+def run_sync(view, view_name, nb_requests):
+    """Serve the requests one at a time, like a sync worker"""
+    latencies = []
+    start = time.perf_counter()
+    for record_id in range(nb_requests):
+        request_start = time.perf_counter()
+        response = view(build_request(view_name, record_id))
+        assert response.status_code == 200, response.content
+        latencies.append(time.perf_counter() - request_start)
+    return time.perf_counter() - start, latencies
+
+
+async def run_async(view, view_name, nb_requests, concurrency):
+    """Serve the requests from one event loop, like an ASGI worker"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def serve(record_id):
+        async with semaphore:
+            # same isolation of the sync code as Django's ASGI handler
+            async with ThreadSensitiveContext():
+                request_start = time.perf_counter()
+                response = await view(build_request(view_name, record_id))
+                assert response.status_code == 200, response.content
+                latencies.append(time.perf_counter() - request_start)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(serve(record_id) for record_id in range(nb_requests))
+    )
+    return time.perf_counter() - start, latencies
+
+
+def report(name, total_time, latencies):
+    """Print the results of a run"""
+    latencies = sorted(latencies)
+    print(
+        f"{name:>6}: {len(latencies) / total_time:8.1f} req/s, "
+        f"p50 {statistics.median(latencies) * 1000:8.1f} ms, "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:8.1f} ms"
+    )
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--view", choices=sorted(VIEWS), default="detail")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-latency", type=float, default=0.02)
+    parser.add_argument("--xml-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    module, sync_view, async_view = VIEWS[args.view]
+    records = [
+        build_record(record_id, args.xml_size)
+        for record_id in range(args.requests)
+    ]
+    with patch.object(
+        module.oai_record_api,
+        "get_by_id",
+        get_by_id_with_latency(records, args.db_latency),
+    ), patch(
+        # no template: the default XSLT is used, without database access
+        "core_explore_oaipmh_app.utils.xslt.template_xsl_rendering_api"
+    ) as mock_template_xsl_rendering_api:
+        mock_template_xsl_rendering_api.get_by_template_hash.side_effect = (
+            Exception("no rendering")
+        )
+        report("sync", *run_sync(sync_view, args.view, args.requests))
+        report(
+            "async",
+            *asyncio.run(
+                run_async(
+                    async_view, args.view, args.requests, args.concurrency
+                )
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
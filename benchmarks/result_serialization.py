@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Microbenchmark of the per-row cost of the OAI-PMH search results.
+
+Compares building a core_explore_common_app Result model instance and
+serializing it with the ResultSerializer, with building an OaiPmhResult and
+serializing it with serialize_result. Reports the time and the memory
+allocated per row.
+
+Run from the repository root:
+
+    python benchmarks/result_serialization.py --rows 10000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.test_settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from core_explore_common_app.components.result.models import (  # noqa: E402
+    Result,
+)
+from core_explore_common_app.rest.result.serializers import (  # noqa: E402
+    ResultSerializer,
+)
+from core_explore_oaipmh_app.utils.result import (  # noqa: E402
+    OaiPmhResult,
+    serialize_result,
+)
+
+TEMPLATE_INFO = {"id": 1, "name": "oai_dc", "hash": "hash", "format": "XSD"}
+
+
+def build_values(row):
+    """Build the values of a result, like format_oaipmh_results"""
+    return {
+        "title": f"Record {row}",
+        "content": f"<record><title>Record {row}</title></record>",
+        "template_info": TEMPLATE_INFO,
+        "permission_url": None,
+        "detail_url": f"/data?id={row}",
+        "last_modification_date": datetime(2020, 1, 1, tzinfo=timezone.utc),
+        "access_data_url": f"/rest/result?id={row}",
+    }
+
+
+def run_model(values_list):
+    """Result model and ResultSerializer"""
+    return [ResultSerializer(Result(**values)).data for values in values_list]
+
+
+def run_slotted(values_list):
+    """OaiPmhResult and serialize_result"""
+    return [serialize_result(OaiPmhResult(**values)) for values in values_list]
+
+
+def measure(func, values_list, repeat):
+    """Return the best time and the allocated memory per row"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(values_list)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(values_list)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings) / len(values_list), peak / len(values_list)
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    values_list = [build_values(row) for row in range(args.rows)]
+    assert run_model(values_list[:1]) == run_slotted(values_list[:1])
+
+    for name, func in (("model", run_model), ("slotted", run_slotted)):
+        time_per_row, memory_per_row = measure(func, values_list, args.repeat)
+        print(
+            f"{name:>7}: {time_per_row * 1e6:8.2f} us/row, "
+            f"{memory_per_row:8.0f} B/row"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Apps file for setting core_explore_oaipmh_app when app is ready"""
+
+import sys
+
+from django.apps import AppConfig
+
+
+class ExploreOaiPmhAppConfig(AppConfig):
+    """Core explore OAI-PMH application settings"""
+
+    name = "core_explore_oaipmh_app"
+    verbose_name = "Core Explore OAI-PMH App"
+
+    def ready(self):
+        """Run when the app is ready.
+
+        Returns:
+
+        """
+        from core_explore_oaipmh_app.components.data_version import (
+            watch as data_version_watch,
+        )
+        from core_explore_oaipmh_app.components.oai_harvester_metadata_format import (
+            watch as oai_harvester_metadata_format_watch,
+        )
+        from core_explore_oaipmh_app.components.oai_record import (
+            watch as oai_record_watch,
+        )
+        from core_explore_oaipmh_app.components.oai_registry import (
+            watch as oai_registry_watch,
+        )
+        from core_explore_oaipmh_app.settings import (
+            EXPLORE_OAIPMH_DATA_VERSION,
+            EXPLORE_OAIPMH_PAGE_CACHE,
+            EXPLORE_OAIPMH_PRERENDER,
+            EXPLORE_OAIPMH_XSLT_POOL_WARM_UP,
+        )
+        from core_explore_oaipmh_app.utils import xslt as xslt_utils
+
+        if "migrate" not in sys.argv and "makemigrations" not in sys.argv:
+            oai_registry_watch.init()
+            oai_harvester_metadata_format_watch.init()
+            if EXPLORE_OAIPMH_DATA_VERSION or EXPLORE_OAIPMH_PAGE_CACHE:
+                data_version_watch.init()
+            if EXPLORE_OAIPMH_PRERENDER:
+                oai_record_watch.init()
+            if EXPLORE_OAIPMH_XSLT_POOL_WARM_UP:
+                xslt_utils.init()
@@ -0,0 +1,210 @@
+"""Data version api: version of the records harvested from each registry and
+for each metadata format. Versions only increase, caches fold them in their
+keys instead of relying on short timeouts.
+"""
+
+import threading
+import time
+
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_DATA_VERSION_BATCH_INTERVAL,
+    EXPLORE_OAIPMH_DATA_VERSION_CACHE_BACKEND,
+)
+from core_explore_oaipmh_app.utils.cache import get_cache
+
+REGISTRY_KEY = "registry:{}"
+METADATA_FORMAT_KEY = "metadata_format:{}"
+
+# bumps pending for the registries being harvested by this process
+_batches = dict()
+_batches_lock = threading.Lock()
+
+
+def _get_cache():
+    """Return the data version cache. Versions are bumped by the harvester
+    and read by the web server processes: the cache has to be shared.
+
+    Returns:
+
+    """
+    return get_cache(
+        "data_version", backend=EXPLORE_OAIPMH_DATA_VERSION_CACHE_BACKEND
+    )
+
+
+def _get_initial_version():
+    """Return the version of a registry or metadata format without version.
+    Versions start from the current time, so that a version lost by the
+    cache doesn't come back to a previous value.
+
+    Returns:
+
+    """
+    return time.time_ns() // 1000
+
+
+def _get_versions(key_format, object_ids):
+    """Return the versions of a list of objects, in a single cache call.
+
+    Args:
+        key_format: Key of the version of an object.
+        object_ids:
+
+    Returns:
+        Dict {object_id: version}
+
+    """
+    cache = _get_cache()
+    keys = {
+        key_format.format(object_id): object_id for object_id in object_ids
+    }
+    versions = {
+        keys[key]: version for key, version in cache.get_many(keys).items()
+    }
+    for key, object_id in keys.items():
+        if object_id not in versions:
+            versions[object_id] = cache.incr(key, _get_initial_version())
+    return versions
+
+
+def get_versions(registry_ids):
+    """Return the data version of each registry. The version increases every
+    time records of the registry are harvested or deleted.
+
+    Args:
+        registry_ids: List of registry ids.
+
+    Returns:
+        Dict {registry_id: version}
+
+    """
+    return _get_versions(REGISTRY_KEY, registry_ids)
+
+
+def get_metadata_format_versions(metadata_format_ids):
+    """Return the data version of each metadata format. The version increases
+    every time the metadata format or its records change.
+
+    Args:
+        metadata_format_ids: List of metadata format ids.
+
+    Returns:
+        Dict {metadata_format_id: version}
+
+    """
+    return _get_versions(METADATA_FORMAT_KEY, metadata_format_ids)
+
+
+def bump_versions(registry_ids=(), metadata_format_ids=()):
+    """Increase the data version of registries and metadata formats.
+
+    Args:
+        registry_ids:
+        metadata_format_ids:
+
+    Returns:
+
+    """
+    cache = _get_cache()
+    for registry_id in set(registry_ids):
+        cache.incr(REGISTRY_KEY.format(registry_id), _get_initial_version())
+    for metadata_format_id in set(metadata_format_ids):
+        cache.incr(
+            METADATA_FORMAT_KEY.format(metadata_format_id),
+            _get_initial_version(),
+        )
+
+
+class _Batch:
+    """Bumps pending for a registry being harvested"""
+
+    __slots__ = ("registry_changed", "metadata_format_ids", "flushed_at")
+
+    def __init__(self):
+        self.registry_changed = False
+        self.metadata_format_ids = set()
+        self.flushed_at = time.monotonic()
+
+    def pop(self):
+        """Return and reset the pending bumps"""
+        pending = (self.registry_changed, self.metadata_format_ids)
+        self.registry_changed = False
+        self.metadata_format_ids = set()
+        self.flushed_at = time.monotonic()
+        return pending
+
+
+def _flush(registry_id, pending):
+    """Bump the pending versions of a registry.
+
+    Args:
+        registry_id:
+        pending: (registry_changed, metadata_format_ids)
+
+    Returns:
+
+    """
+    registry_changed, metadata_format_ids = pending
+    if registry_changed or metadata_format_ids:
+        bump_versions([registry_id], metadata_format_ids)
+
+
+def start_batch(registry_id):
+    """Start batching the bumps of a registry: during a harvest, versions
+    are bumped at most every EXPLORE_OAIPMH_DATA_VERSION_BATCH_INTERVAL
+    seconds, and at the end of the harvest.
+
+    Args:
+        registry_id:
+
+    Returns:
+
+    """
+    with _batches_lock:
+        _batches.setdefault(registry_id, _Batch())
+
+
+def end_batch(registry_id):
+    """Stop batching the bumps of a registry, bump the pending versions.
+
+    Args:
+        registry_id:
+
+    Returns:
+
+    """
+    with _batches_lock:
+        batch = _batches.pop(registry_id, None)
+        pending = batch.pop() if batch is not None else (False, set())
+    _flush(registry_id, pending)
+
+
+def notify_change(registry_id, metadata_format_id=None):
+    """Bump the versions of a registry and of a metadata format after a
+    change of their records, or batch the bumps if the registry is being
+    harvested.
+
+    Args:
+        registry_id:
+        metadata_format_id:
+
+    Returns:
+
+    """
+    metadata_format_ids = (
+        {metadata_format_id} if metadata_format_id is not None else set()
+    )
+    with _batches_lock:
+        batch = _batches.get(registry_id, None)
+        if batch is None:
+            pending = (True, metadata_format_ids)
+        else:
+            batch.registry_changed = True
+            batch.metadata_format_ids.update(metadata_format_ids)
+            pending = (
+                batch.pop()
+                if time.monotonic() - batch.flushed_at
+                >= EXPLORE_OAIPMH_DATA_VERSION_BATCH_INTERVAL
+                else (False, set())
+            )
+    _flush(registry_id, pending)
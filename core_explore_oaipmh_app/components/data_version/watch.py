@@ -0,0 +1,101 @@
+"""Signals to trigger after OaiRecord, OaiHarvesterMetadataFormat,
+OaiRegistry and Template modifications, for the data versions."""
+
+from django.db.models.signals import post_save, post_delete, pre_delete
+
+from core_explore_oaipmh_app.components.data_version import (
+    api as data_version_api,
+)
+from core_main_app.components.template.models import Template
+from core_oaipmh_harvester_app.components.oai_harvester_metadata_format.models import (
+    OaiHarvesterMetadataFormat,
+)
+from core_oaipmh_harvester_app.components.oai_record.models import OaiRecord
+from core_oaipmh_harvester_app.components.oai_registry.models import (
+    OaiRegistry,
+)
+
+
+def init():
+    """Connect to OaiRecord, OaiHarvesterMetadataFormat, OaiRegistry and
+    Template object events."""
+    post_save.connect(bump_record_versions, sender=OaiRecord)
+    post_delete.connect(bump_record_versions, sender=OaiRecord)
+    post_save.connect(
+        bump_metadata_format_versions, sender=OaiHarvesterMetadataFormat
+    )
+    post_delete.connect(
+        bump_metadata_format_versions, sender=OaiHarvesterMetadataFormat
+    )
+    post_save.connect(batch_harvest_bumps, sender=OaiRegistry)
+    # metadata formats are unlinked from a deleted template without signal
+    pre_delete.connect(bump_template_versions, sender=Template)
+
+
+def bump_record_versions(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Bump the data versions of the registry and of the metadata format of
+    a record when the record is saved (harvested) or deleted.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    if instance.registry_id is not None:
+        data_version_api.notify_change(
+            instance.registry_id, instance.harvester_metadata_format_id
+        )
+
+
+def bump_metadata_format_versions(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Bump the data versions of a metadata format and of its registry when
+    the metadata format is saved or deleted.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    if instance.registry_id is not None:
+        data_version_api.notify_change(instance.registry_id, instance.id)
+
+
+def batch_harvest_bumps(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Batch the bumps of a registry while it is harvested: the harvester
+    saves the registry before and after harvesting it.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    if instance.is_harvesting:
+        data_version_api.start_batch(instance.id)
+    else:
+        data_version_api.end_batch(instance.id)
+
+
+def bump_template_versions(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Bump the data versions of the metadata formats mapped to a template,
+    and of their registries, before the template is deleted.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    metadata_formats = OaiHarvesterMetadataFormat.objects.filter(
+        template=instance
+    ).values_list("id", "registry_id")
+    data_version_api.bump_versions(
+        [registry_id for _, registry_id in metadata_formats],
+        [metadata_format_id for metadata_format_id, _ in metadata_formats],
+    )
@@ -0,0 +1,124 @@
+"""Template to OaiHarvesterMetadataFormat index api"""
+
+import uuid
+
+from core_explore_oaipmh_app.components.oai_registry import (
+    api as oai_registry_cache_api,
+)
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_CACHE_BACKEND,
+    EXPLORE_OAIPMH_CACHE_TIMEOUT,
+)
+from core_explore_oaipmh_app.utils.cache import get_cache
+from core_oaipmh_harvester_app.components.oai_harvester_metadata_format import (
+    api as oai_harvester_metadata_format_api,
+)
+
+GENERATION_KEY = "generation"
+
+
+def _get_cache():
+    """Return the metadata format index cache
+
+    Returns:
+
+    """
+    return get_cache(
+        "oai_harvester_metadata_format",
+        backend=EXPLORE_OAIPMH_CACHE_BACKEND,
+        timeout=EXPLORE_OAIPMH_CACHE_TIMEOUT,
+        max_size=16,
+    )
+
+
+def _build_template_index(registry_ids):
+    """Build the index of the metadata formats of the given registries.
+
+    Args:
+        registry_ids: List of registry ids.
+
+    Returns:
+        Dict {template_id: {registry_id: [metadata_format_id, ...]}}
+
+    """
+    template_index = dict()
+    metadata_format_rows = (
+        oai_harvester_metadata_format_api.get_all_by_list_registry_ids(
+            registry_ids
+        ).values_list("registry_id", "template_id", "id")
+    )
+    for registry_id, template_id, metadata_format_id in metadata_format_rows:
+        if template_id is None:
+            continue
+        template_index.setdefault(str(template_id), dict()).setdefault(
+            registry_id, []
+        ).append(metadata_format_id)
+    return template_index
+
+
+def get_template_index():
+    """Return the index of the metadata formats of the activated registries,
+    by template and by registry. The index is rebuilt when the activated
+    registries or the metadata formats change.
+
+    Returns:
+        Dict {template_id: {registry_id: [metadata_format_id, ...]}}
+
+    """
+    cache = _get_cache()
+    index_key = f"template_index:{oai_registry_cache_api.get_generation()}"
+    template_index = cache.get(index_key)
+    if template_index is None:
+        template_index = _build_template_index(
+            oai_registry_cache_api.get_activated_registry_ids()
+        )
+        cache.set(index_key, template_index)
+    return template_index
+
+
+def get_metadata_format_ids_by_templates(template_ids, registry_ids):
+    """Return the ids of the metadata formats of the given registries that
+    use one of the given templates.
+
+    Args:
+        template_ids: List of template ids.
+        registry_ids: List of activated registry ids.
+
+    Returns:
+        List of metadata format ids.
+
+    """
+    template_index = get_template_index()
+    metadata_format_ids = []
+    for template_id in template_ids:
+        registry_index = template_index.get(str(template_id), {})
+        for registry_id in registry_ids:
+            metadata_format_ids.extend(registry_index.get(registry_id, []))
+    return metadata_format_ids
+
+
+def get_generation():
+    """Return the generation of the metadata formats. The generation changes
+    every time the index is invalidated.
+
+    Returns:
+        Generation token (str).
+
+    """
+    cache = _get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        cache.set(GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def invalidate():
+    """Invalidate the metadata format index.
+
+    Returns:
+
+    """
+    cache = _get_cache()
+    cache.clear()
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
@@ -0,0 +1,83 @@
+"""Signals to trigger after OaiHarvesterMetadataFormat modifications."""
+
+from django.db.models.signals import post_init, post_save, post_delete
+
+from core_explore_oaipmh_app.components.oai_harvester_metadata_format import (
+    api as metadata_format_index_api,
+)
+from core_explore_oaipmh_app.utils.watch import (
+    have_fields_changed,
+    keep_field_values,
+)
+from core_main_app.components.template.models import Template
+from core_oaipmh_harvester_app.components.oai_harvester_metadata_format.models import (
+    OaiHarvesterMetadataFormat,
+)
+
+# metadata format fields read by the index, the other fields (last_update,
+# raw...) change on every harvest
+INDEXED_FIELDS = ("registry_id", "template_id")
+
+
+def init():
+    """Connect to OaiHarvesterMetadataFormat and Template object events."""
+    post_init.connect(keep_indexed_values, sender=OaiHarvesterMetadataFormat)
+    post_save.connect(
+        invalidate_changed_metadata_format_index,
+        sender=OaiHarvesterMetadataFormat,
+    )
+    post_delete.connect(
+        invalidate_metadata_format_index, sender=OaiHarvesterMetadataFormat
+    )
+    # metadata formats are unlinked from a deleted template without signal
+    post_delete.connect(invalidate_metadata_format_index, sender=Template)
+
+
+def keep_indexed_values(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Keep the values of the indexed fields of a metadata format when it is
+    loaded.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    keep_field_values(instance, INDEXED_FIELDS)
+
+
+def invalidate_changed_metadata_format_index(
+    sender,
+    instance,
+    created=False,
+    update_fields=None,
+    **kwargs,  # noqa, pylint: disable=unused-argument
+):
+    """Invalidate the metadata format index when a metadata format is
+    created, or moved to another registry or template. The saves of the
+    harvest state keep the index.
+
+    Args:
+        sender:
+        instance:
+        created:
+        update_fields:
+        kwargs:
+    """
+    if have_fields_changed(instance, INDEXED_FIELDS, created, update_fields):
+        metadata_format_index_api.invalidate()
+
+
+def invalidate_metadata_format_index(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Invalidate the metadata format index when a metadata format or a
+    template is deleted.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    metadata_format_index_api.invalidate()
@@ -0,0 +1,34 @@
+"""Signals to trigger after OaiRecord modifications."""
+
+import logging
+
+from django.db.models.signals import post_save
+
+from core_explore_oaipmh_app.utils.rendering import prerender_record_detail
+from core_oaipmh_harvester_app.components.oai_record.models import OaiRecord
+
+logger = logging.getLogger(__name__)
+
+
+def init():
+    """Connect to OaiRecord object events."""
+    post_save.connect(prerender_record, sender=OaiRecord)
+
+
+def prerender_record(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Render the detail HTML of a record when it is saved by the harvester.
+    A rendering failure must not fail the harvest.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    try:
+        prerender_record_detail(instance)
+    except Exception as exception:
+        logger.warning(
+            f"Pre-rendering of record {instance.id} failed: {str(exception)}"
+        )
@@ -0,0 +1,98 @@
+"""Activated OaiRegistry cache api"""
+
+import uuid
+
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_CACHE_BACKEND,
+    EXPLORE_OAIPMH_CACHE_TIMEOUT,
+)
+from core_explore_oaipmh_app.utils.cache import get_cache
+from core_oaipmh_harvester_app.components.oai_registry import (
+    api as oai_registry_api,
+)
+
+ACTIVATED_REGISTRY_IDS_KEY = "activated_registry_ids"
+ACTIVATED_REGISTRY_LIST_KEY = "activated_registry_list"
+GENERATION_KEY = "generation"
+
+
+def _get_cache():
+    """Return the activated registries cache
+
+    Returns:
+
+    """
+    return get_cache(
+        "oai_registry",
+        backend=EXPLORE_OAIPMH_CACHE_BACKEND,
+        timeout=EXPLORE_OAIPMH_CACHE_TIMEOUT,
+    )
+
+
+def get_activated_registry_ids():
+    """Return the list of activated registry ids, from the cache if possible.
+
+    Returns:
+        List of registry ids.
+
+    """
+    cache = _get_cache()
+    registry_ids = cache.get(ACTIVATED_REGISTRY_IDS_KEY)
+    if registry_ids is None:
+        registry_ids = list(
+            oai_registry_api.get_all_activated_registry().values_list(
+                "id", flat=True
+            )
+        )
+        cache.set(ACTIVATED_REGISTRY_IDS_KEY, registry_ids)
+    return registry_ids
+
+
+def get_activated_registry_list():
+    """Return id and name of the activated registries ordered by name, from
+    the cache if possible.
+
+    Returns:
+        List of dict {"instance_id", "instance_name"}.
+
+    """
+    cache = _get_cache()
+    registry_list = cache.get(ACTIVATED_REGISTRY_LIST_KEY)
+    if registry_list is None:
+        registry_rows = oai_registry_api.get_all_activated_registry(
+            order_by_field="name"
+        ).values_list("id", "name")
+        registry_list = [
+            {"instance_id": registry_id, "instance_name": registry_name}
+            for registry_id, registry_name in registry_rows
+        ]
+        cache.set(ACTIVATED_REGISTRY_LIST_KEY, registry_list)
+    return registry_list
+
+
+def get_generation():
+    """Return the generation of the activated registries. The generation
+    changes every time the cache is invalidated.
+
+    Returns:
+        Generation token (str).
+
+    """
+    cache = _get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        cache.set(GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def invalidate():
+    """Invalidate the activated registries cache.
+
+    Returns:
+
+    """
+    cache = _get_cache()
+    cache.delete(ACTIVATED_REGISTRY_IDS_KEY)
+    cache.delete(ACTIVATED_REGISTRY_LIST_KEY)
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
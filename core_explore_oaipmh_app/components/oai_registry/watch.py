@@ -0,0 +1,73 @@
+"""Signals to trigger after OaiRegistry modifications."""
+
+from django.db.models.signals import post_init, post_save, post_delete
+
+from core_explore_oaipmh_app.components.oai_registry import (
+    api as oai_registry_cache_api,
+)
+from core_explore_oaipmh_app.utils.watch import (
+    have_fields_changed,
+    keep_field_values,
+)
+from core_oaipmh_harvester_app.components.oai_registry.models import (
+    OaiRegistry,
+)
+
+# registry fields read by the activated registries cache, the other fields
+# (is_harvesting, last_update...) change on every harvest
+CACHED_FIELDS = ("name", "is_activated")
+
+
+def init():
+    """Connect to OaiRegistry object events."""
+    post_init.connect(keep_cached_values, sender=OaiRegistry)
+    post_save.connect(invalidate_changed_registry_cache, sender=OaiRegistry)
+    post_delete.connect(invalidate_registry_cache, sender=OaiRegistry)
+
+
+def keep_cached_values(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Keep the values of the cached fields of a registry when it is loaded.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    keep_field_values(instance, CACHED_FIELDS)
+
+
+def invalidate_changed_registry_cache(
+    sender,
+    instance,
+    created=False,
+    update_fields=None,
+    **kwargs,  # noqa, pylint: disable=unused-argument
+):
+    """Invalidate the activated registries cache when a registry is created,
+    renamed, activated or deactivated. The saves of the harvest state keep
+    the cache.
+
+    Args:
+        sender:
+        instance:
+        created:
+        update_fields:
+        kwargs:
+    """
+    if have_fields_changed(instance, CACHED_FIELDS, created, update_fields):
+        oai_registry_cache_api.invalidate()
+
+
+def invalidate_registry_cache(
+    sender, instance, **kwargs  # noqa, pylint: disable=unused-argument
+):
+    """Invalidate the activated registries cache when a registry is deleted.
+
+    Args:
+        sender:
+        instance:
+        kwargs:
+    """
+    oai_registry_cache_api.invalidate()
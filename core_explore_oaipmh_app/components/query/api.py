@@ -1,11 +1,30 @@
 """OaiPmh Query api"""
 
-import core_explore_common_app.components.query.api as api_query
 from core_explore_common_app.access_control.api import can_access
 from core_explore_common_app.components.query.api import upsert
 from core_main_app.access_control.decorators import access_control
 
 
+def get_oaipmh_data_source_index(query):
+    """Return the oaipmh data sources of the query by instance id. The
+    unique identifier for an oaipmh data source is its instance_id because
+    there is no constraint on the name.
+
+    Args:
+        query:
+
+    Returns:
+        Dict {instance_id: data_source}
+
+    """
+    data_source_index = dict()
+    for data_source_item in query.data_sources:
+        instance_id = data_source_item["query_options"].get("instance_id")
+        if instance_id is not None:
+            data_source_index.setdefault(instance_id, data_source_item)
+    return data_source_index
+
+
 @access_control(can_access)
 def add_oaipmh_data_source(query, data_source, user):
     """Add an oaipmh data source to the query
@@ -18,20 +37,32 @@ def add_oaipmh_data_source(query, data_source, user):
     Returns:
 
     """
-    # the unique identifier for an oaipmh data source is its instance_id
-    # because there is no constraint on the name
-    data_source_found = False
-    for data_source_item in query.data_sources:
-        if (
-            "instance_id" in data_source_item["query_options"]
-            and data_source_item["query_options"]["instance_id"]
-            == data_source["query_options"]["instance_id"]
-        ):
-            data_source_found = True
-
-    if not data_source_found:
-        # add data source to query if not present
-        query.data_sources.append(data_source)
+    return add_oaipmh_data_sources(query, [data_source], user)
+
+
+@access_control(can_access)
+def add_oaipmh_data_sources(query, data_sources, user):
+    """Add oaipmh data sources to the query, the query is saved once
+
+    Args:
+        query:
+        data_sources:
+        user:
+
+    Returns:
+
+    """
+    data_source_index = get_oaipmh_data_source_index(query)
+    data_sources_added = False
+    for data_source in data_sources:
+        instance_id = data_source["query_options"]["instance_id"]
+        if instance_id not in data_source_index:
+            # add data source to query if not present
+            query.data_sources.append(data_source)
+            data_source_index[instance_id] = data_source
+            data_sources_added = True
+
+    if data_sources_added:
         # update query
         return upsert(query, user)
 
@@ -47,13 +78,68 @@ def remove_oaipmh_data_source(query, instance_id, user):
     Returns:
 
     """
-    data_source = None
+    return remove_oaipmh_data_sources(query, [instance_id], user)
+
+
+@access_control(can_access)
+def remove_oaipmh_data_sources(query, instance_ids, user):
+    """Remove oaipmh data sources from the query, the query is saved once
+
+    Args:
+        query:
+        instance_ids:
+        user:
+
+    Returns:
+
+    """
+    data_source_index = get_oaipmh_data_source_index(query)
+    instance_ids = {
+        instance_id
+        for instance_id in instance_ids
+        if instance_id in data_source_index
+    }
+
+    if instance_ids:
+        query.data_sources = [
+            data_source_item
+            for data_source_item in query.data_sources
+            if data_source_item["query_options"].get("instance_id")
+            not in instance_ids
+        ]
+        return upsert(query, user)
+
+
+@access_control(can_access)
+def update_oaipmh_data_sources(query, data_sources, user):
+    """Set the oaipmh data sources of the query: keep the selected ones
+    already present, add the new ones, remove the others. The query is
+    saved once, and only if it changed.
+
+    Args:
+        query:
+        data_sources: List of the selected oaipmh data sources.
+        user:
+
+    Returns:
+
+    """
+    selected_data_sources = {
+        data_source["query_options"]["instance_id"]: data_source
+        for data_source in data_sources
+    }
+    updated_data_sources = []
     for data_source_item in query.data_sources:
-        if (
-            "instance_id" in data_source_item["query_options"]
-            and data_source_item["query_options"]["instance_id"] == instance_id
-        ):
-            data_source = data_source_item
-
-    if data_source:
-        return api_query.remove_data_source(query, data_source, user)
+        instance_id = data_source_item["query_options"].get("instance_id")
+        if instance_id is None:
+            # not an oaipmh data source
+            updated_data_sources.append(data_source_item)
+        elif instance_id in selected_data_sources:
+            updated_data_sources.append(data_source_item)
+            del selected_data_sources[instance_id]
+    updated_data_sources.extend(selected_data_sources.values())
+
+    if updated_data_sources != query.data_sources:
+        query.data_sources = updated_data_sources
+        return upsert(query, user)
+    return query
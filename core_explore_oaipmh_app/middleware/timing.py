@@ -0,0 +1,110 @@
+"""Timing Middleware"""
+
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.module_loading import import_string
+
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_TIMING_METRICS_HOOK,
+)
+from core_explore_oaipmh_app.utils.timing import start_request_timer
+
+logger = logging.getLogger(__name__)
+
+
+class TimingMiddleware:
+    """Time the stages of the OAI-PMH explore pipeline. Sends the timings
+    in the Server-Timing header, in a log line, and to the metrics hook.
+    Runs in sync and async middleware chains, the async views are not
+    adapted to a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Init middleware
+
+        Args:
+            get_response:
+        """
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.metrics_hook = (
+            import_string(EXPLORE_OAIPMH_TIMING_METRICS_HOOK)
+            if EXPLORE_OAIPMH_TIMING_METRICS_HOOK
+            else None
+        )
+
+    def __call__(self, request):
+        """Call Middleware
+
+        Args:
+            request:
+
+        Returns:
+
+        """
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = start_request_timer(request)
+        response = self.get_response(request)
+        self._report(request, timer, response)
+        return response
+
+    async def __acall__(self, request):
+        """Call Middleware, in an async middleware chain
+
+        Args:
+            request:
+
+        Returns:
+
+        """
+        timer = start_request_timer(request)
+        response = await self.get_response(request)
+        self._report(request, timer, response)
+        return response
+
+    def _report(self, request, timer, response):
+        """Report the timings of a request
+
+        Args:
+            request:
+            timer:
+            response:
+
+        Returns:
+
+        """
+        # only report the requests going through the pipeline
+        if not timer.stages:
+            return
+
+        server_timing = timer.get_server_timing()
+        if response.has_header("Server-Timing"):
+            server_timing = f"{response['Server-Timing']}, {server_timing}"
+        response["Server-Timing"] = server_timing
+
+        logger.info(
+            "OAI-PMH explore timing: path=%s status=%s %s",
+            request.path,
+            response.status_code,
+            " ".join(
+                f"{name}_ms={stage['duration'] * 1000:.1f} "
+                f"{name}_queries={stage['queries']}"
+                for name, stage in timer.stages.items()
+            ),
+            extra={"explore_oaipmh_timing": timer.stages},
+        )
+
+        if self.metrics_hook is not None:
+            try:
+                self.metrics_hook(request, timer.stages)
+            except Exception as exception:
+                logger.warning(
+                    "OAI-PMH explore metrics hook failed: %s", str(exception)
+                )
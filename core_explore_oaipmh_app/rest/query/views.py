@@ -1,32 +1,100 @@
 """REST views for the explore OAI-PMH API"""
 
+import copy
 import json
+import logging
+from types import SimpleNamespace
 
 import pytz
 from django.conf import settings as conf_settings
+from django.core.paginator import EmptyPage
+from django.http import StreamingHttpResponse
 from django.urls import reverse
+from rest_framework import status
+from rest_framework.decorators import api_view, renderer_classes, schema
+from rest_framework.response import Response
 
 import core_oaipmh_harvester_app.components.oai_record.api as oai_record_api
-from core_explore_common_app.components.result.models import Result
-from core_main_app.commons.constants import DATA_JSON_FIELD
-from core_main_app.commons.exceptions import ApiError
-from core_main_app.settings import RESULTS_PER_PAGE, DATA_SORTING_FIELDS
-from core_main_app.utils.pagination.django_paginator.results_paginator import (
-    ResultsPaginator,
+from core_explore_oaipmh_app.components.oai_harvester_metadata_format import (
+    api as metadata_format_index_api,
+)
+from core_explore_oaipmh_app.components.oai_registry import (
+    api as oai_registry_cache_api,
+)
+from core_explore_oaipmh_app.rest.renderers import (
+    dumps,
+    get_renderer_classes,
 )
-from core_main_app.utils.pagination.mongoengine_paginator.paginator import (
-    MongoenginePaginator,
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_CACHE_TIMEOUT,
+    EXPLORE_OAIPMH_COUNT_CAP,
+    EXPLORE_OAIPMH_COUNT_MODE,
+    EXPLORE_OAIPMH_EXECUTION_MODE,
+    EXPLORE_OAIPMH_EXPORT_CHUNK_SIZE,
+    EXPLORE_OAIPMH_EXPORT_MAX_CHUNK_SIZE,
+    EXPLORE_OAIPMH_FANOUT_MAX_OFFSET,
+    EXPLORE_OAIPMH_FANOUT_THREADS,
+    EXPLORE_OAIPMH_FANOUT_TIMEOUT,
+    EXPLORE_OAIPMH_FAST_JSON,
+    EXPLORE_OAIPMH_PAGE_CACHE,
+    EXPLORE_OAIPMH_PAGE_CACHE_MAX_PAGE,
+    EXPLORE_OAIPMH_QUERY_CACHE_SIZE,
+    EXPLORE_OAIPMH_RESULT_MODE,
+    EXPLORE_OAIPMH_SNIPPET_LENGTH,
+    EXPLORE_OAIPMH_SNIPPET_MAX_FRAGMENTS,
 )
-from core_oaipmh_harvester_app.components.oai_harvester_metadata_format import (
-    api as oai_harvester_metadata_format_api,
+from core_explore_oaipmh_app.utils import page_cache as page_cache_utils
+from core_explore_oaipmh_app.utils.cache import get_cache
+from core_explore_oaipmh_app.utils.fanout import (
+    FanOutResults,
+    split_raw_query,
 )
-from core_oaipmh_harvester_app.components.oai_registry import (
-    api as oai_registry_api,
+from core_explore_oaipmh_app.utils.pagination.keyset import KeysetPaginator
+from core_explore_oaipmh_app.utils.pagination.paginator import (
+    OaiPmhMongoenginePaginator,
+    OaiPmhPaginator,
 )
+from core_explore_oaipmh_app.utils.query import get_query_hash
+from core_explore_oaipmh_app.utils.result import (
+    OaiPmhResult,
+    serialize_result,
+)
+from core_explore_oaipmh_app.utils.snippet import (
+    extract_query_terms,
+    get_snippet,
+)
+from core_explore_oaipmh_app.utils.timing import timed_stage
+from core_main_app.access_control.exceptions import AccessControlError
+from core_main_app.commons.constants import DATA_JSON_FIELD
+from core_main_app.commons.exceptions import ApiError
+from core_main_app.settings import RESULTS_PER_PAGE, DATA_SORTING_FIELDS
+from core_oaipmh_harvester_app.components.oai_harvester_metadata_format.models import (
+    OaiHarvesterMetadataFormat,
+)
+from core_oaipmh_harvester_app.components.oai_record.models import OaiRecord
 from core_oaipmh_harvester_app.utils.query.mongo.query_builder import (
     OaiPmhQueryBuilder,
 )
 
+logger = logging.getLogger(__name__)
+
+PAGINATION_MODE_CURSOR = "cursor"
+RESULT_MODE_FULL = "full"
+RESULT_MODE_SUMMARY = "summary"
+RESULT_MODE_SNIPPET = "snippet"
+# template format of the snippet results: their content is an HTML snippet,
+# escaped except for the <mark> tags of the matches
+SNIPPET_FORMAT = "SNIPPET"
+RESULT_MODES = (RESULT_MODE_FULL, RESULT_MODE_SUMMARY, RESULT_MODE_SNIPPET)
+# result modes reading the content of the records
+CONTENT_RESULT_MODES = (RESULT_MODE_FULL, RESULT_MODE_SNIPPET)
+# result modes of the results list of the explore pages: it escapes the
+# contents that are not XML, snippets are only served as JSON
+LIST_RESULT_MODES = (RESULT_MODE_FULL, RESULT_MODE_SUMMARY)
+EXECUTION_MODE_SINGLE = "single"
+EXECUTION_MODE_FANOUT = "fanout"
+EXECUTION_MODES = (EXECUTION_MODE_SINGLE, EXECUTION_MODE_FANOUT)
+
 
 def get_template_info_from_metadata_format_and_template(
     harvester_metadata_format, template
@@ -72,55 +140,127 @@ def get_registries(data):
     return json.dumps(registries_list)
 
 
+def _get_query_cache():
+    """Return the compiled query cache
+
+    Returns:
+
+    """
+    return get_cache(
+        "query",
+        timeout=EXPLORE_OAIPMH_CACHE_TIMEOUT,
+        max_size=EXPLORE_OAIPMH_QUERY_CACHE_SIZE,
+    )
+
+
+def get_query_cache_stats():
+    """Return the hit/miss counters of the compiled query cache
+
+    Returns:
+
+    """
+    return _get_query_cache().get_stats()
+
+
 def build_oaipmh_query(query_data):
-    # get query and templates
+    """Build the raw OAI-PMH query from the query payload. Compiled queries
+    are cached by payload, by searched registries and by metadata formats
+    generation, for at most EXPLORE_OAIPMH_CACHE_TIMEOUT seconds. The
+    generation only changes when metadata formats are added, removed or
+    mapped to another template, not on harvests.
+
+    Args:
+        query_data:
+
+    Returns:
+        Raw query.
+
+    """
     query = query_data.get("query", None)
 
     if query is None:
         raise ApiError("Query should be passed in parameter.")
 
-    templates = query_data.get("templates", "[]")
-    registries = get_registries(query_data)
+    # the registries are read from the (shared) activated registries cache,
+    # not from a generation that may be local to this process
+    registry_ids = get_query_registry_ids(query_data)
 
-    # build query builder
-    query_builder = OaiPmhQueryBuilder(query, DATA_JSON_FIELD)
+    if not EXPLORE_OAIPMH_QUERY_CACHE_SIZE:
+        return _build_oaipmh_query(query_data, registry_ids)
 
-    if type(templates) is str:
-        templates = json.loads(templates)
+    query_key = get_query_hash(
+        query,
+        query_data.get("templates", "[]"),
+        query_data.get("options", None),
+        sorted(registry_ids),
+        metadata_format_index_api.get_generation(),
+    )
+    query_cache = _get_query_cache()
+    raw_query = query_cache.get(query_key)
+    if raw_query is None:
+        raw_query = _build_oaipmh_query(query_data, registry_ids)
+        query_cache.set(query_key, raw_query)
+    # the raw query can be altered by the caller
+    return copy.deepcopy(raw_query)
+
+
+def get_query_registry_ids(query_data):
+    """Return the ids of the activated registries searched by a query: the
+    registries selected in the options, all the activated registries
+    otherwise.
 
-    if type(registries) is str:
-        registries = json.loads(registries)
+    Args:
+        query_data:
+
+    Returns:
+        List of registry ids.
+
+    """
+    registries = json.loads(get_registries(query_data))
 
     # if registries, check if activated
-    list_activated_registry = list(
-        oai_registry_api.get_all_activated_registry().values_list(
-            "id", flat=True
-        )
+    list_activated_registry = (
+        oai_registry_cache_api.get_activated_registry_ids()
     )
     if len(registries) > 0:
-        activated_registries = [
+        return [
             activated_registry_id
             for activated_registry_id in registries
             if activated_registry_id in list_activated_registry
         ]
-    else:
-        activated_registries = list_activated_registry
+    return list_activated_registry
+
+
+def _build_oaipmh_query(query_data, activated_registries):
+    """Build the raw OAI-PMH query from the query payload.
+
+    Args:
+        query_data:
+        activated_registries: Ids of the registries searched by the query.
+
+    Returns:
+        Raw query.
+
+    """
+    # get query and templates
+    query = query_data.get("query", None)
+    templates = query_data.get("templates", "[]")
+
+    # build query builder
+    query_builder = OaiPmhQueryBuilder(query, DATA_JSON_FIELD)
+
+    if type(templates) is str:
+        templates = json.loads(templates)
 
     if len(templates) > 0:
         # get list of template ids
         list_template_ids = [template["id"] for template in templates]
-        # get all metadata formats used by the registries
-        list_metadata_format = (
-            oai_harvester_metadata_format_api.get_all_by_list_registry_ids(
-                activated_registries
+        # get metadata formats of the registries that use the given templates
+        list_metadata_formats_id = (
+            metadata_format_index_api.get_metadata_format_ids_by_templates(
+                list_template_ids, activated_registries
             )
         )
-        # Filter metadata formats that use the given templates
-        list_metadata_formats_id = [
-            x.id
-            for x in list_metadata_format
-            if x.template is not None and x.template.id in list_template_ids
-        ]
         query_builder.add_list_metadata_formats_criteria(
             list_metadata_formats_id
         )
@@ -134,37 +274,340 @@ def build_oaipmh_query(query_data):
     return query_builder.get_raw_query()
 
 
-def execute_oaipmh_query(query_data, page, request):
+def execute_oaipmh_query(
+    query_data, page, request, result_modes=LIST_RESULT_MODES
+):
     """Execute query on OAI-PMH database
 
     Args:
-        query_data:
+        query_data: Query payload. Set "pagination_mode" to "cursor" to use
+            the keyset pagination, from the "cursor" of the previous page.
+            Set "count_mode" to "exact", "capped" or "estimated" to choose
+            how the total number of results is computed. Set "result_mode"
+            to "summary" to leave the content out of the results, to
+            "snippet" to replace it with the matches of the query (the
+            template format of the results is then "SNIPPET"). Set
+            "execution_mode" to "fanout" to run one query per registry (or
+            metadata format) and merge the results.
         page:
         request:
+        result_modes: Result modes accepted by the caller.
 
 
     Returns:
 
     """
-    # build raw query
-    raw_query = build_oaipmh_query(query_data)
     # retrieve order_by_field field
     order_by_field = query_data.get("order_by_field", None)
     order_by_field = (
         order_by_field.split(",") if order_by_field else DATA_SORTING_FIELDS
     )
+    # retrieve result mode
+    result_mode = _get_result_mode(query_data, result_modes)
+    # retrieve execution mode
+    execution_mode = (
+        query_data.get("execution_mode", None) or EXPLORE_OAIPMH_EXECUTION_MODE
+    )
+    if execution_mode not in EXECUTION_MODES:
+        raise ApiError(f"Unknown execution mode: {execution_mode}.")
+    count_mode = (
+        query_data.get("count_mode", None) or EXPLORE_OAIPMH_COUNT_MODE
+    )
+    is_cursor_mode = (
+        query_data.get("pagination_mode", None) == PAGINATION_MODE_CURSOR
+    )
+    # look for the formatted page in the cache
+    page_cache_key = None
+    if _is_page_cached(query_data, page, is_cursor_mode):
+        with timed_stage(request, "page_cache"):
+            page_cache_key = page_cache_utils.get_page_cache_key(
+                query_data,
+                request.user,
+                get_query_registry_ids(query_data),
+                page,
+                order_by_field,
+                result_mode,
+                count_mode,
+                execution_mode,
+            )
+            cached_page = page_cache_utils.get_cached_page(page_cache_key)
+        if cached_page is not None:
+            return cached_page
+    # build raw query
+    with timed_stage(request, "build"):
+        raw_query = build_oaipmh_query(query_data)
+    # the keyset pagination seeks in a single query, deep pages skip the
+    # records in a single query instead of loading them from each partition
+    page_end = _get_page_end(page)
+    sub_queries = (
+        split_raw_query(raw_query)
+        if execution_mode == EXECUTION_MODE_FANOUT
+        and not is_cursor_mode
+        and page_end - RESULTS_PER_PAGE <= EXPLORE_OAIPMH_FANOUT_MAX_OFFSET
+        else dict()
+    )
     # execute query
+    if len(sub_queries) > 1:
+        data_list = FanOutResults(
+            {
+                partition_id: _execute_json_query(
+                    sub_query, request, order_by_field, result_mode
+                )
+                for partition_id, sub_query in sub_queries.items()
+            },
+            _execute_json_query(
+                raw_query, request, order_by_field, result_mode
+            ),
+            order_by_field,
+            timeout=EXPLORE_OAIPMH_FANOUT_TIMEOUT,
+            threads=EXPLORE_OAIPMH_FANOUT_THREADS,
+            prefetch=page_end,
+        )
+    else:
+        data_list = _execute_json_query(
+            raw_query, request, order_by_field, result_mode
+        )
+    # build result page
+    paginator_class = (
+        OaiPmhMongoenginePaginator
+        if conf_settings.MONGODB_INDEXING
+        and not isinstance(data_list, FanOutResults)
+        else OaiPmhPaginator
+    )
+    paginator = paginator_class(
+        data_list,
+        RESULTS_PER_PAGE,
+        count_mode=count_mode,
+        count_cap=EXPLORE_OAIPMH_COUNT_CAP,
+        page_number=page,
+    )
+    if is_cursor_mode:
+        count_paginator = paginator
+        paginator = KeysetPaginator(
+            data_list,
+            order_by_field,
+            RESULTS_PER_PAGE,
+            count_paginator=count_paginator,
+        )
+        with timed_stage(request, "execute"):
+            page = paginator.get_page(query_data.get("cursor", None), page)
+        # the results are only counted if the caller asks for the count
+        if query_data.get("count_mode", None):
+            with timed_stage(request, "count"):
+                page.results_count = count_paginator.count
+            page.count_display = count_paginator.count_display
+            page.count_mode = count_paginator.count_mode
+            page.count_is_exact = count_paginator.count_is_exact
+    else:
+        # count the results in their own stage
+        with timed_stage(request, "count"):
+            results_count = paginator.count
+        with timed_stage(request, "execute"):
+            page = paginator.get_page(page)
+            # load the records of the page
+            page.object_list = list(page.object_list)
+        page.results_count = results_count
+    page.result_mode = result_mode
+    page.snippet_terms = _get_snippet_terms(query_data, result_mode)
+    # registries (or metadata formats) left out of the results
+    page.degraded_partitions = sorted(getattr(data_list, "degraded", []))
+    # partial pages are not cached
+    if not page.degraded_partitions:
+        page.page_cache_key = page_cache_key
+    return page
+
+
+def _get_page_end(page):
+    """Return the number of records up to the end of a page.
+
+    Args:
+        page: Page number.
+
+    Returns:
+
+    """
+    try:
+        return max(int(page), 1) * RESULTS_PER_PAGE
+    except (TypeError, ValueError):
+        return RESULTS_PER_PAGE
+
+
+def _is_page_cached(query_data, page, is_cursor_mode):
+    """Return True if the result page can be read from the cache.
+
+    Args:
+        query_data:
+        page: Page number.
+        is_cursor_mode:
+
+    Returns:
+
+    """
+    if not EXPLORE_OAIPMH_PAGE_CACHE or is_cursor_mode:
+        return False
+    if query_data.get("query", None) is None:
+        return False
+    try:
+        return 1 <= int(page) <= EXPLORE_OAIPMH_PAGE_CACHE_MAX_PAGE
+    except (TypeError, ValueError):
+        return False
+
+
+def _get_result_mode(query_data, result_modes):
+    """Return the result mode of a query.
+
+    Args:
+        query_data:
+        result_modes: Result modes accepted by the caller.
+
+    Returns:
+
+    """
+    result_mode = (
+        query_data.get("result_mode", None) or EXPLORE_OAIPMH_RESULT_MODE
+    )
+    if result_mode not in RESULT_MODES:
+        raise ApiError(f"Unknown result mode: {result_mode}.")
+    if result_mode not in result_modes:
+        raise ApiError(
+            f"The {result_mode} result mode is only available from the REST API."
+        )
+    return result_mode
+
+
+def _get_snippet_terms(query_data, result_mode):
+    """Return the terms highlighted in the snippets of the results.
+
+    Args:
+        query_data:
+        result_mode:
+
+    Returns:
+        List of terms (empty if the results have no snippet).
+
+    """
+    if result_mode != RESULT_MODE_SNIPPET:
+        return []
+    return extract_query_terms(query_data.get("query", None))
+
+
+def _execute_json_query(raw_query, request, order_by_field, result_mode):
+    """Execute a raw query, only load the fields needed to format the
+    results.
+
+    Args:
+        raw_query:
+        request:
+        order_by_field:
+        result_mode:
+
+    Returns:
+        Queryset of records.
+
+    """
     data_list = oai_record_api.execute_json_query(
         raw_query, request.user, order_by_field
     )
-    # build result page
+    return data_list.only(
+        *get_record_projection(data_list, order_by_field, result_mode)
+    )
+
+
+def get_record_projection(data_list, order_by_field, result_mode):
+    """Return the record fields needed to sort and format the results.
+
+    Args:
+        data_list: Queryset of records.
+        order_by_field: List of sorting fields.
+        result_mode: Result mode (full, summary, snippet).
+
+    Returns:
+        List of field names.
+
+    """
     if conf_settings.MONGODB_INDEXING:
-        paginator = MongoenginePaginator(data_list, RESULTS_PER_PAGE)
-        page = paginator.get_page(page)
+        # content is read from the OaiRecord, not from the Mongo document
+        fields = [
+            "data_id",
+            "title",
+            "_harvester_metadata_format_id",
+            "last_modification_date",
+        ]
+        model_fields = set(data_list._document._fields)
     else:
-        paginator = ResultsPaginator()
-        page = paginator.get_results(data_list, page, RESULTS_PER_PAGE)
-    return page
+        fields = [
+            "id",
+            "title",
+            "harvester_metadata_format",
+            "last_modification_date",
+        ]
+        if result_mode in CONTENT_RESULT_MODES:
+            # content is read from the file
+            fields.append("file")
+        model_fields = {
+            field.name for field in data_list.model._meta.get_fields()
+        }
+    # keep the sorting fields, they are read by the keyset paginator
+    for field in order_by_field:
+        field = field.lstrip("+-")
+        if field in model_fields and field not in fields:
+            fields.append(field)
+    return fields
+
+
+def _get_metadata_format_id(data):
+    """Return the metadata format id of a record, without loading the
+    metadata format.
+
+    Args:
+        data: OaiRecord or MongoOaiRecord.
+
+    Returns:
+
+    """
+    if conf_settings.MONGODB_INDEXING:
+        return data._harvester_metadata_format_id
+    return data.harvester_metadata_format_id
+
+
+def get_metadata_formats_by_id(metadata_format_ids):
+    """Return metadata formats, with their template, in a single query.
+
+    Args:
+        metadata_format_ids: List of metadata format ids.
+
+    Returns:
+        Dict {metadata_format_id: metadata_format}
+
+    """
+    if not metadata_format_ids:
+        return dict()
+    return {
+        metadata_format.id: metadata_format
+        for metadata_format in OaiHarvesterMetadataFormat.objects.select_related(
+            "template"
+        ).filter(
+            pk__in=set(metadata_format_ids)
+        )
+    }
+
+
+def get_contents_by_record(records):
+    """Return the XML content of the records. Mongo records read their
+    content from the OaiRecord: load the files of the page in one query.
+
+    Args:
+        records: List of OaiRecord or MongoOaiRecord.
+
+    Returns:
+        Dict {record_id: xml_content}
+
+    """
+    if conf_settings.MONGODB_INDEXING and records:
+        records = OaiRecord.objects.only("id", "file").filter(
+            pk__in=[data.id for data in records]
+        )
+    return {data.id: data.xml_content for data in records}
 
 
 def format_oaipmh_results(results, request):
@@ -176,32 +619,82 @@ def format_oaipmh_results(results, request):
 
     Returns:
 
+    """
+    # the page has been read from the cache
+    cached_results = getattr(results, "cached_results", None)
+    if isinstance(cached_results, list):
+        return cached_results
+    with timed_stage(request, "format"):
+        data_list = _format_oaipmh_results(results, request)
+    page_cache_key = getattr(results, "page_cache_key", None)
+    if isinstance(page_cache_key, str):
+        page_cache_utils.set_cached_page(page_cache_key, results, data_list)
+    return data_list
+
+
+def _format_oaipmh_results(results, request):
+    """Format local results for explore apps
+
+    Args:
+        results:
+        request:
+
+    Returns:
+
     """
     url = reverse("core_explore_oaipmh_app_data_detail")
     url_access_data = reverse(
         "core_explore_oaipmh_app_rest_get_result_from_data_id"
     )
+    records = list(results.object_list)
+    result_mode = getattr(results, "result_mode", RESULT_MODE_FULL)
+    # load the metadata formats and templates of the page at once
+    metadata_formats = get_metadata_formats_by_id(
+        [_get_metadata_format_id(data) for data in records]
+    )
+    # load the contents of the page at once
+    contents = (
+        get_contents_by_record(records)
+        if result_mode in CONTENT_RESULT_MODES
+        else dict()
+    )
+    if result_mode == RESULT_MODE_SNIPPET:
+        # the full content stays available from the access data url
+        terms = getattr(results, "snippet_terms", None) or []
+        contents = {
+            record_id: get_snippet(
+                content,
+                terms,
+                EXPLORE_OAIPMH_SNIPPET_LENGTH,
+                EXPLORE_OAIPMH_SNIPPET_MAX_FRAGMENTS,
+            )
+            for record_id, content in contents.items()
+        }
     # Template info
     template_info = dict()
     # Init data list
     data_list = []
-    for data in results.object_list:
+    for data in records:
         # get data's metadata format
-        metadata_format = data.harvester_metadata_format
+        metadata_format_id = _get_metadata_format_id(data)
         # get and store data's template information from metadata format
-        if metadata_format not in template_info:
-            template = data.harvester_metadata_format.template
-            template_info[metadata_format] = (
+        if metadata_format_id not in template_info:
+            metadata_format = metadata_formats.get(metadata_format_id, None)
+            if metadata_format is None:
+                metadata_format = data.harvester_metadata_format
+            template_info[metadata_format_id] = (
                 get_template_info_from_metadata_format_and_template(
-                    metadata_format, template
+                    metadata_format, metadata_format.template
                 )
             )
+            if result_mode == RESULT_MODE_SNIPPET:
+                template_info[metadata_format_id]["format"] = SNIPPET_FORMAT
 
         data_list.append(
-            Result(
+            OaiPmhResult(
                 title=data.title,
-                content=data.xml_content,
-                template_info=template_info[metadata_format],
+                content=contents.get(data.id, ""),
+                template_info=template_info[metadata_format_id],
                 permission_url=None,
                 detail_url=f"{url}?id={str(data.id)}",
                 last_modification_date=data.last_modification_date.replace(
@@ -211,3 +704,212 @@ def format_oaipmh_results(results, request):
             )
         )
     return data_list
+
+
+def _get_chunk_size(query_data):
+    """Return the chunk size requested by the client, bounded by the settings.
+
+    Args:
+        query_data:
+
+    Returns:
+
+    """
+    try:
+        chunk_size = int(
+            query_data.get("chunk_size", EXPLORE_OAIPMH_EXPORT_CHUNK_SIZE)
+        )
+    except (TypeError, ValueError):
+        raise ApiError("Chunk size should be an integer.")
+    return min(max(chunk_size, 1), EXPLORE_OAIPMH_EXPORT_MAX_CHUNK_SIZE)
+
+
+def _iterate_chunks(data_list, chunk_size):
+    """Iterate over the records by chunks, through a server-side cursor.
+
+    Args:
+        data_list: Queryset of records.
+        chunk_size:
+
+    Returns:
+
+    """
+    if conf_settings.MONGODB_INDEXING:
+        records = data_list.batch_size(chunk_size)
+    else:
+        records = data_list.iterator(chunk_size=chunk_size)
+    chunk = []
+    try:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        close_records = getattr(records, "close", None)
+        if callable(close_records):
+            close_records()
+
+
+def _serialize_chunk(results):
+    """Serialize a chunk of results, one JSON document per line.
+
+    Args:
+        results:
+
+    Returns:
+
+    """
+    if EXPLORE_OAIPMH_FAST_JSON:
+        return b"".join(
+            dumps(serialize_result(result)) + b"\n" for result in results
+        )
+    return "".join(
+        json.dumps(serialize_result(result)) + "\n" for result in results
+    )
+
+
+def stream_oaipmh_query_results(query_data, request):
+    """Stream the results of an OAI-PMH query, one JSON document per line.
+
+    Args:
+        query_data: Query payload (see execute_oaipmh_query).
+        request:
+
+    Returns:
+        Generator of NDJSON lines.
+
+    """
+    chunk_size = _get_chunk_size(query_data)
+    result_mode = _get_result_mode(query_data, RESULT_MODES)
+    order_by_field = query_data.get("order_by_field", None)
+    order_by_field = (
+        order_by_field.split(",") if order_by_field else DATA_SORTING_FIELDS
+    )
+    with timed_stage(request, "build"):
+        raw_query = build_oaipmh_query(query_data)
+    data_list = _execute_json_query(
+        raw_query, request, order_by_field, result_mode
+    )
+    chunks = _iterate_chunks(data_list, chunk_size)
+    snippet_terms = _get_snippet_terms(query_data, result_mode)
+
+    def _stream():
+        """Format and serialize the records chunk by chunk"""
+        try:
+            for chunk in chunks:
+                results = format_oaipmh_results(
+                    SimpleNamespace(
+                        object_list=chunk,
+                        result_mode=result_mode,
+                        snippet_terms=snippet_terms,
+                    ),
+                    request,
+                )
+                yield _serialize_chunk(results)
+        except GeneratorExit:
+            logger.info("OAI-PMH export interrupted by the client.")
+            raise
+        finally:
+            # release the database cursor
+            chunks.close()
+
+    return _stream()
+
+
+def _get_page_number(page, method_name):
+    """Return the number of the previous or next page, None if there is none.
+
+    Args:
+        page:
+        method_name: previous_page_number or next_page_number.
+
+    Returns:
+
+    """
+    try:
+        return getattr(page, method_name)()
+    except EmptyPage:
+        return None
+
+
+@api_view(["POST"])
+@renderer_classes(get_renderer_classes())
+@schema(None)
+def get_oaipmh_query_results(request):
+    """Return a page of results of an OAI-PMH query. Expects the same payload
+    as the OAI-PMH query, and an optional page number. In cursor mode, the
+    "next_cursor" of the response gets the next page, and the results are
+    only counted if the payload sets a "count_mode" (count is None
+    otherwise).
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        if not isinstance(request.data, dict):
+            content = {"message": "Query payload should be an object."}
+            return Response(content, status=status.HTTP_400_BAD_REQUEST)
+        page = execute_oaipmh_query(
+            request.data,
+            request.data.get("page", 1),
+            request,
+            result_modes=RESULT_MODES,
+        )
+        results = format_oaipmh_results(page, request)
+        return Response(
+            {
+                "count": getattr(page, "results_count", None),
+                "count_display": getattr(page, "count_display", None),
+                "previous": _get_page_number(page, "previous_page_number"),
+                "next": _get_page_number(page, "next_page_number"),
+                "next_cursor": getattr(page, "next_cursor", None),
+                "results": [serialize_result(result) for result in results],
+            }
+        )
+    except ApiError as api_error:
+        content = {"message": str(api_error)}
+        return Response(content, status=status.HTTP_400_BAD_REQUEST)
+    except AccessControlError as access_error:
+        content = {"message": str(access_error)}
+        return Response(content, status=status.HTTP_403_FORBIDDEN)
+    except Exception as exception:
+        content = {"message": str(exception)}
+        return Response(content, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+@schema(None)
+def export_oaipmh_query_results(request):
+    """Stream all the results of an OAI-PMH query as NDJSON.
+    Expects the same payload as the OAI-PMH query, and an optional
+    chunk_size.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        if not isinstance(request.data, dict):
+            content = {"message": "Query payload should be an object."}
+            return Response(content, status=status.HTTP_400_BAD_REQUEST)
+        stream = stream_oaipmh_query_results(request.data, request)
+        return StreamingHttpResponse(
+            stream, content_type="application/x-ndjson"
+        )
+    except ApiError as api_error:
+        content = {"message": str(api_error)}
+        return Response(content, status=status.HTTP_400_BAD_REQUEST)
+    except AccessControlError as access_error:
+        content = {"message": str(access_error)}
+        return Response(content, status=status.HTTP_403_FORBIDDEN)
+    except Exception as exception:
+        content = {"message": str(exception)}
+        return Response(content, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,85 @@
+"""Renderers for the explore OAI-PMH REST API"""
+
+import json
+
+from django.http import HttpResponse, JsonResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+from core_explore_oaipmh_app.settings import EXPLORE_OAIPMH_FAST_JSON
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# encodes the types DRF supports and orjson doesn't (lazy strings...)
+_default_encoder = encoders.JSONEncoder()
+
+
+def dumps(data):
+    """Encode data in compact UTF-8 JSON, with orjson if installed.
+
+    Args:
+        data:
+
+    Returns:
+        JSON (bytes).
+
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default_encoder.default)
+    return json.dumps(
+        data,
+        cls=encoders.JSONEncoder,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer encoding with orjson if installed"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON
+
+        Args:
+            data:
+            accepted_media_type:
+            renderer_context:
+
+        Returns:
+
+        """
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+def get_renderer_classes():
+    """Return the renderers of the REST views of the app
+
+    Returns:
+
+    """
+    if EXPLORE_OAIPMH_FAST_JSON:
+        return [FastJSONRenderer]
+    return api_settings.DEFAULT_RENDERER_CLASSES
+
+
+def json_response(data, status):
+    """Return a JSON response from a plain Django view
+
+    Args:
+        data:
+        status:
+
+    Returns:
+
+    """
+    if EXPLORE_OAIPMH_FAST_JSON:
+        return HttpResponse(
+            dumps(data), content_type="application/json", status=status
+        )
+    return JsonResponse(data, status=status, safe=False)
@@ -1,18 +1,59 @@
 """REST views for the data API"""
 
+from asgiref.sync import sync_to_async
+from django.db.models import Q
 from rest_framework import status
-from rest_framework.decorators import api_view, schema
+from rest_framework.decorators import api_view, renderer_classes, schema
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 from core_explore_common_app.components.result.models import Result
 from core_explore_common_app.rest.result.serializers import ResultSerializer
+from core_explore_oaipmh_app.rest.renderers import (
+    get_renderer_classes,
+    json_response,
+)
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_FAST_JSON,
+    EXPLORE_OAIPMH_RESULT_BATCH_MAX_SIZE,
+)
+from core_explore_oaipmh_app.utils.result import (
+    OaiPmhResult,
+    serialize_result,
+)
+from core_explore_oaipmh_app.utils.http import (
+    get_not_modified_response,
+    get_record_etag,
+    get_record_last_modified,
+    set_conditional_headers,
+)
+from core_main_app.access_control.exceptions import AccessControlError
 from core_main_app.commons.exceptions import DoesNotExist
 from core_oaipmh_harvester_app.components.oai_record import (
     api as oai_record_api,
 )
 
 
+def _serialize_result(title, content):
+    """Serialize the result of a record, without the ResultSerializer if
+    the fast JSON path is on.
+
+    Args:
+        title:
+        content:
+
+    Returns:
+
+    """
+    if EXPLORE_OAIPMH_FAST_JSON:
+        return serialize_result(OaiPmhResult(title=title, content=content))
+    return ResultSerializer(Result(title=title, content=content)).data
+
+
 @api_view(["GET"])
+@renderer_classes(get_renderer_classes())
 @schema(None)
 def get_result_from_data_id(request):
     """Access data, Returns Result, Expects a data ID
@@ -33,12 +74,22 @@ def get_result_from_data_id(request):
 
         # reverse url for accessing data
         record = oai_record_api.get_by_id(data_id, request.user)
+        # skip serialization if the client has the current version
+        etag = get_record_etag(record)
+        last_modified = get_record_last_modified(record)
+        not_modified_response = get_not_modified_response(
+            request, etag, last_modified
+        )
+        if not_modified_response is not None:
+            return not_modified_response
         # No title for OaiRecord. Use of the id.
-        result = Result(title=str(data_id), content=record.content)
-        # Serialize results
-        return_value = ResultSerializer(result)
+        return_value = _serialize_result(str(data_id), record.content)
         # Returns the response
-        return Response(return_value.data, status=status.HTTP_200_OK)
+        return set_conditional_headers(
+            Response(return_value, status=status.HTTP_200_OK),
+            etag,
+            last_modified,
+        )
     except DoesNotExist:
         # The record doesn't exist with this id
         content = {"message": "No Record found with the given id."}
@@ -47,3 +98,181 @@ def get_result_from_data_id(request):
         # if something went wrong, return an internal server error
         content = {"message": str(exception)}
         return Response(content, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _authenticate(request):
+    """Authenticate the user of a plain Django request with the
+    authentication classes of the REST API (session, token, basic...), as
+    the DRF views do.
+
+    Args:
+        request:
+
+    Returns:
+        User.
+
+    Raises:
+        APIException: Invalid credentials.
+
+    """
+    return Request(
+        request,
+        authenticators=[
+            authentication_class()
+            for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ],
+    ).user
+
+
+async def get_result_from_data_id_async(request):
+    """Access data, Returns Result, Expects a data ID. Async version of
+    get_result_from_data_id for ASGI deployments: plain Django view, users
+    are authenticated with the authentication classes of the REST API.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        # get parameters
+        data_id = request.GET.get("id", None)
+        # if no data id given
+        if data_id is None:
+            content = {"message": "Data id is missing"}
+            return json_response(content, status=status.HTTP_400_BAD_REQUEST)
+
+        user = await sync_to_async(_authenticate)(request)
+        record = await sync_to_async(oai_record_api.get_by_id)(data_id, user)
+        # skip serialization if the client has the current version
+        etag = get_record_etag(record)
+        last_modified = get_record_last_modified(record)
+        not_modified_response = get_not_modified_response(
+            request, etag, last_modified
+        )
+        if not_modified_response is not None:
+            return not_modified_response
+        # No title for OaiRecord. Use of the id.
+        return_value = _serialize_result(
+            str(data_id), await sync_to_async(lambda: record.content)()
+        )
+        # Returns the response
+        return set_conditional_headers(
+            json_response(return_value, status=status.HTTP_200_OK),
+            etag,
+            last_modified,
+        )
+    except APIException as api_exception:
+        # invalid credentials
+        content = {"message": str(api_exception.detail)}
+        return json_response(content, status=api_exception.status_code)
+    except AccessControlError as access_error:
+        content = {"message": str(access_error)}
+        return json_response(content, status=status.HTTP_403_FORBIDDEN)
+    except DoesNotExist:
+        # The record doesn't exist with this id
+        content = {"message": "No Record found with the given id."}
+        return json_response(content, status=status.HTTP_404_NOT_FOUND)
+    except Exception as exception:
+        # if something went wrong, return an internal server error
+        content = {"message": str(exception)}
+        return json_response(
+            content, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _get_data_ids(request):
+    """Get the list of data ids from the request: "ids" JSON list in the
+    body (or the body itself if it is a list), or comma-separated /
+    repeated "ids" query parameter.
+
+    Args:
+        request:
+
+    Returns:
+        List of data ids, None if missing or invalid.
+
+    """
+    if request.method == "POST":
+        if isinstance(request.data, list):
+            return request.data
+        if not hasattr(request.data, "get"):
+            return None
+        data_ids = request.data.get("ids", None)
+        if isinstance(data_ids, str):
+            data_ids = data_ids.split(",")
+        return data_ids
+
+    data_ids = []
+    for value in request.GET.getlist("ids"):
+        data_ids.extend(value.split(","))
+    return data_ids or None
+
+
+@api_view(["GET", "POST"])
+@renderer_classes(get_renderer_classes())
+@schema(None)
+def get_results_from_data_ids(request):
+    """Access a batch of data, Returns a Result or an error for each of the
+    given data IDs
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        # get parameters
+        data_ids = _get_data_ids(request)
+        # if no data ids given
+        if not data_ids or not isinstance(data_ids, list):
+            content = {"message": "Data ids are missing"}
+            return Response(content, status=status.HTTP_400_BAD_REQUEST)
+        if len(data_ids) > EXPLORE_OAIPMH_RESULT_BATCH_MAX_SIZE:
+            content = {
+                "message": "Too many data ids, the maximum is "
+                f"{EXPLORE_OAIPMH_RESULT_BATCH_MAX_SIZE}."
+            }
+            return Response(content, status=status.HTTP_400_BAD_REQUEST)
+
+        data_ids = [str(data_id).strip() for data_id in data_ids]
+        valid_ids = [data_id for data_id in data_ids if data_id.isdigit()]
+        # get all the records at once
+        records = {
+            str(record.id): record
+            for record in oai_record_api.execute_query(
+                Q(pk__in=valid_ids), request.user, []
+            ).only("id", "file")
+        }
+
+        return_value = []
+        for data_id in data_ids:
+            record = records.get(data_id, None)
+            if record is None:
+                return_value.append(
+                    {
+                        "id": data_id,
+                        "message": "No Record found with the given id.",
+                        "status": status.HTTP_404_NOT_FOUND,
+                    }
+                )
+                continue
+            # No title for OaiRecord. Use of the id.
+            return_value.append(
+                {
+                    "id": data_id,
+                    "result": _serialize_result(data_id, record.content),
+                    "status": status.HTTP_200_OK,
+                }
+            )
+        # Returns the response
+        return Response(return_value, status=status.HTTP_200_OK)
+    except AccessControlError as access_error:
+        content = {"message": str(access_error)}
+        return Response(content, status=status.HTTP_403_FORBIDDEN)
+    except Exception as exception:
+        # if something went wrong, return an internal server error
+        content = {"message": str(exception)}
+        return Response(content, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
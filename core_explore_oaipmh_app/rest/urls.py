@@ -2,9 +2,30 @@
 
 from django.urls import re_path
 
+from core_explore_oaipmh_app.rest.query import views as query_views
 from core_explore_oaipmh_app.rest.result import views as result_views
 
 urlpatterns = [
+    re_path(
+        r"^query/export",
+        query_views.export_oaipmh_query_results,
+        name="core_explore_oaipmh_app_rest_export_query_results",
+    ),
+    re_path(
+        r"^query/?$",
+        query_views.get_oaipmh_query_results,
+        name="core_explore_oaipmh_app_rest_get_query_results",
+    ),
+    re_path(
+        r"^result/batch",
+        result_views.get_results_from_data_ids,
+        name="core_explore_oaipmh_app_rest_get_results_from_data_ids",
+    ),
+    re_path(
+        r"^async/result",
+        result_views.get_result_from_data_id_async,
+        name="core_explore_oaipmh_app_rest_get_result_from_data_id_async",
+    ),
     re_path(
         r"^result",
         result_views.get_result_from_data_id,
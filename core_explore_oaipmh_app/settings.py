@@ -10,3 +10,246 @@ if not settings.configured:
     settings.configure()
 
 INSTALLED_APPS = getattr(settings, "INSTALLED_APPS", [])
+
+EXPLORE_OAIPMH_CACHE_BACKEND = getattr(
+    settings, "EXPLORE_OAIPMH_CACHE_BACKEND", "default"
+)
+""" :py:class:`str`: Alias of the Django cache (``CACHES``) used to share the
+  registry and metadata format caches between processes. The caches are invalidated by
+  the model signals of the process saving the registries (web server or harvester): a
+  process-local cache (`None`) only sees the changes made by its own process, the other
+  processes serve the previous registries until `EXPLORE_OAIPMH_CACHE_TIMEOUT`.
+"""
+
+EXPLORE_OAIPMH_CACHE_TIMEOUT = getattr(
+    settings, "EXPLORE_OAIPMH_CACHE_TIMEOUT", 3600
+)
+""" :py:class:`int`: Lifetime (in seconds) of the registry and metadata format
+  cache entries, used as a safety net on top of the invalidation on model changes.
+"""
+
+EXPLORE_OAIPMH_QUERY_CACHE_SIZE = getattr(
+    settings, "EXPLORE_OAIPMH_QUERY_CACHE_SIZE", 256
+)
+""" :py:class:`int`: Maximum number of compiled OAI-PMH queries kept in the process-local
+  query cache. Set to `0` to disable the cache.
+"""
+
+EXPLORE_OAIPMH_COUNT_MODE = getattr(
+    settings, "EXPLORE_OAIPMH_COUNT_MODE", "exact"
+)
+""" :py:class:`str`: How the total number of results of an OAI-PMH search is computed:
+  `exact` (full count), `capped` (count stops after EXPLORE_OAIPMH_COUNT_CAP results) or
+  `estimated` (planner statistics, PostgreSQL only, `capped` otherwise).
+  Can be overridden per request with the `count_mode` query option.
+"""
+
+EXPLORE_OAIPMH_COUNT_CAP = getattr(settings, "EXPLORE_OAIPMH_COUNT_CAP", 1000)
+""" :py:class:`int`: Number of results after which a `capped` count stops.
+"""
+
+EXPLORE_OAIPMH_RESULT_MODE = getattr(
+    settings, "EXPLORE_OAIPMH_RESULT_MODE", "full"
+)
+""" :py:class:`str`: Content of the OAI-PMH search results: `full` (with the XML content),
+  `summary` (without content, for lists showing titles only) or `snippet` (an HTML
+  snippet of the text around the terms of the query, highlighted with `<mark>`).
+  Can be overridden per request with the `result_mode` query option. The results list
+  of the explore pages escapes the contents that are not XML: `snippet` is only
+  available from the REST API (query and export endpoints).
+"""
+
+EXPLORE_OAIPMH_SNIPPET_LENGTH = getattr(
+    settings, "EXPLORE_OAIPMH_SNIPPET_LENGTH", 300
+)
+""" :py:class:`int`: Maximum number of characters of text in the snippet of a result,
+  in the `snippet` result mode.
+"""
+
+EXPLORE_OAIPMH_SNIPPET_MAX_FRAGMENTS = getattr(
+    settings, "EXPLORE_OAIPMH_SNIPPET_MAX_FRAGMENTS", 3
+)
+""" :py:class:`int`: Maximum number of matches shown in the snippet of a result, in the
+  `snippet` result mode.
+"""
+
+EXPLORE_OAIPMH_EXPORT_CHUNK_SIZE = getattr(
+    settings, "EXPLORE_OAIPMH_EXPORT_CHUNK_SIZE", 100
+)
+""" :py:class:`int`: Default number of records fetched from the database at a time
+  when streaming the results of an OAI-PMH search.
+"""
+
+EXPLORE_OAIPMH_EXPORT_MAX_CHUNK_SIZE = getattr(
+    settings, "EXPLORE_OAIPMH_EXPORT_MAX_CHUNK_SIZE", 1000
+)
+""" :py:class:`int`: Maximum chunk size a client can request when streaming the results
+  of an OAI-PMH search.
+"""
+
+EXPLORE_OAIPMH_RESULT_BATCH_MAX_SIZE = getattr(
+    settings, "EXPLORE_OAIPMH_RESULT_BATCH_MAX_SIZE", 100
+)
+""" :py:class:`int`: Maximum number of record ids accepted by the batch result endpoint.
+"""
+
+EXPLORE_OAIPMH_RENDER_CACHE_BACKEND = getattr(
+    settings, "EXPLORE_OAIPMH_RENDER_CACHE_BACKEND", None
+)
+""" :py:class:`str`: Alias of the Django cache (``CACHES``) storing the HTML rendering
+  of the OAI-PMH records. Set to `None` to use a process-local cache.
+"""
+
+EXPLORE_OAIPMH_RENDER_CACHE_SIZE = getattr(
+    settings, "EXPLORE_OAIPMH_RENDER_CACHE_SIZE", 128
+)
+""" :py:class:`int`: Maximum number of HTML renderings kept in the process-local cache.
+  Set to `0` to disable the cache.
+"""
+
+EXPLORE_OAIPMH_RENDER_CACHE_TIMEOUT = getattr(
+    settings, "EXPLORE_OAIPMH_RENDER_CACHE_TIMEOUT", 3600
+)
+""" :py:class:`int`: Lifetime (in seconds) of a cached HTML rendering. Renderings of
+  harvested records are keyed by last modification date, the timeout bounds how long
+  an edited XSLT can be served stale.
+"""
+
+EXPLORE_OAIPMH_XSLT_POOL_SIZE = getattr(
+    settings, "EXPLORE_OAIPMH_XSLT_POOL_SIZE", 64
+)
+""" :py:class:`int`: Maximum number of compiled XSLT stylesheets kept by each process.
+"""
+
+EXPLORE_OAIPMH_XSLT_POOL_WARM_UP = getattr(
+    settings, "EXPLORE_OAIPMH_XSLT_POOL_WARM_UP", True
+)
+""" :py:class:`bool`: Compile the default detail XSLT of the templates of the activated
+  registries when a process loads the apps (once the tables are migrated).
+"""
+
+EXPLORE_OAIPMH_PRERENDER = getattr(settings, "EXPLORE_OAIPMH_PRERENDER", False)
+""" :py:class:`bool`: Render the detail HTML of the OAI-PMH records with the default
+  detail XSLT of their template when they are saved by the harvester.
+"""
+
+EXPLORE_OAIPMH_PRERENDER_CACHE_BACKEND = getattr(
+    settings, "EXPLORE_OAIPMH_PRERENDER_CACHE_BACKEND", "default"
+)
+""" :py:class:`str`: Alias of the Django cache (``CACHES``) storing the pre-rendered
+  records. Must be shared between the harvester workers and the web server processes.
+"""
+
+EXPLORE_OAIPMH_PRERENDER_CACHE_TIMEOUT = getattr(
+    settings, "EXPLORE_OAIPMH_PRERENDER_CACHE_TIMEOUT", None
+)
+""" :py:class:`int`: Lifetime (in seconds) of a pre-rendered record. Set to `None` to
+  keep pre-rendered records until they are evicted by the cache backend.
+"""
+
+EXPLORE_OAIPMH_XSLT_THREADS = getattr(
+    settings, "EXPLORE_OAIPMH_XSLT_THREADS", 4
+)
+""" :py:class:`int`: Number of threads running the XSLT transformations of the async
+  views, per process.
+"""
+
+EXPLORE_OAIPMH_EXECUTION_MODE = getattr(
+    settings, "EXPLORE_OAIPMH_EXECUTION_MODE", "single"
+)
+""" :py:class:`str`: Default execution mode of the OAI-PMH searches: `single` to run
+  one query over all the registries, `fanout` to run one query per registry (or
+  metadata format) concurrently and merge the results on the sorting fields.
+"""
+
+EXPLORE_OAIPMH_FANOUT_THREADS = getattr(
+    settings, "EXPLORE_OAIPMH_FANOUT_THREADS", 8
+)
+""" :py:class:`int`: Number of threads running the sub-queries of the `fanout` execution
+  mode, per process. Set to `0` to run the sub-queries sequentially.
+"""
+
+EXPLORE_OAIPMH_FANOUT_TIMEOUT = getattr(
+    settings, "EXPLORE_OAIPMH_FANOUT_TIMEOUT", 10
+)
+""" :py:class:`float`: Time (in seconds) given to the sub-queries of the `fanout`
+  execution mode. Registries that don't answer in time are left out of the results, and
+  their queries are stopped by the database (PostgreSQL `statement_timeout`, MongoDB
+  `maxTimeMS`; other databases let them run to completion). Set to `None` to wait for
+  all the registries.
+"""
+
+EXPLORE_OAIPMH_FANOUT_MAX_OFFSET = getattr(
+    settings, "EXPLORE_OAIPMH_FANOUT_MAX_OFFSET", 1000
+)
+""" :py:class:`int`: Number of results before the requested page above which the
+  `fanout` execution mode runs a single query: each sub-query returns the ids of the
+  records up to the end of the page.
+"""
+
+EXPLORE_OAIPMH_TIMING_METRICS_HOOK = getattr(
+    settings, "EXPLORE_OAIPMH_TIMING_METRICS_HOOK", None
+)
+""" :py:class:`str`: Dotted path of a function called with the request and the timings
+  of its OAI-PMH explore stages (``{stage: {"duration", "queries"}}``), to send them to a
+  metrics system (Prometheus, StatsD). Requires
+  ``core_explore_oaipmh_app.middleware.timing.TimingMiddleware``. Set to `None` to
+  disable.
+"""
+
+EXPLORE_OAIPMH_DATA_VERSION = getattr(
+    settings, "EXPLORE_OAIPMH_DATA_VERSION", False
+)
+""" :py:class:`bool`: Keep a data version per registry and per metadata format, bumped
+  when their records are harvested or deleted. Each record write then costs a cache
+  round-trip: only needed by the consumers of the versions. Always on when the page
+  cache is on.
+"""
+
+EXPLORE_OAIPMH_DATA_VERSION_CACHE_BACKEND = getattr(
+    settings, "EXPLORE_OAIPMH_DATA_VERSION_CACHE_BACKEND", "default"
+)
+""" :py:class:`str`: Alias of the Django cache (``CACHES``) storing the data versions.
+  Must be shared between the harvester workers and the web server processes.
+"""
+
+EXPLORE_OAIPMH_DATA_VERSION_BATCH_INTERVAL = getattr(
+    settings, "EXPLORE_OAIPMH_DATA_VERSION_BATCH_INTERVAL", 60
+)
+""" :py:class:`int`: Minimum time (in seconds) between two bumps of the data versions of
+  a registry while it is harvested. Pending bumps are applied at the end of the harvest.
+"""
+
+EXPLORE_OAIPMH_PAGE_CACHE = getattr(
+    settings, "EXPLORE_OAIPMH_PAGE_CACHE", False
+)
+""" :py:class:`bool`: Cache the formatted result pages of the OAI-PMH searches. Cached
+  pages are versioned by the data version of the registries they touch, bumped every
+  time the harvester saves a record.
+"""
+
+EXPLORE_OAIPMH_PAGE_CACHE_BACKEND = getattr(
+    settings, "EXPLORE_OAIPMH_PAGE_CACHE_BACKEND", "default"
+)
+""" :py:class:`str`: Alias of the Django cache (``CACHES``) storing the result pages.
+"""
+
+EXPLORE_OAIPMH_PAGE_CACHE_TIMEOUT = getattr(
+    settings, "EXPLORE_OAIPMH_PAGE_CACHE_TIMEOUT", 86400
+)
+""" :py:class:`int`: Lifetime (in seconds) of a cached result page. Only used to evict
+  pages no longer requested, harvested records invalidate the pages through the data
+  versions.
+"""
+
+EXPLORE_OAIPMH_PAGE_CACHE_MAX_PAGE = getattr(
+    settings, "EXPLORE_OAIPMH_PAGE_CACHE_MAX_PAGE", 5
+)
+""" :py:class:`int`: Only the result pages up to this page number are cached.
+"""
+
+EXPLORE_OAIPMH_FAST_JSON = getattr(settings, "EXPLORE_OAIPMH_FAST_JSON", False)
+""" :py:class:`bool`: Serialize the results of the REST endpoints of the app without
+  the ResultSerializer, and encode them with orjson if installed (the standard json
+  module otherwise). Set to `False` to use the DRF serializer and renderer.
+"""
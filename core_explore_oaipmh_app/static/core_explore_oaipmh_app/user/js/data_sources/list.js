@@ -7,6 +7,7 @@ var defer_loadListProviderOaiPmh = function(){
     $(document).ready(function() {
         $('#error-div-oaipmh').hide();
         loadListProviderOaiPmh();
+        $(window).on("pagehide", flushQueryDataSourcesOaiPmh);
     })
 };
 
@@ -20,18 +21,21 @@ loadListProviderOaiPmh = function() {
     $('#error-div-oaipmh').hide();
     var query_id = $("#query_id").html();
     $.ajax({
-        url: getDataSourceOaiPmhUrl,
+        url: getDataSourceListOaiPmhUrl,
         type : "GET",
+        dataType: "json",
         data: {
             id_query: query_id
         },
         success: function(data){
             // Displays oaipmh search's data sources
-            $("#list-data-sources-oaipmh-content").html(data);
-            // Adds action on each oaipmh search's checkbox
-            $("input.checkbox-oaipmh:checkbox").on("click",
-                                                   {id_query: query_id},
-                                                   updateQueryDataSourcesOaiPmhTimeout);
+            renderListProviderOaiPmh(data);
+            // Adds action on oaipmh search's checkboxes
+            $("#list-data-sources-oaipmh-content")
+                .off("click", "input.checkbox-oaipmh:checkbox")
+                .on("click", "input.checkbox-oaipmh:checkbox",
+                    {id_query: query_id},
+                    updateQueryDataSourcesOaiPmhTimeout);
         },
         error: function(data){
             if (data.responseText != ""){
@@ -43,8 +47,39 @@ loadListProviderOaiPmh = function() {
     });
 };
 
+/*
+* Renders provider's list
+* */
+renderListProviderOaiPmh = function(instances) {
+    var $table = $("<table>", {"class": "tab-selector"});
+    if (instances.length == 0) {
+        $table.append(
+            $("<tr>").append(
+                $("<td>", {"class": "empty"}).text("No OAI-PMH Registries available.")
+            )
+        );
+    }
+    $.each(instances, function(index, instance) {
+        $table.append(
+            $("<tr>").append(
+                $("<td>").append(
+                    $("<input>", {
+                        "class": "checkbox checkbox-oaipmh",
+                        "type": "checkbox",
+                        "value": instance.instance_id,
+                        "checked": instance.is_checked
+                    })
+                ),
+                $("<td>").text(instance.instance_name)
+            )
+        );
+    });
+    $("#list-data-sources-oaipmh-content").empty().append($table);
+};
+
 /*
 * Updates the timeout and updates query data sources when done.
+* Clicks made during the timeout are sent in a single update.
 * */
 updateQueryDataSourcesOaiPmhTimeout = function(event){
     // Clears timeout
@@ -52,20 +87,31 @@ updateQueryDataSourcesOaiPmhTimeout = function(event){
         clearTimeout(timeout_oaipmh);
     }
     // Starts timeout
-    timeout_oaipmh = setTimeout(updateQueryDataSourcesOaiPmh(event), 500);
+    timeout_oaipmh = setTimeout(function() {
+        timeout_oaipmh = null;
+        updateQueryDataSourcesOaiPmh(event.data.id_query);
+    }, 500);
+};
+
+/*
+* Returns the ids of the selected instances
+* */
+getSelectedInstanceIdsOaiPmh = function(){
+    return $("input.checkbox-oaipmh:checkbox:checked").map(function() {
+        return this.value;
+    }).get();
 };
 
 /*
 * AJAX: Updates query data sources
 * */
-updateQueryDataSourcesOaiPmh = function(event){
+updateQueryDataSourcesOaiPmh = function(id_query){
     $.ajax({
-        url: updateQueryDataSourcesOaiPmhUrl,
-        type : "GET",
+        url: setQueryDataSourcesOaiPmhUrl,
+        type : "POST",
         data: {
-            'id_query': event.data.id_query,
-            'id_instance': event.target.value,
-            'to_be_added': event.target.checked
+            'id_query': id_query,
+            'instance_ids': JSON.stringify(getSelectedInstanceIdsOaiPmh())
         },
         success: function(data){
         },
@@ -79,6 +125,21 @@ updateQueryDataSourcesOaiPmh = function(event){
     });
 };
 
+/*
+* Sends the pending update if the page is left during the timeout
+* */
+flushQueryDataSourcesOaiPmh = function(){
+    if(timeout_oaipmh) {
+        clearTimeout(timeout_oaipmh);
+        timeout_oaipmh = null;
+        var form_data = new FormData();
+        form_data.append('csrfmiddlewaretoken', csrftoken);
+        form_data.append('id_query', $("#query_id").html());
+        form_data.append('instance_ids', JSON.stringify(getSelectedInstanceIdsOaiPmh()));
+        navigator.sendBeacon(setQueryDataSourcesOaiPmhUrl, form_data);
+    }
+};
+
 /*
 * Shows label error with message
 * */
@@ -7,6 +7,11 @@ import core_explore_oaipmh_app.views.user.ajax as user_ajax
 import core_explore_oaipmh_app.views.user.views as user_views
 
 urlpatterns = [
+    re_path(
+        r"^get_data_source_list",
+        user_ajax.get_data_source_list_oaipmh_json,
+        name="core_explore_oaipmh_app_get_data_source_list",
+    ),
     re_path(
         r"^get_data_sources",
         user_ajax.get_data_source_list_oaipmh,
@@ -17,6 +22,21 @@ urlpatterns = [
         user_ajax.update_data_source_list_oaipmh,
         name="core_explore_oaipmh_app_update_data_sources",
     ),
+    re_path(
+        r"^set_data_sources",
+        user_ajax.set_data_source_list_oaipmh,
+        name="core_explore_oaipmh_app_set_data_sources",
+    ),
+    re_path(
+        r"^async/data",
+        user_views.data_detail_async,
+        name="core_explore_oaipmh_app_data_detail_async",
+    ),
+    re_path(
+        r"^async/change-data-display",
+        user_ajax.change_data_display_async,
+        name="core_explore_oaipmh_app_change_data_display_async",
+    ),
     re_path(
         r"^data",
         user_views.data_detail,
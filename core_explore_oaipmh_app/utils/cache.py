@@ -0,0 +1,349 @@
+"""Cache utils for the explore OAI-PMH app"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+_MISSING = object()
+_cache_registry = dict()
+_cache_registry_lock = threading.Lock()
+
+
+class LocalCache:
+    """Process-local cache, bounded in size (LRU eviction) and in time"""
+
+    def __init__(self, name, timeout=None, max_size=None):
+        """Init the cache
+
+        Args:
+            name: Name of the cache.
+            timeout: Entry lifetime in seconds (None: no expiry).
+            max_size: Maximum number of entries (None: unbounded).
+        """
+        self.name = name
+        self.timeout = timeout
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """Get a value from the cache
+
+        Args:
+            key:
+            default:
+
+        Returns:
+
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, timeout=_MISSING):
+        """Set a value in the cache
+
+        Args:
+            key:
+            value:
+            timeout: Entry lifetime in seconds, default to the cache timeout.
+
+        Returns:
+
+        """
+        timeout = self.timeout if timeout is _MISSING else timeout
+        expires_at = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def get_many(self, keys):
+        """Get several values from the cache
+
+        Args:
+            keys:
+
+        Returns:
+            Dict {key: value} of the keys found in the cache.
+
+        """
+        values = dict()
+        with self._lock:
+            for key in keys:
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    values[key] = value
+        return values
+
+    def incr(self, key, initial=0):
+        """Increment a counter, set it to the initial value if missing.
+        Counters don't expire.
+
+        Args:
+            key:
+            initial: Value of a missing counter.
+
+        Returns:
+            Value of the counter.
+
+        """
+        with self._lock:
+            value = self.get(key, _MISSING)
+            value = initial if value is _MISSING else value + 1
+            self.set(key, value, timeout=None)
+            return value
+
+    def delete(self, key):
+        """Delete a value from the cache
+
+        Args:
+            key:
+
+        Returns:
+
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all the values from the cache and reset the statistics
+
+        Returns:
+
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """Return cache usage statistics
+
+        Returns:
+
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+class SharedCache:
+    """Cache stored in one of the Django cache backends, shared between processes"""
+
+    def __init__(self, name, alias, timeout=None):
+        """Init the cache
+
+        Args:
+            name: Name of the cache, used as a key prefix.
+            alias: Alias of the Django cache (settings.CACHES).
+            timeout: Entry lifetime in seconds (None: no expiry).
+        """
+        self.name = name
+        self.alias = alias
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _backend(self):
+        """Return the Django cache backend"""
+        return caches[self.alias]
+
+    def _get_namespace(self):
+        """Return the current namespace of the cache. Changing the namespace
+        invalidates all the keys of the cache at once, in every process.
+
+        Returns:
+
+        """
+        namespace_key = f"core_explore_oaipmh_app:{self.name}:namespace"
+        namespace = self._backend.get(namespace_key)
+        if namespace is None:
+            namespace = uuid.uuid4().hex
+            if not self._backend.add(namespace_key, namespace, timeout=None):
+                namespace = self._backend.get(namespace_key, namespace)
+        return namespace
+
+    def _make_key(self, key):
+        """Build the key used in the Django cache
+
+        Args:
+            key:
+
+        Returns:
+
+        """
+        return f"core_explore_oaipmh_app:{self.name}:{self._get_namespace()}:{key}"
+
+    def get(self, key, default=None):
+        """Get a value from the cache
+
+        Args:
+            key:
+            default:
+
+        Returns:
+
+        """
+        value = self._backend.get(self._make_key(key), _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key, value, timeout=_MISSING):
+        """Set a value in the cache
+
+        Args:
+            key:
+            value:
+            timeout: Entry lifetime in seconds, default to the cache timeout.
+
+        Returns:
+
+        """
+        timeout = self.timeout if timeout is _MISSING else timeout
+        self._backend.set(self._make_key(key), value, timeout=timeout)
+
+    def get_many(self, keys):
+        """Get several values from the cache, in a single call to the backend
+
+        Args:
+            keys:
+
+        Returns:
+            Dict {key: value} of the keys found in the cache.
+
+        """
+        namespace = self._get_namespace()
+        cache_keys = {
+            f"core_explore_oaipmh_app:{self.name}:{namespace}:{key}": key
+            for key in keys
+        }
+        values = {
+            cache_keys[cache_key]: value
+            for cache_key, value in self._backend.get_many(
+                list(cache_keys)
+            ).items()
+        }
+        self.hits += len(values)
+        self.misses += len(cache_keys) - len(values)
+        return values
+
+    def incr(self, key, initial=0):
+        """Increment a counter atomically, set it to the initial value if
+        missing. Counters don't expire.
+
+        Args:
+            key:
+            initial: Value of a missing counter.
+
+        Returns:
+            Value of the counter.
+
+        """
+        cache_key = self._make_key(key)
+        while True:
+            try:
+                return self._backend.incr(cache_key)
+            except ValueError:
+                # missing counter
+                if self._backend.add(cache_key, initial, timeout=None):
+                    return initial
+
+    def delete(self, key):
+        """Delete a value from the cache
+
+        Args:
+            key:
+
+        Returns:
+
+        """
+        self._backend.delete(self._make_key(key))
+
+    def clear(self):
+        """Remove all the values from the cache, by switching to a new
+        namespace, and reset the statistics
+
+        Returns:
+
+        """
+        self.hits = 0
+        self.misses = 0
+        self._backend.set(
+            f"core_explore_oaipmh_app:{self.name}:namespace",
+            uuid.uuid4().hex,
+            timeout=None,
+        )
+
+    def get_stats(self):
+        """Return cache usage statistics (for the current process)
+
+        Returns:
+
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "alias": self.alias,
+        }
+
+
+def get_cache(name, backend=None, timeout=None, max_size=None):
+    """Return the cache registered with the given name, create it if needed.
+
+    Args:
+        name: Name of the cache.
+        backend: Alias of a Django cache to share the cache between
+            processes, None for a process-local cache.
+        timeout: Entry lifetime in seconds (None: no expiry).
+        max_size: Maximum number of entries of a process-local cache.
+
+    Returns:
+
+    """
+    with _cache_registry_lock:
+        if name not in _cache_registry:
+            if backend:
+                _cache_registry[name] = SharedCache(
+                    name, backend, timeout=timeout
+                )
+            else:
+                _cache_registry[name] = LocalCache(
+                    name, timeout=timeout, max_size=max_size
+                )
+        return _cache_registry[name]
+
+
+def clear_all():
+    """Clear all the caches of the app
+
+    Returns:
+
+    """
+    with _cache_registry_lock:
+        cache_list = list(_cache_registry.values())
+    for cache in cache_list:
+        cache.clear()
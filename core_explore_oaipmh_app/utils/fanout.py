@@ -0,0 +1,371 @@
+"""Fan-out execution of the OAI-PMH queries: one sub-query per registry (or
+metadata format), run concurrently and merged on the sorting fields.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from core_explore_oaipmh_app.settings import EXPLORE_OAIPMH_FANOUT_THREADS
+from core_explore_oaipmh_app.utils.pagination.keyset import (
+    get_ordering,
+    parse_order_by_field,
+)
+
+logger = logging.getLogger(__name__)
+
+# keys of the criteria restricting a raw query to registries or metadata
+# formats (Django and Mongo)
+PARTITION_KEYS = (
+    "registry",
+    "_registry_id",
+    "harvester_metadata_format",
+    "_harvester_metadata_format_id",
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_fanout_executor():
+    """Return the thread pool running the sub-queries of the fan-out
+    queries. The pool is shared by the requests of the process.
+
+    Returns:
+        ThreadPoolExecutor
+
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=EXPLORE_OAIPMH_FANOUT_THREADS,
+                thread_name_prefix="explore_oaipmh_fanout",
+            )
+        return _executor
+
+
+def split_raw_query(raw_query):
+    """Split a raw query restricted to a list of registries (or metadata
+    formats) into one sub-query per registry (or metadata format).
+
+    Args:
+        raw_query: Raw query built by build_oaipmh_query.
+
+    Returns:
+        Dict {partition_id: sub_query}, empty if the query can't be split.
+
+    """
+    criteria = raw_query.get("$and", None)
+    if not isinstance(criteria, list):
+        return dict()
+    # the partition criterion is added after the user query
+    for index in reversed(range(len(criteria))):
+        criterion = criteria[index]
+        if not isinstance(criterion, dict) or len(criterion) != 1:
+            continue
+        key, value = next(iter(criterion.items()))
+        if (
+            key in PARTITION_KEYS
+            and isinstance(value, dict)
+            and "$in" in value
+        ):
+            sub_queries = dict()
+            for partition_id in value["$in"]:
+                sub_criteria = list(criteria)
+                sub_criteria[index] = {key: {"$in": [partition_id]}}
+                sub_queries[partition_id] = {"$and": sub_criteria}
+            return sub_queries
+    return dict()
+
+
+def _count(queryset):
+    """Count the records of a queryset, limit included.
+
+    Args:
+        queryset:
+
+    Returns:
+
+    """
+    if settings.MONGODB_INDEXING:
+        return queryset.count(with_limit_and_skip=True)
+    return queryset.count()
+
+
+@contextmanager
+def _statement_timeout(queryset, timeout):
+    """Bound the time of the database queries run in the block, on the
+    connection of the current thread. Mongo querysets are bounded with
+    maxTimeMS, Django querysets with the PostgreSQL statement_timeout.
+    Other databases are not bounded.
+
+    Args:
+        queryset:
+        timeout: Time (in seconds).
+
+    Returns:
+        Bounded queryset.
+
+    """
+    timeout_ms = max(int(timeout * 1000), 1)
+    if settings.MONGODB_INDEXING:
+        yield queryset.max_time_ms(timeout_ms)
+        return
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        yield queryset
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SET statement_timeout = %s", [timeout_ms])
+    try:
+        yield queryset
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("RESET statement_timeout")
+
+
+def _run_in_thread(func, queryset, deadline=None):
+    """Run a function on a queryset from a thread of the pool, release the
+    database connection of the thread if needed. The queries are stopped at
+    the deadline: sub-queries left out by a request don't keep holding a
+    thread and a connection.
+
+    Args:
+        func:
+        queryset:
+        deadline: time.monotonic() deadline, None for no limit.
+
+    Returns:
+
+    """
+    try:
+        if deadline is None:
+            return func(queryset)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # the request stopped waiting for this sub-query
+            raise TimeoutError("OAI-PMH sub-query started after its deadline.")
+        with _statement_timeout(queryset, remaining) as bounded_queryset:
+            return func(bounded_queryset)
+    finally:
+        close_old_connections()
+
+
+class FanOutResults:
+    """Records of several sub-queries, merged on the sorting fields.
+    Supports count() and slicing, to be paginated like a queryset.
+
+    Each sub-query counts its records and returns the ids of its first
+    records in a single step: a partition is in both the count and the page,
+    or in neither. The ids of the page are then ordered by the database,
+    with its collation, in a single query on the merged queryset.
+
+    The sub-queries share one deadline per request. Sub-queries that don't
+    complete before it are left out of the results, their partition ids are
+    listed in `degraded`. Sub-queries not started yet are cancelled, the
+    running ones are stopped by the database at the deadline (PostgreSQL
+    statement_timeout, Mongo maxTimeMS): they don't hold the shared thread
+    pool after the request gave up on them.
+    """
+
+    ordered = True
+
+    def __init__(
+        self,
+        querysets,
+        queryset,
+        order_by_field,
+        timeout=None,
+        threads=1,
+        prefetch=0,
+    ):
+        """Init the results
+
+        Args:
+            querysets: Dict {partition_id: queryset}.
+            queryset: Queryset of all the partitions, ordering the merged
+                records.
+            order_by_field: List of sorting fields ("+title", "-title").
+            timeout: Time (in seconds) given to the sub-queries of the
+                request (count and page). None to wait for all the
+                sub-queries.
+            threads: Run the sub-queries on the thread pool if > 0,
+                sequentially otherwise.
+            prefetch: Number of record ids returned by the sub-queries with
+                their count: the end of the requested page.
+        """
+        ordering = get_ordering(parse_order_by_field(order_by_field))
+        self.querysets = {
+            partition_id: partition_queryset.order_by(*ordering)
+            for partition_id, partition_queryset in querysets.items()
+        }
+        self.queryset = queryset.order_by(*ordering)
+        self.deadline = (
+            time.monotonic() + timeout if timeout is not None else None
+        )
+        self.threads = threads
+        self.prefetch = prefetch
+        self.degraded = set()
+        # first record ids of each partition, returned with the counts
+        self._record_ids = None
+
+    def _run(self, func):
+        """Run a function on the queryset of each partition.
+
+        Args:
+            func:
+
+        Returns:
+            Dict {partition_id: result} of the completed partitions.
+
+        """
+        querysets = {
+            partition_id: queryset
+            for partition_id, queryset in self.querysets.items()
+            if partition_id not in self.degraded
+        }
+        if self.threads <= 0 or len(querysets) < 2:
+            return {
+                partition_id: func(queryset)
+                for partition_id, queryset in querysets.items()
+            }
+
+        executor = get_fanout_executor()
+        futures = {
+            executor.submit(
+                _run_in_thread, func, queryset, self.deadline
+            ): partition_id
+            for partition_id, queryset in querysets.items()
+        }
+        done, not_done = wait(
+            futures,
+            timeout=(
+                max(self.deadline - time.monotonic(), 0)
+                if self.deadline is not None
+                else None
+            ),
+        )
+        timed_out = set()
+        for future in not_done:
+            future.cancel()
+            timed_out.add(futures[future])
+        results = dict()
+        for future in done:
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                if self.deadline is None or time.monotonic() < self.deadline:
+                    raise
+                # stopped by the database (or not started) at the deadline
+                timed_out.add(futures[future])
+        if timed_out:
+            self.degraded.update(timed_out)
+            logger.warning(
+                "OAI-PMH sub-queries timed out, partitions left out: %s",
+                sorted(timed_out),
+            )
+        return results
+
+    @staticmethod
+    def _get_record_ids(queryset, stop):
+        """Return the ids of the first records of a queryset.
+
+        Args:
+            queryset:
+            stop:
+
+        Returns:
+
+        """
+        if stop <= 0:
+            return []
+        return list(queryset.values_list("pk", flat=True)[:stop])
+
+    def _count(self, count_func):
+        """Count the records of each partition, keep the ids of their first
+        records.
+
+        Args:
+            count_func: Count of a queryset.
+
+        Returns:
+
+        """
+        results = self._run(
+            lambda queryset: (
+                count_func(queryset),
+                self._get_record_ids(queryset, self.prefetch),
+            )
+        )
+        self._record_ids = {
+            partition_id: record_ids
+            for partition_id, (_, record_ids) in results.items()
+        }
+        return sum(count for count, _ in results.values())
+
+    def count(self):
+        """Return the number of records.
+
+        Returns:
+
+        """
+        return self._count(_count)
+
+    def count_up_to(self, limit):
+        """Count the records, stop after limit records.
+
+        Args:
+            limit:
+
+        Returns:
+
+        """
+        return min(
+            self._count(lambda queryset: _count(queryset[:limit])), limit
+        )
+
+    def __len__(self):
+        """Return the number of records"""
+        return self.count()
+
+    def __getitem__(self, key):
+        """Return a record, or a list of records for a slice. A slice only
+        loads the ids of the records up to its end from each partition.
+
+        Args:
+            key:
+
+        Returns:
+
+        """
+        if isinstance(key, int):
+            if key < 0:
+                raise IndexError("Negative indexing is not supported.")
+            return self[slice(key, key + 1)][0]
+        if key.step is not None or key.stop is None:
+            raise IndexError("Only bounded slices are supported.")
+        start = key.start or 0
+        if start < 0 or key.stop < 0:
+            raise IndexError("Negative indexing is not supported.")
+        if self._record_ids is not None and key.stop <= self.prefetch:
+            record_ids = self._record_ids
+        else:
+            record_ids = self._run(
+                lambda queryset: self._get_record_ids(queryset, key.stop)
+            )
+        merged_ids = [
+            record_id
+            for partition_id, partition_ids in record_ids.items()
+            if partition_id not in self.degraded
+            for record_id in partition_ids
+        ]
+        if not merged_ids:
+            return []
+        stop = key.stop
+        return list(self.queryset.filter(pk__in=merged_ids)[start:stop])
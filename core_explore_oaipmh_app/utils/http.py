@@ -0,0 +1,107 @@
+"""HTTP utils for the explore OAI-PMH app"""
+
+import hashlib
+from datetime import datetime
+
+import pytz
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def get_record_etag(record, *args):
+    """Return a strong ETag for a record: changes when the record is
+    harvested again (last modification date) or when one of the extra
+    arguments (XSLT id, user...) changes.
+
+    Args:
+        record: OaiRecord.
+        *args: Extra values identifying the representation.
+
+    Returns:
+        ETag (str).
+
+    """
+    last_modification_date = record.last_modification_date
+    etag_values = [
+        str(record.id),
+        (
+            last_modification_date.isoformat()
+            if isinstance(last_modification_date, datetime)
+            else ""
+        ),
+    ] + ["" if arg is None else str(arg) for arg in args]
+    return '"{0}"'.format(
+        hashlib.sha256(":".join(etag_values).encode("utf-8")).hexdigest()
+    )
+
+
+def get_content_etag(content):
+    """Return a strong ETag for a response content.
+
+    Args:
+        content: Content of the response (bytes).
+
+    Returns:
+        ETag (str).
+
+    """
+    return '"{0}"'.format(hashlib.sha256(content).hexdigest())
+
+
+def get_record_last_modified(record):
+    """Return the last modification timestamp of a record.
+
+    Args:
+        record: OaiRecord.
+
+    Returns:
+        Timestamp (int), or None.
+
+    """
+    last_modification_date = record.last_modification_date
+    if not isinstance(last_modification_date, datetime):
+        return None
+    if last_modification_date.tzinfo is None:
+        last_modification_date = last_modification_date.replace(
+            tzinfo=pytz.UTC
+        )
+    return int(last_modification_date.timestamp())
+
+
+def get_not_modified_response(request, etag, last_modified):
+    """Return a 304 (or 412) response if the client already has the current
+    representation, None otherwise.
+
+    Args:
+        request:
+        etag:
+        last_modified: Timestamp (int).
+
+    Returns:
+
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        set_conditional_headers(response, etag, last_modified)
+    return response
+
+
+def set_conditional_headers(response, etag, last_modified):
+    """Set the validators of the representation on the response. Clients
+    have to revalidate before reusing it.
+
+    Args:
+        response:
+        etag:
+        last_modified: Timestamp (int).
+
+    Returns:
+
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,147 @@
+"""Cache of the formatted result pages of the OAI-PMH searches"""
+
+import json
+
+from django.core.paginator import Paginator
+
+from core_explore_oaipmh_app.components.data_version import (
+    api as data_version_api,
+)
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_PAGE_CACHE_BACKEND,
+    EXPLORE_OAIPMH_PAGE_CACHE_TIMEOUT,
+)
+from core_explore_oaipmh_app.utils.cache import get_cache
+from core_explore_oaipmh_app.utils.query import get_query_hash
+
+# page attributes restored from the cache
+PAGE_ATTRIBUTES = (
+    "results_count",
+    "result_mode",
+    "count_mode",
+    "count_is_exact",
+    "count_display",
+    "degraded_partitions",
+)
+
+
+def _get_cache():
+    """Return the result page cache
+
+    Returns:
+
+    """
+    return get_cache(
+        "result_page",
+        backend=EXPLORE_OAIPMH_PAGE_CACHE_BACKEND,
+        timeout=EXPLORE_OAIPMH_PAGE_CACHE_TIMEOUT,
+    )
+
+
+def get_user_class(user):
+    """Return the permission class of a user.
+
+    Args:
+        user:
+
+    Returns:
+
+    """
+    if user is None or not user.is_authenticated:
+        return "anonymous"
+    if user.is_superuser:
+        return "superuser"
+    if user.is_staff:
+        return "staff"
+    return "authenticated"
+
+
+def _normalize_query(query):
+    """Parse a JSON query so that equivalent queries share their key.
+
+    Args:
+        query:
+
+    Returns:
+
+    """
+    if isinstance(query, str):
+        try:
+            return json.loads(query)
+        except ValueError:
+            return query
+    return query
+
+
+def get_page_cache_key(query_data, user, registry_ids, *variants):
+    """Return the cache key of a result page. The key changes with the data
+    version of the registries touched by the query, and with the registries
+    themselves when one is activated or deactivated: harvesting a registry
+    doesn't drop the pages of the other registries.
+
+    Args:
+        query_data: Query payload.
+        user:
+        registry_ids: Ids of the registries touched by the query.
+        *variants: Page number, sorting fields, modes...
+
+    Returns:
+
+    """
+    return get_query_hash(
+        _normalize_query(query_data.get("query", None)),
+        _normalize_query(query_data.get("templates", "[]")),
+        _normalize_query(query_data.get("options", None)),
+        get_user_class(user),
+        data_version_api.get_versions(registry_ids),
+        *variants,
+    )
+
+
+def get_cached_page(key):
+    """Return a cached result page, None if not cached. The formatted
+    results of the page are in its cached_results attribute.
+
+    Args:
+        key:
+
+    Returns:
+
+    """
+    entry = _get_cache().get(key)
+    if entry is None:
+        return None
+    # the paginator only needs the number of results
+    paginator = Paginator(range(entry["count"]), entry["per_page"])
+    page = paginator.page(entry["number"])
+    for attribute, value in entry["attributes"].items():
+        setattr(page, attribute, value)
+    page.cached_results = entry["results"]
+    return page
+
+
+def set_cached_page(key, page, results):
+    """Cache a result page and its formatted results.
+
+    Args:
+        key:
+        page:
+        results: Formatted results.
+
+    Returns:
+
+    """
+    _get_cache().set(
+        key,
+        {
+            "count": page.paginator.count,
+            "per_page": page.paginator.per_page,
+            "number": page.number,
+            "attributes": {
+                attribute: getattr(page, attribute)
+                for attribute in PAGE_ATTRIBUTES
+                if hasattr(page, attribute)
+            },
+            "results": list(results),
+        },
+    )
@@ -0,0 +1,361 @@
+"""Keyset (cursor) paginator for the OAI-PMH records"""
+
+import base64
+import binascii
+import datetime
+import json
+import math
+
+from django.conf import settings
+from django.core.paginator import EmptyPage
+from django.db.models import F, Q
+
+from core_main_app.commons.exceptions import ApiError
+
+
+def _encode_value(value):
+    """Encode a sorting value for the cursor
+
+    Args:
+        value:
+
+    Returns:
+
+    """
+    if isinstance(value, datetime.datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    """Decode a sorting value from the cursor
+
+    Args:
+        value:
+
+    Returns:
+
+    """
+    if isinstance(value, dict) and "$date" in value:
+        return datetime.datetime.fromisoformat(value["$date"])
+    return value
+
+
+def encode_cursor(values, record_id):
+    """Encode the sorting values and the id of the last record of a page
+    in an opaque cursor.
+
+    Args:
+        values: Sorting values.
+        record_id: Record id.
+
+    Returns:
+        Cursor (str).
+
+    """
+    cursor = json.dumps(
+        {"v": [_encode_value(value) for value in values], "id": record_id},
+        separators=(",", ":"),
+    )
+    return (
+        base64.urlsafe_b64encode(cursor.encode("utf-8"))
+        .decode("ascii")
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor):
+    """Decode a cursor built by encode_cursor.
+
+    Args:
+        cursor:
+
+    Returns:
+        Sorting values, record id.
+
+    Raises:
+        ApiError: The cursor is invalid.
+
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        cursor = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        return [_decode_value(value) for value in cursor["v"]], cursor["id"]
+    except (
+        binascii.Error,
+        KeyError,
+        TypeError,
+        ValueError,
+    ) as exception:
+        raise ApiError(f"Invalid cursor: {str(exception)}")
+
+
+def parse_order_by_field(order_by_field):
+    """Parse a list of sorting fields ("+title", "-title").
+
+    Args:
+        order_by_field:
+
+    Returns:
+        List of (field, descending).
+
+    """
+    return [
+        (field.lstrip("+-"), field.startswith("-"))
+        for field in order_by_field
+        if field.lstrip("+-")
+    ]
+
+
+def get_ordering(order_by_field):
+    """Return the ordering of a queryset, null values first like MongoDB
+    does, and the id to break ties.
+
+    Args:
+        order_by_field: List of (field, descending).
+
+    Returns:
+
+    """
+    if settings.MONGODB_INDEXING:
+        return [
+            f"-{field}" if descending else f"+{field}"
+            for field, descending in order_by_field
+        ] + ["+pk"]
+    return [
+        (
+            F(field).desc(nulls_last=True)
+            if descending
+            else F(field).asc(nulls_first=True)
+        )
+        for field, descending in order_by_field
+    ] + ["pk"]
+
+
+class KeysetPage:
+    """Page of results returned by the keyset paginator. Has the interface
+    of the Django pages, the page number being given by the client.
+    """
+
+    def __init__(self, object_list, cursor, next_cursor, paginator, number=1):
+        """Init the page
+
+        Args:
+            object_list: Records of the page.
+            cursor: Cursor used to get the page (None for the first page).
+            next_cursor: Cursor of the next page (None for the last page).
+            paginator: KeysetPaginator.
+            number: Page number.
+        """
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.paginator = paginator
+        self.number = number
+
+    def __len__(self):
+        """Return the number of records of the page"""
+        return len(self.object_list)
+
+    def has_next(self):
+        """Return True if there is a next page"""
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """Return True if the page is not the first one"""
+        return self.cursor is not None
+
+    def has_other_pages(self):
+        """Return True if there are other pages"""
+        return self.has_previous() or self.has_next()
+
+    def next_page_number(self):
+        """Return the number of the next page
+
+        Raises:
+            EmptyPage: The page is the last one.
+
+        """
+        if not self.has_next():
+            raise EmptyPage("That page contains no results")
+        return self.number + 1
+
+    def previous_page_number(self):
+        """Return the number of the previous page
+
+        Raises:
+            EmptyPage: The page is the first one.
+
+        """
+        if not self.has_previous():
+            raise EmptyPage("That page number is less than 1")
+        return max(self.number - 1, 1)
+
+    def start_index(self):
+        """Return the 1-based index of the first record of the page"""
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        """Return the 1-based index of the last record of the page"""
+        if not self.object_list:
+            return 0
+        return self.start_index() + len(self.object_list) - 1
+
+
+class KeysetPaginator:
+    """Keyset paginator: seeks past the last record of the previous page
+    instead of skipping records, deep pages cost the same as the first one.
+    """
+
+    def __init__(
+        self, queryset, order_by_field, per_page, count_paginator=None
+    ):
+        """Init the paginator
+
+        Args:
+            queryset: Django or Mongoengine queryset.
+            order_by_field: List of sorting fields ("+title", "-title").
+            per_page: Number of records per page.
+            count_paginator: Paginator counting the results (exact count of
+                the queryset if None).
+        """
+        self.queryset = queryset
+        self.order_by_field = parse_order_by_field(order_by_field)
+        self.per_page = per_page
+        self.count_paginator = count_paginator
+        self.mongodb = settings.MONGODB_INDEXING
+
+    @property
+    def count(self):
+        """Return the total number of results. Only computed when asked
+        for, seeking pages doesn't need it.
+
+        Returns:
+
+        """
+        if self.count_paginator is not None:
+            return self.count_paginator.count
+        if not hasattr(self, "_count"):
+            self._count = self.queryset.count()
+        return self._count
+
+    @property
+    def num_pages(self):
+        """Return the total number of pages
+
+        Returns:
+
+        """
+        return max(1, math.ceil(self.count / self.per_page))
+
+    def _get_q_class(self):
+        """Return the Q class of the queryset backend"""
+        if self.mongodb:
+            from mongoengine.queryset.visitor import Q as MongoQ
+
+            return MongoQ
+        return Q
+
+    def _is_null(self, field, is_null):
+        """Return the lookup testing if a field is null
+
+        Args:
+            field:
+            is_null:
+
+        Returns:
+
+        """
+        if self.mongodb:
+            return {field if is_null else f"{field}__ne": None}
+        return {f"{field}__isnull": is_null}
+
+    def _get_ordering(self):
+        """Return the ordering of the queryset
+
+        Returns:
+
+        """
+        return get_ordering(self.order_by_field)
+
+    def _get_seek_filter(self, values, record_id):
+        """Return the filter selecting the records after the given position.
+
+        Args:
+            values: Sorting values of the last record of the previous page.
+            record_id: Id of the last record of the previous page.
+
+        Returns:
+
+        """
+        q_class = self._get_q_class()
+        # records after the position on the id, all sorting fields being equal
+        seek_filter = q_class(pk__gt=record_id)
+        for (field, descending), value in reversed(
+            list(zip(self.order_by_field, values))
+        ):
+            if value is None:
+                equal_filter = q_class(**self._is_null(field, True))
+                after_filter = (
+                    None
+                    if descending
+                    else q_class(**self._is_null(field, False))
+                )
+            else:
+                equal_filter = q_class(**{field: value})
+                after_filter = (
+                    q_class(**{f"{field}__lt": value})
+                    | q_class(**self._is_null(field, True))
+                    if descending
+                    else q_class(**{f"{field}__gt": value})
+                )
+            seek_filter = equal_filter & seek_filter
+            if after_filter is not None:
+                seek_filter = after_filter | seek_filter
+        return seek_filter
+
+    def get_page(self, cursor=None, number=1):
+        """Return the page of records following the cursor.
+
+        Args:
+            cursor: Cursor of the page (None for the first page).
+            number: Page number, given by the client.
+
+        Returns:
+            KeysetPage
+
+        """
+        queryset = self.queryset.order_by(*self._get_ordering())
+        if cursor:
+            values, record_id = decode_cursor(cursor)
+            if len(values) != len(self.order_by_field):
+                raise ApiError("Invalid cursor: sorting fields mismatch.")
+            queryset = queryset.filter(
+                self._get_seek_filter(values, record_id)
+            )
+
+        object_list = list(queryset[: self.per_page + 1])
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[: self.per_page]
+            last_record = object_list[-1]
+            next_cursor = encode_cursor(
+                [
+                    getattr(last_record, field)
+                    for field, _ in self.order_by_field
+                ],
+                last_record.pk,
+            )
+        try:
+            number = max(int(number), 1)
+        except (TypeError, ValueError):
+            number = 1
+        return KeysetPage(
+            object_list,
+            cursor,
+            next_cursor,
+            self,
+            number=number if cursor else 1,
+        )
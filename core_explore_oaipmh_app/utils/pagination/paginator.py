@@ -0,0 +1,194 @@
+"""Paginators supporting exact, capped and estimated result counts"""
+
+import inspect
+import json
+import logging
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.inspect import method_has_no_args
+
+from core_explore_oaipmh_app.utils.fanout import FanOutResults
+from core_main_app.commons.exceptions import ApiError
+from core_main_app.utils.pagination.mongoengine_paginator.paginator import (
+    MongoenginePaginator,
+)
+
+logger = logging.getLogger(__name__)
+
+COUNT_MODE_EXACT = "exact"
+COUNT_MODE_CAPPED = "capped"
+COUNT_MODE_ESTIMATED = "estimated"
+COUNT_MODES = (COUNT_MODE_EXACT, COUNT_MODE_CAPPED, COUNT_MODE_ESTIMATED)
+
+
+class CountModePaginatorMixin:
+    """Paginator mixin computing the total number of results according to a
+    count mode: exact, capped or estimated.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        count_mode=COUNT_MODE_EXACT,
+        count_cap=1000,
+        page_number=1,
+        **kwargs,
+    ):
+        """Init the paginator
+
+        Args:
+            object_list:
+            per_page:
+            count_mode: Count mode (exact, capped, estimated).
+            count_cap: Number of results after which a capped count stops.
+            page_number: Requested page number, the count always covers it.
+            **kwargs:
+        """
+        if count_mode not in COUNT_MODES:
+            raise ApiError(f"Unknown count mode: {count_mode}.")
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_mode = count_mode
+        self.count_cap = count_cap
+        self.count_is_exact = True
+        try:
+            self.page_number = max(int(page_number), 1)
+        except (TypeError, ValueError):
+            self.page_number = 1
+
+    @cached_property
+    def count_limit(self):
+        """Return the number of results after which a capped count stops:
+        the cap, or the end of the requested page if further.
+        """
+        return max(self.count_cap, self.page_number * self.per_page)
+
+    def _count_up_to(self, limit):
+        """Count the results, stop after limit + 1 results.
+
+        Args:
+            limit:
+
+        Returns:
+
+        """
+        if isinstance(self.object_list, FanOutResults):
+            return self.object_list.count_up_to(limit + 1)
+        sliced_list = self.object_list[: limit + 1]
+        if settings.MONGODB_INDEXING:
+            return sliced_list.count(with_limit_and_skip=True)
+        count_func = getattr(sliced_list, "count", None)
+        if (
+            callable(count_func)
+            and not inspect.isbuiltin(count_func)
+            and method_has_no_args(count_func)
+        ):
+            return count_func()
+        return len(sliced_list)
+
+    def _get_capped_count(self):
+        """Return the capped count of the results.
+
+        Returns:
+
+        """
+        count = self._count_up_to(self.count_limit)
+        self.count_is_exact = count <= self.count_limit
+        return count
+
+    def _get_planner_estimate(self):
+        """Return the number of results estimated by the PostgreSQL planner,
+        None if not available.
+
+        Returns:
+
+        """
+        query = getattr(self.object_list, "query", None)
+        if settings.MONGODB_INDEXING or query is None:
+            return None
+        connection = connections[self.object_list.db]
+        if connection.vendor != "postgresql":
+            return None
+        sql, params = query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @cached_property
+    def count(self):
+        """Return the total number of results, according to the count mode.
+
+        Returns:
+
+        """
+        if self.count_mode == COUNT_MODE_EXACT:
+            return super().count
+
+        if self.count_mode == COUNT_MODE_ESTIMATED:
+            try:
+                estimate = self._get_planner_estimate()
+            except Exception as exception:
+                logger.warning(
+                    "Unable to estimate the number of results: %s",
+                    str(exception),
+                )
+                estimate = None
+            if estimate is not None:
+                count = self._get_capped_count()
+                if self.count_is_exact:
+                    # less results than the cap: the count is exact
+                    return count
+                # the estimate has to cover the results already seen
+                return max(estimate, count)
+            # no statistics available, fallback to a capped count
+            self.count_mode = COUNT_MODE_CAPPED
+
+        return self._get_capped_count()
+
+    @property
+    def count_display(self):
+        """Return the total number of results, for display.
+
+        Returns:
+
+        """
+        if self.count_is_exact:
+            return str(self.count)
+        if self.count_mode == COUNT_MODE_CAPPED:
+            return f"{self.count_limit}+"
+        return f"~{self.count}"
+
+    def get_page(self, number):
+        """Return a valid page, set the count information on it.
+
+        Args:
+            number:
+
+        Returns:
+
+        """
+        page = super().get_page(number)
+        if getattr(self.object_list, "degraded", None):
+            # partitions left out of the results: the count is approximate
+            self.count_is_exact = False
+            self.count_mode = COUNT_MODE_ESTIMATED
+        page.count_mode = self.count_mode
+        page.count_is_exact = self.count_is_exact
+        page.count_display = self.count_display
+        return page
+
+
+class OaiPmhPaginator(CountModePaginatorMixin, Paginator):
+    """Django paginator supporting count modes"""
+
+
+class OaiPmhMongoenginePaginator(
+    CountModePaginatorMixin, MongoenginePaginator
+):
+    """Mongoengine paginator supporting count modes"""
@@ -0,0 +1,36 @@
+"""Query utils for the explore OAI-PMH app"""
+
+import hashlib
+import json
+
+
+def _normalize(value):
+    """Return a canonical string representation of a query payload value.
+    Strings are kept as they are to avoid parsing JSON payloads.
+
+    Args:
+        value:
+
+    Returns:
+
+    """
+    if isinstance(value, str):
+        return f"s:{value}"
+    return f"j:{json.dumps(value, sort_keys=True, default=str)}"
+
+
+def get_query_hash(*values):
+    """Return a canonical hash of query payload values.
+
+    Args:
+        *values:
+
+    Returns:
+        Hash (str).
+
+    """
+    hash_object = hashlib.sha256()
+    for value in values:
+        hash_object.update(_normalize(value).encode("utf-8"))
+        hash_object.update(b"\x00")
+    return hash_object.hexdigest()
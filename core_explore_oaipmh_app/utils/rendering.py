@@ -0,0 +1,273 @@
+"""Rendering utils for the explore OAI-PMH app"""
+
+import asyncio
+import logging
+import zlib
+
+from asgiref.sync import sync_to_async
+
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_PRERENDER,
+    EXPLORE_OAIPMH_PRERENDER_CACHE_BACKEND,
+    EXPLORE_OAIPMH_PRERENDER_CACHE_TIMEOUT,
+    EXPLORE_OAIPMH_RENDER_CACHE_BACKEND,
+    EXPLORE_OAIPMH_RENDER_CACHE_SIZE,
+    EXPLORE_OAIPMH_RENDER_CACHE_TIMEOUT,
+)
+from core_explore_oaipmh_app.utils.cache import get_cache
+from core_explore_oaipmh_app.utils.query import get_query_hash
+from core_explore_oaipmh_app.utils.xslt import (
+    get_detail_xslt,
+    get_xslt_executor,
+    render_xml_as_html_detail,
+    transform_xml,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _get_render_cache():
+    """Return the cache of the rendered records
+
+    Returns:
+
+    """
+    return get_cache(
+        "rendered_detail",
+        backend=EXPLORE_OAIPMH_RENDER_CACHE_BACKEND,
+        timeout=EXPLORE_OAIPMH_RENDER_CACHE_TIMEOUT,
+        max_size=EXPLORE_OAIPMH_RENDER_CACHE_SIZE,
+    )
+
+
+def _get_prerender_cache():
+    """Return the cache of the records rendered at harvest time
+
+    Returns:
+
+    """
+    return get_cache(
+        "prerendered_detail",
+        backend=EXPLORE_OAIPMH_PRERENDER_CACHE_BACKEND,
+        timeout=EXPLORE_OAIPMH_PRERENDER_CACHE_TIMEOUT,
+    )
+
+
+def _get_record_version(record):
+    """Return the values identifying the version of a record
+
+    Args:
+        record:
+
+    Returns:
+
+    """
+    template = record.harvester_metadata_format.template
+    last_modification_date = record.last_modification_date
+    return (
+        str(record.id),
+        (last_modification_date.isoformat() if last_modification_date else ""),
+        str(template.hash) if template is not None else "",
+    )
+
+
+def get_render_cache_key(record, xslt_id=None):
+    """Return the key of the detail rendering of a record. The key changes
+    when the record is harvested again, so stale renderings are never read.
+
+    Args:
+        record:
+        xslt_id:
+
+    Returns:
+
+    """
+    return get_query_hash(*_get_record_version(record), str(xslt_id or ""))
+
+
+def prerender_record_detail(record):
+    """Render a record with the default detail XSLT of its template and
+    store the compressed HTML.
+
+    Args:
+        record:
+
+    Returns:
+
+    """
+    if record.id is None or record.deleted or not record.xml_content:
+        return
+    template = record.harvester_metadata_format.template
+    if template is None:
+        return
+    xslt_id, xslt_string = get_detail_xslt(
+        template_id=template.id, template_hash=template.hash
+    )
+    html = transform_xml(record.xml_content, xslt_id, xslt_string)
+    _get_prerender_cache().set(
+        get_query_hash(*_get_record_version(record)),
+        (str(xslt_id), zlib.compress(html.encode("utf-8"))),
+    )
+
+
+def get_prerendered_record_detail(record, xslt_id=None):
+    """Return the HTML rendered at harvest time if it was rendered with the
+    requested XSLT, None otherwise.
+
+    Args:
+        record:
+        xslt_id: XSLT to use, default detail XSLT of the template if None.
+
+    Returns:
+
+    """
+    prerendered = _get_prerender_cache().get(
+        get_query_hash(*_get_record_version(record))
+    )
+    if prerendered is None:
+        return None
+    prerendered_xslt_id, compressed_html = prerendered
+    if xslt_id is not None and str(xslt_id) != prerendered_xslt_id:
+        return None
+    try:
+        return zlib.decompress(compressed_html).decode("utf-8")
+    except zlib.error as exception:
+        logger.warning(
+            f"Invalid pre-rendered detail for record {record.id}: {str(exception)}"
+        )
+        return None
+
+
+def _use_render_cache(record):
+    """Return True if the rendering of the record can be cached
+
+    Args:
+        record:
+
+    Returns:
+
+    """
+    return record.id is not None and bool(
+        EXPLORE_OAIPMH_RENDER_CACHE_BACKEND or EXPLORE_OAIPMH_RENDER_CACHE_SIZE
+    )
+
+
+def get_cached_record_detail(record, xslt_id=None):
+    """Return the previous rendering of the same version of the record, or
+    the rendering done at harvest time, None if there is none.
+
+    Args:
+        record:
+        xslt_id: XSLT to use, default detail XSLT of the template if None.
+
+    Returns:
+
+    """
+    html = None
+    if _use_render_cache(record):
+        html = _get_render_cache().get(get_render_cache_key(record, xslt_id))
+    if html is None and EXPLORE_OAIPMH_PRERENDER and record.id is not None:
+        html = get_prerendered_record_detail(record, xslt_id)
+        if html is not None:
+            set_cached_record_detail(record, xslt_id, html)
+    return html
+
+
+def set_cached_record_detail(record, xslt_id, html):
+    """Keep the rendering of a record for the next requests
+
+    Args:
+        record:
+        xslt_id:
+        html:
+
+    Returns:
+
+    """
+    if _use_render_cache(record):
+        _get_render_cache().set(get_render_cache_key(record, xslt_id), html)
+
+
+def render_record_detail(record, xslt_id=None):
+    """Render a record as HTML with the detail XSLT. Reuse the previous
+    rendering of the same version of the record, or the rendering done at
+    harvest time, if any.
+
+    Args:
+        record:
+        xslt_id: XSLT to use, default detail XSLT of the template if None.
+
+    Returns:
+        HTML
+
+    """
+    template = record.harvester_metadata_format.template
+    if template is None:
+        # rendered as the XML itself
+        return record.xml_content
+    html = get_cached_record_detail(record, xslt_id)
+    if html is None:
+        html = render_xml_as_html_detail(
+            xml_content=record.xml_content,
+            template_id=template.id,
+            template_hash=template.hash,
+            xslt_id=xslt_id,
+        )
+        set_cached_record_detail(record, xslt_id, html)
+    return html
+
+
+def _get_cached_record_detail_or_xslt(record, xslt_id=None):
+    """Return the cached rendering of the record if any, otherwise the XML
+    content and the XSLT to transform it with.
+
+    Args:
+        record:
+        xslt_id:
+
+    Returns:
+        (html, None) or (None, (xml_content, xslt_id, xslt_string))
+
+    """
+    template = record.harvester_metadata_format.template
+    if template is None:
+        # rendered as the XML itself
+        return record.xml_content, None
+    html = get_cached_record_detail(record, xslt_id)
+    if html is not None:
+        return html, None
+    try:
+        detail_xslt = get_detail_xslt(
+            template_id=template.id,
+            template_hash=template.hash,
+            xslt_id=xslt_id,
+        )
+    except Exception:
+        # rendered as the XML itself
+        return record.xml_content, None
+    return None, (record.xml_content, *detail_xslt)
+
+
+async def render_record_detail_async(record, xslt_id=None):
+    """Render a record as HTML with the detail XSLT, from an async view:
+    database and cache accesses run with sync_to_async, the transformation
+    runs in the bounded XSLT thread pool.
+
+    Args:
+        record:
+        xslt_id: XSLT to use, default detail XSLT of the template if None.
+
+    Returns:
+        HTML
+
+    """
+    html, transform_args = await sync_to_async(
+        _get_cached_record_detail_or_xslt
+    )(record, xslt_id)
+    if transform_args is None:
+        return html
+    html = await asyncio.get_running_loop().run_in_executor(
+        get_xslt_executor(), transform_xml, *transform_args
+    )
+    await sync_to_async(set_cached_record_detail)(record, xslt_id, html)
+    return html
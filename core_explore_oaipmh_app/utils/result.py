@@ -0,0 +1,132 @@
+"""Lightweight results of the OAI-PMH searches"""
+
+from rest_framework import serializers
+
+# fields of core_explore_common_app Result, in the ResultSerializer order
+RESULT_FIELDS = (
+    "id",
+    "title",
+    "content",
+    "template_info",
+    "permission_url",
+    "detail_url",
+    "access_data_url",
+    "last_modification_date",
+    "blob_url",
+)
+
+# formats the dates like the ResultSerializer
+_date_field = serializers.DateTimeField()
+
+
+class OaiPmhResult(dict):
+    """Result of an OAI-PMH search. A dict with the fields of the
+    core_explore_common_app Result model, also readable as attributes,
+    without the model machinery: the result templates and tags accept
+    Result objects or dicts (e.g. result_list_html).
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        title="",
+        content="",
+        template_info=None,
+        permission_url=None,
+        detail_url=None,
+        access_data_url=None,
+        last_modification_date=None,
+        blob_url=None,
+    ):
+        """Init the result
+
+        Args:
+            title:
+            content:
+            template_info:
+            permission_url:
+            detail_url:
+            access_data_url:
+            last_modification_date:
+            blob_url:
+        """
+        super().__init__(
+            id=None,
+            title=title,
+            content=content,
+            template_info=template_info if template_info is not None else {},
+            permission_url=permission_url,
+            detail_url=detail_url,
+            access_data_url=access_data_url,
+            last_modification_date=last_modification_date,
+            blob_url=blob_url,
+        )
+
+    def __getattr__(self, name):
+        """Read a field as an attribute
+
+        Args:
+            name:
+
+        Returns:
+
+        """
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        """Set a field as an attribute
+
+        Args:
+            name:
+            value:
+
+        Returns:
+
+        """
+        if name not in RESULT_FIELDS:
+            raise AttributeError(name)
+        self[name] = value
+
+
+def serialize_result(result):
+    """Serialize a result, the output is the same as the ResultSerializer.
+
+    Args:
+        result: OaiPmhResult.
+
+    Returns:
+        Dict.
+
+    """
+    last_modification_date = result.last_modification_date
+    return {
+        "id": result.id,
+        "title": _to_str(result.title),
+        "content": _to_str(result.content),
+        "template_info": result.template_info,
+        "permission_url": _to_str(result.permission_url),
+        "detail_url": _to_str(result.detail_url),
+        "access_data_url": _to_str(result.access_data_url),
+        "last_modification_date": (
+            _date_field.to_representation(last_modification_date)
+            if last_modification_date is not None
+            else None
+        ),
+        "blob_url": _to_str(result.blob_url),
+    }
+
+
+def _to_str(value):
+    """Serialize a string field like the ResultSerializer
+
+    Args:
+        value:
+
+    Returns:
+
+    """
+    return str(value) if value is not None else None
@@ -0,0 +1,232 @@
+"""Match snippets of the OAI-PMH search results"""
+
+import html
+import json
+import re
+
+# operators whose values are looked for in the records
+_VALUE_OPERATORS = ("$eq", "$in", "$all", "$regex")
+# regular expressions looking for a literal text
+_LITERAL_REGEX = re.compile(r"^\^?([^\\^$.|?*+()\[\]{}/]+)\$?$")
+_TAG_REGEX = re.compile(r"<[^>]*>")
+_SPACE_REGEX = re.compile(r"\s+")
+_KEYWORD_REGEX = re.compile(r'"([^"]+)"|(\S+)')
+MIN_TERM_LENGTH = 2
+MAX_TERMS = 20
+
+
+def extract_query_terms(query):
+    """Return the terms a query looks for in the records: keywords of the
+    full text searches, compared values and literal regular expressions.
+    Negated criteria are ignored.
+
+    Args:
+        query: Query (JSON string or dict).
+
+    Returns:
+        List of terms, longest first.
+
+    """
+    if isinstance(query, str):
+        try:
+            query = json.loads(query)
+        except ValueError:
+            return []
+    terms = dict()
+    _collect_terms(query, terms)
+    return sorted(terms.values(), key=len, reverse=True)[:MAX_TERMS]
+
+
+def _collect_terms(query, terms):
+    """Collect the terms of a query, by lowercase term.
+
+    Args:
+        query:
+        terms: Dict {lowercase term: term}
+
+    Returns:
+
+    """
+    if not isinstance(query, dict):
+        return
+    for key, value in query.items():
+        if key in ("$and", "$or") and isinstance(value, list):
+            for sub_query in value:
+                _collect_terms(sub_query, terms)
+        elif key == "$text" and isinstance(value, dict):
+            search = value.get("$search", None)
+            if isinstance(search, str):
+                for phrase, keyword in _KEYWORD_REGEX.findall(search):
+                    # negated keywords are not in the results
+                    if not keyword.startswith("-"):
+                        _add_term(phrase or keyword.replace('"', ""), terms)
+        elif not key.startswith("$"):
+            _collect_value_terms(value, terms)
+
+
+def _collect_value_terms(value, terms):
+    """Collect the terms of the value of a criterion.
+
+    Args:
+        value:
+        terms:
+
+    Returns:
+
+    """
+    if isinstance(value, dict):
+        for operator in _VALUE_OPERATORS:
+            if operator in value:
+                _collect_value_terms(value[operator], terms)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_value_terms(item, terms)
+    elif isinstance(value, str):
+        if len(value) >= 2 and value[0] == "/" and value[-1] == "/":
+            value = value[1:-1]
+        match = _LITERAL_REGEX.match(value)
+        if match:
+            _add_term(match.group(1), terms)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        _add_term(str(value), terms)
+
+
+def _add_term(term, terms):
+    """Add a term, ignore the terms too short to be highlighted.
+
+    Args:
+        term:
+        terms:
+
+    Returns:
+
+    """
+    term = term.strip()
+    if len(term) >= MIN_TERM_LENGTH:
+        terms.setdefault(term.lower(), term)
+
+
+def get_text_content(xml_content):
+    """Return the text of an XML document, without the tags.
+
+    Args:
+        xml_content:
+
+    Returns:
+
+    """
+    text = _TAG_REGEX.sub(" ", xml_content or "")
+    return _SPACE_REGEX.sub(" ", html.unescape(text)).strip()
+
+
+def get_snippet(xml_content, terms, length, max_fragments):
+    """Return an HTML snippet of the text of a record, made of the fragments
+    around the first matches of the terms, with the matches in <mark> tags.
+    The beginning of the text is returned if no term matches.
+
+    Args:
+        xml_content: XML content of the record.
+        terms: Terms to highlight (see extract_query_terms).
+        length: Maximum number of characters of text in the snippet.
+        max_fragments: Maximum number of fragments in the snippet.
+
+    Returns:
+        HTML snippet.
+
+    """
+    text = get_text_content(xml_content)
+    if len(text) <= length:
+        fragments = [(0, len(text))]
+    else:
+        fragments = _get_fragments(text, terms, length, max_fragments)
+    terms_regex = _get_terms_regex(terms)
+    snippet = []
+    for start, end in fragments:
+        snippet.append(
+            f"{'&hellip;' if start > 0 else ''}"
+            f"{_highlight(text[start:end], terms_regex)}"
+            f"{'&hellip;' if end < len(text) else ''}"
+        )
+    return " ".join(snippet)
+
+
+def _get_terms_regex(terms):
+    """Return the regular expression matching any of the terms.
+
+    Args:
+        terms:
+
+    Returns:
+
+    """
+    if not terms:
+        return None
+    return re.compile(
+        "|".join(re.escape(term) for term in terms), re.IGNORECASE
+    )
+
+
+def _get_fragments(text, terms, length, max_fragments):
+    """Return the bounds of the fragments of the text around the first
+    matches, merged when they overlap.
+
+    Args:
+        text:
+        terms:
+        length:
+        max_fragments:
+
+    Returns:
+        List of (start, end), in the text order.
+
+    """
+    terms_regex = _get_terms_regex(terms)
+    matches = (
+        [
+            match.span()
+            for match, _ in zip(
+                terms_regex.finditer(text), range(max(max_fragments, 1))
+            )
+        ]
+        if terms_regex is not None
+        else []
+    )
+    if not matches:
+        return [(0, length)]
+    fragment_length = length // len(matches)
+    fragments = []
+    for match_start, match_end in matches:
+        # center the fragment on the match
+        start = max(
+            0, match_start - (fragment_length - (match_end - match_start)) // 2
+        )
+        end = min(len(text), start + fragment_length)
+        start = max(0, end - fragment_length)
+        if fragments and start <= fragments[-1][1]:
+            fragments[-1] = (fragments[-1][0], max(fragments[-1][1], end))
+        else:
+            fragments.append((start, end))
+    return fragments
+
+
+def _highlight(text, terms_regex):
+    """Escape a text and highlight the matches of the terms.
+
+    Args:
+        text:
+        terms_regex:
+
+    Returns:
+
+    """
+    if terms_regex is None:
+        return html.escape(text)
+    snippet = []
+    position = 0
+    for match in terms_regex.finditer(text):
+        start, end = match.span()
+        snippet.append(html.escape(text[position:start]))
+        snippet.append(f"<mark>{html.escape(match.group())}</mark>")
+        position = end
+    snippet.append(html.escape(text[position:]))
+    return "".join(snippet)
@@ -0,0 +1,114 @@
+"""Per-request timing of the stages of the OAI-PMH explore pipeline"""
+
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+REQUEST_TIMER_ATTRIBUTE = "explore_oaipmh_timer"
+
+
+class RequestTimer:
+    """Durations and numbers of database queries of the stages of a request.
+    Queries run from other threads (fan-out sub-queries) are not counted.
+    """
+
+    def __init__(self):
+        """Init the timer"""
+        self.stages = dict()
+
+    def add(self, name, duration, queries):
+        """Add a measure to a stage, a stage can be measured several times.
+
+        Args:
+            name: Stage name.
+            duration: Duration (in seconds).
+            queries: Number of database queries.
+
+        Returns:
+
+        """
+        stage = self.stages.setdefault(name, {"duration": 0.0, "queries": 0})
+        stage["duration"] += duration
+        stage["queries"] += queries
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the duration and the database queries of a stage.
+
+        Args:
+            name: Stage name.
+
+        Returns:
+
+        """
+        queries = []
+
+        def _count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(_count_query):
+                yield
+        finally:
+            self.add(name, time.perf_counter() - start, len(queries))
+
+    def get_server_timing(self):
+        """Return the stages in the Server-Timing header format.
+
+        Returns:
+
+        """
+        return ", ".join(
+            f"explore_oaipmh_{name};dur={stage['duration'] * 1000:.1f};"
+            f'desc="{stage["queries"]} queries"'
+            for name, stage in self.stages.items()
+        )
+
+
+def start_request_timer(request):
+    """Attach a new timer to a request.
+
+    Args:
+        request:
+
+    Returns:
+        RequestTimer
+
+    """
+    timer = RequestTimer()
+    setattr(request, REQUEST_TIMER_ATTRIBUTE, timer)
+    return timer
+
+
+def get_request_timer(request):
+    """Return the timer of a request, None if the request is not timed.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    return getattr(request, REQUEST_TIMER_ATTRIBUTE, None)
+
+
+@contextmanager
+def timed_stage(request, name):
+    """Measure a stage of the pipeline if the request is timed.
+
+    Args:
+        request:
+        name: Stage name.
+
+    Returns:
+
+    """
+    timer = get_request_timer(request)
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
@@ -0,0 +1,74 @@
+"""Detection of the model changes read by the caches of the app"""
+
+# instance attribute keeping the values of the watched fields
+WATCHED_VALUES_ATTRIBUTE = "_explore_oaipmh_watched_values"
+
+
+def _get_field_values(instance, fields):
+    """Return the values of fields of an instance, without loading the
+    deferred fields.
+
+    Args:
+        instance:
+        fields:
+
+    Returns:
+
+    """
+    return tuple(instance.__dict__.get(field) for field in fields)
+
+
+def _get_names(fields):
+    """Return the names of fields given by name or by attribute name
+    (template or template_id).
+
+    Args:
+        fields:
+
+    Returns:
+
+    """
+    return {field.removesuffix("_id") for field in fields}
+
+
+def keep_field_values(instance, fields):
+    """Keep the values of the watched fields of an instance, to be called
+    when the instance is loaded (post_init) and saved.
+
+    Args:
+        instance:
+        fields: Watched fields.
+
+    Returns:
+
+    """
+    setattr(
+        instance,
+        WATCHED_VALUES_ATTRIBUTE,
+        _get_field_values(instance, fields),
+    )
+
+
+def have_fields_changed(instance, fields, created=False, update_fields=None):
+    """Return True if a saved instance is new, or if one of its watched
+    fields changed since it was loaded. Keeps the saved values.
+
+    Args:
+        instance:
+        fields: Watched fields.
+        created: Instance created by the save.
+        update_fields: Fields updated by the save (None for all).
+
+    Returns:
+
+    """
+    if update_fields is not None and not _get_names(
+        update_fields
+    ) & _get_names(fields):
+        return created
+    field_values = _get_field_values(instance, fields)
+    changed = created or field_values != getattr(
+        instance, WATCHED_VALUES_ATTRIBUTE, None
+    )
+    setattr(instance, WATCHED_VALUES_ATTRIBUTE, field_values)
+    return changed
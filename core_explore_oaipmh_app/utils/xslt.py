@@ -0,0 +1,294 @@
+"""XSLT utils for the explore OAI-PMH app"""
+
+import hashlib
+import logging
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.staticfiles import finders
+from django.db import connection
+from lxml import etree
+
+from core_explore_oaipmh_app.components.oai_harvester_metadata_format import (
+    api as metadata_format_index_api,
+)
+from core_explore_oaipmh_app.settings import (
+    EXPLORE_OAIPMH_XSLT_POOL_SIZE,
+    EXPLORE_OAIPMH_XSLT_THREADS,
+)
+from core_explore_oaipmh_app.utils.cache import get_cache
+from core_main_app.components.template_xsl_rendering import (
+    api as template_xsl_rendering_api,
+)
+from core_main_app.components.template_xsl_rendering.models import (
+    TemplateXslRendering,
+)
+from core_main_app.components.xsl_transformation import (
+    api as xsl_transformation_api,
+)
+from core_main_app.settings import DEFAULT_DATA_RENDERING_XSLT
+from core_main_app.utils.file import read_file_content
+from core_oaipmh_harvester_app.components.oai_harvester_metadata_format.models import (
+    OaiHarvesterMetadataFormat,
+)
+from core_oaipmh_harvester_app.components.oai_registry.models import (
+    OaiRegistry,
+)
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_XSLT_ID = "default"
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_pool():
+    """Return the pool of compiled XSLT. Compiled stylesheets can't be
+    serialized: the pool is always process-local.
+
+    Returns:
+
+    """
+    return get_cache("compiled_xslt", max_size=EXPLORE_OAIPMH_XSLT_POOL_SIZE)
+
+
+def get_compiled_xslt(xslt_id, xslt_string):
+    """Return the compiled version of an XSLT, compile it on first use.
+
+    Args:
+        xslt_id: Id of the XSLT.
+        xslt_string: Content of the XSLT.
+
+    Returns:
+        lxml.etree.XSLT
+
+    """
+    pool = _get_pool()
+    content_hash = hashlib.sha256(xslt_string.encode("utf-8")).hexdigest()
+    key = (str(xslt_id), content_hash)
+    transform = pool.get(key)
+    if transform is None:
+        # concurrent first uses may compile twice, the pool keeps the last one
+        transform = etree.XSLT(XSDTree.build_tree(xslt_string))
+        pool.set(key, transform)
+    return transform
+
+
+def get_xslt_executor():
+    """Return the thread pool running the XSLT transformations of the async
+    views. The pool is bounded so that concurrent requests can't start an
+    unbounded number of CPU-bound transformations.
+
+    Returns:
+        ThreadPoolExecutor
+
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=EXPLORE_OAIPMH_XSLT_THREADS,
+                thread_name_prefix="explore_oaipmh_xslt",
+            )
+        return _executor
+
+
+def get_xslt_pool_stats():
+    """Return the usage statistics of the compiled XSLT pool
+
+    Returns:
+
+    """
+    stats = _get_pool().get_stats()
+    return {
+        "compiles": stats["misses"],
+        "reuses": stats["hits"],
+        "size": stats["size"],
+        "max_size": stats["max_size"],
+    }
+
+
+def _get_default_xslt():
+    """Return id and content of the default rendering XSLT
+
+    Returns:
+
+    """
+    default_xslt_path = finders.find(DEFAULT_DATA_RENDERING_XSLT)
+    return DEFAULT_XSLT_ID, read_file_content(default_xslt_path)
+
+
+def get_detail_xslt(template_id=None, template_hash=None, xslt_id=None):
+    """Return id and content of the detail XSLT to use, the default XSLT if
+    none is configured.
+
+    Args:
+        template_id:
+        template_hash:
+        xslt_id:
+
+    Returns:
+
+    """
+    try:
+        if xslt_id:
+            xsl_transformation = xsl_transformation_api.get_by_id(xslt_id)
+        elif template_id or template_hash:
+            if template_id:
+                template_xsl_rendering = (
+                    template_xsl_rendering_api.get_by_template_id(template_id)
+                )
+            else:
+                template_xsl_rendering = (
+                    template_xsl_rendering_api.get_by_template_hash(
+                        template_hash
+                    )
+                )
+            xsl_transformation = template_xsl_rendering.default_detail_xslt
+        else:
+            raise Exception(
+                "No template information provided. Default xslt will be used."
+            )
+        return xsl_transformation.id, xsl_transformation.content
+    except Exception:
+        return _get_default_xslt()
+
+
+def get_detail_xslt_version(
+    template_id=None, template_hash=None, xslt_id=None
+):
+    """Return id and content checksum of the detail XSLT to use: changes
+    when the XSLT is replaced or edited.
+
+    Args:
+        template_id:
+        template_hash:
+        xslt_id:
+
+    Returns:
+        (xslt_id, content hash)
+
+    """
+    xslt_id, xslt_string = get_detail_xslt(
+        template_id=template_id, template_hash=template_hash, xslt_id=xslt_id
+    )
+    return (
+        str(xslt_id),
+        hashlib.sha256((xslt_string or "").encode("utf-8")).hexdigest(),
+    )
+
+
+def render_xml_as_html_detail(
+    xml_content, template_id=None, template_hash=None, xslt_id=None
+):
+    """Render an XML to HTML using the detail xslt. Same as the
+    xsl_transform_detail tag, with compiled XSLT reused between calls.
+
+    Args:
+        xml_content:
+        template_id:
+        template_hash:
+        xslt_id:
+
+    Returns:
+        HTML
+
+    """
+    try:
+        xslt_id, xslt_string = get_detail_xslt(
+            template_id=template_id,
+            template_hash=template_hash,
+            xslt_id=xslt_id,
+        )
+    except Exception:
+        return xml_content
+    return transform_xml(xml_content, xslt_id, xslt_string)
+
+
+def transform_xml(xml_content, xslt_id, xslt_string):
+    """Transform an XML with an XSLT taken from the pool.
+
+    Args:
+        xml_content:
+        xslt_id: Id of the XSLT.
+        xslt_string: Content of the XSLT.
+
+    Returns:
+        Transformed XML, the XML itself if the transformation failed.
+
+    """
+    try:
+        transform = get_compiled_xslt(xslt_id, xslt_string)
+        return str(transform(XSDTree.build_tree(xml_content)))
+    except Exception:
+        return xml_content
+
+
+def warm_up():
+    """Compile the default XSLT and the default detail XSLT of the templates
+    of the activated registries.
+
+    Returns:
+
+    """
+    try:
+        get_compiled_xslt(*_get_default_xslt())
+        # template index keys are the templates of the activated registries
+        for template_id in metadata_format_index_api.get_template_index():
+            try:
+                xsl_transformation = (
+                    template_xsl_rendering_api.get_by_template_id(
+                        template_id
+                    ).default_detail_xslt
+                )
+            except Exception:
+                continue
+            if xsl_transformation is not None:
+                get_compiled_xslt(
+                    xsl_transformation.id, xsl_transformation.content
+                )
+    except Exception as exception:
+        logger.warning(f"XSLT pool warm up failed: {str(exception)}")
+
+
+def _are_tables_ready():
+    """Check that the tables read by the warm up exist: they don't before
+    the first migrate.
+
+    Returns:
+
+    """
+    table_names = connection.introspection.table_names()
+    return all(
+        model._meta.db_table in table_names
+        for model in (
+            OaiRegistry,
+            OaiHarvesterMetadataFormat,
+            TemplateXslRendering,
+        )
+    )
+
+
+def init():
+    """Warm the XSLT pool up when the app is ready. The pool is
+    process-local: each process warms it up when it loads the apps.
+
+    Returns:
+
+    """
+    with warnings.catch_warnings():
+        # the warm up queries the database on purpose, before apps are ready
+        warnings.filterwarnings(
+            "ignore",
+            message="Accessing the database during app initialization",
+            category=RuntimeWarning,
+        )
+        try:
+            if not _are_tables_ready():
+                return
+        except Exception as exception:
+            logger.warning(f"XSLT pool warm up skipped: {str(exception)}")
+            return
+        warm_up()
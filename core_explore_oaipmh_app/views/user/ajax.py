@@ -2,6 +2,7 @@
 
 import json
 
+from asgiref.sync import sync_to_async
 from django.http import HttpResponseForbidden
 from django.http.response import HttpResponseBadRequest, HttpResponse
 from django.shortcuts import render
@@ -12,12 +13,22 @@ from core_explore_common_app.components.abstract_query.models import (
     Authentication,
     DataSource,
 )
+from core_explore_oaipmh_app.components.oai_registry import (
+    api as oai_registry_cache_api,
+)
 from core_explore_oaipmh_app.components.query import api as oaipmh_query_api
+from core_explore_oaipmh_app.settings import EXPLORE_OAIPMH_CACHE_TIMEOUT
+from core_explore_oaipmh_app.utils.http import (
+    get_content_etag,
+    get_not_modified_response,
+    set_conditional_headers,
+)
+from core_explore_oaipmh_app.utils.rendering import (
+    render_record_detail,
+    render_record_detail_async,
+)
 from core_main_app.access_control.exceptions import AccessControlError
 from core_main_app.settings import DATA_SORTING_FIELDS, SERVER_URI
-from core_main_app.templatetags.xsl_transform_tag import (
-    render_xml_as_html_detail,
-)
 from core_oaipmh_harvester_app.components.oai_record import (
     api as oai_record_api,
 )
@@ -27,7 +38,9 @@ from core_oaipmh_harvester_app.components.oai_registry import (
 
 
 def get_data_source_list_oaipmh(request):
-    """Ajax method to fill the list of data sources.
+    """Ajax method to fill the list of data sources, as an HTML fragment
+    checking the data sources of the query when inserted in the page. The
+    explore page uses get_data_source_list_oaipmh_json.
 
     Args:
         request:
@@ -45,36 +58,16 @@ def get_data_source_list_oaipmh(request):
 
         # Get query from id
         query = api_query.get_by_id(id_query, request.user)
-        instance_list = oai_registry_api.get_all_activated_registry(
-            order_by_field="name"
-        )
-        item_list = []
-        for instance_item in instance_list:
-            checked = False
-            # compare instance with existing data source in query
-            # in order to know if they have to be checked
-            for data_source_item in query.data_sources:
-                if "instance_id" in data_source_item[
-                    "query_options"
-                ] and data_source_item["query_options"]["instance_id"] == str(
-                    instance_item.id
-                ):
-                    checked = True
-
-            # update the result item list for the context
-            item_list.extend(
-                [
-                    {
-                        "instance_id": instance_item.id,
-                        "instance_name": instance_item.name,
-                        "is_checked": checked,
-                    }
-                ]
-            )
-
-        # Here, data sources are instances
-        context_params = dict()
-        context_params["instances"] = item_list
+        # The list of instances is the same for every user and is cached,
+        # the instances of the query are checked client side
+        context_params = {
+            "instances": oai_registry_cache_api.get_activated_registry_list(),
+            "registry_generation": oai_registry_cache_api.get_generation(),
+            "cache_timeout": EXPLORE_OAIPMH_CACHE_TIMEOUT,
+            "checked_instance_ids": list(
+                oaipmh_query_api.get_oaipmh_data_source_index(query)
+            ),
+        }
 
         # return context
         context = {}
@@ -94,6 +87,59 @@ def get_data_source_list_oaipmh(request):
         )
 
 
+def get_data_source_list_oaipmh_json(request):
+    """Ajax method to get the list of data sources as JSON, rendered client
+    side. Clients sending the ETag of the current list get a 304.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        id_query = request.GET.get("id_query", None)
+
+        if id_query is None:
+            return HttpResponseBadRequest(
+                "Error during loading data sources from oaipmh search."
+            )
+
+        # Get query from id
+        query = api_query.get_by_id(id_query, request.user)
+        data_source_index = oaipmh_query_api.get_oaipmh_data_source_index(
+            query
+        )
+        content = json.dumps(
+            [
+                {
+                    "instance_id": instance["instance_id"],
+                    "instance_name": instance["instance_name"],
+                    "is_checked": str(instance["instance_id"])
+                    in data_source_index,
+                }
+                for instance in oai_registry_cache_api.get_activated_registry_list()
+            ]
+        ).encode("utf-8")
+
+        etag = get_content_etag(content)
+        not_modified_response = get_not_modified_response(request, etag, None)
+        if not_modified_response is not None:
+            return not_modified_response
+        return set_conditional_headers(
+            HttpResponse(content, content_type="application/json"),
+            etag,
+            None,
+        )
+
+    except AccessControlError:
+        return HttpResponseForbidden()
+    except Exception as exception:
+        return HttpResponseBadRequest(
+            f"Error during loading data sources from oaipmh search: {escape(str(exception))}"
+        )
+
+
 def update_data_source_list_oaipmh(request):
     """Ajax method to update query data sources in data base.
 
@@ -119,17 +165,8 @@ def update_data_source_list_oaipmh(request):
         instance = oai_registry_api.get_by_id(id_instance)
         if to_be_added:
             # Instance have to be added in the query as a data source
-            authentication = Authentication(auth_type="session")
-            data_source = DataSource(
-                name=instance.name,
-                url_query=SERVER_URI,
-                authentication=authentication,
-                order_by_field=",".join(DATA_SORTING_FIELDS),
-                query_options={"instance_id": str(instance.id)},
-            )
-
             oaipmh_query_api.add_oaipmh_data_source(
-                query, data_source, request.user
+                query, _build_data_source(instance), request.user
             )
         else:
             oaipmh_query_api.remove_oaipmh_data_source(
@@ -146,6 +183,75 @@ def update_data_source_list_oaipmh(request):
         )
 
 
+def set_data_source_list_oaipmh(request):
+    """Ajax method to set all the oaipmh data sources of a query at once.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        id_query = request.POST.get("id_query", None)
+        instance_ids = request.POST.get("instance_ids", None)
+
+        if id_query is None or instance_ids is None:
+            return HttpResponseBadRequest(
+                "Error during data source selection."
+            )
+
+        instance_ids = {
+            str(instance_id) for instance_id in json.loads(instance_ids)
+        }
+        query = api_query.get_by_id(id_query, request.user)
+        instance_list = [
+            instance
+            for instance in oai_registry_api.get_all_activated_registry(
+                order_by_field="name"
+            )
+            if str(instance.id) in instance_ids
+        ]
+        if len(instance_list) != len(instance_ids):
+            return HttpResponseBadRequest(
+                "Error during data source selection: unknown registry."
+            )
+
+        oaipmh_query_api.update_oaipmh_data_sources(
+            query,
+            [_build_data_source(instance) for instance in instance_list],
+            request.user,
+        )
+
+        return HttpResponse()
+
+    except AccessControlError:
+        return HttpResponseForbidden()
+    except Exception as exception:
+        return HttpResponseBadRequest(
+            f"Error during data source selection: {escape(str(exception))}"
+        )
+
+
+def _build_data_source(instance):
+    """Build the data source of a registry
+
+    Args:
+        instance:
+
+    Returns:
+
+    """
+    authentication = Authentication(auth_type="session")
+    return DataSource(
+        name=instance.name,
+        url_query=SERVER_URI,
+        authentication=authentication,
+        order_by_field=",".join(DATA_SORTING_FIELDS),
+        query_options={"instance_id": str(instance.id)},
+    )
+
+
 def change_data_display(request):
     """Change data display
 
@@ -161,23 +267,48 @@ def change_data_display(request):
         record = oai_record_api.get_by_id(
             request.POST.get("data_id"), request.user
         )
-        # get template id
-        template_id = record.harvester_metadata_format.template.id
-        # get template hash
-        template_hash = record.harvester_metadata_format.template.hash
-        # get xml content
-        xml_content = record.xml_content
+        # return content transformed
+        return HttpResponse(
+            json.dumps(
+                {
+                    "template": render_record_detail(
+                        record,
+                        xslt_id=xsl_transformation_id,
+                    ),
+                }
+            ),
+            "application/javascript",
+        )
+    except AccessControlError:
+        return HttpResponseForbidden("Access Forbidden")
+    except Exception:
+        return HttpResponseBadRequest("Unexpected error")
+
 
+async def change_data_display_async(request):
+    """Change data display. Async version of change_data_display for ASGI
+    deployments: the XSLT transformation runs in a bounded thread pool.
+
+    Args:
+        request:
+
+    Returns:
+    """
+    try:
+        # get xslt id
+        xsl_transformation_id = request.POST.get("xslt_id", None)
+        # get oai_record
+        user = await request.auser()
+        record = await sync_to_async(oai_record_api.get_by_id)(
+            request.POST.get("data_id"), user
+        )
         # return content transformed
         return HttpResponse(
             json.dumps(
                 {
-                    "template": render_xml_as_html_detail(
-                        xml_content=xml_content,
-                        template_id=template_id,
-                        template_hash=template_hash,
+                    "template": await render_record_detail_async(
+                        record,
                         xslt_id=xsl_transformation_id,
-                        request=request,
                     ),
                 }
             ),
@@ -1,5 +1,20 @@
 """Explore OAI-PMH user views"""
 
+from functools import partial
+
+from asgiref.sync import sync_to_async
+
+from core_explore_oaipmh_app.utils.http import (
+    get_not_modified_response,
+    get_record_etag,
+    get_record_last_modified,
+    set_conditional_headers,
+)
+from core_explore_oaipmh_app.utils.rendering import (
+    render_record_detail,
+    render_record_detail_async,
+)
+from core_explore_oaipmh_app.utils.xslt import get_detail_xslt_version
 from core_main_app.access_control.exceptions import AccessControlError
 from core_main_app.utils.rendering import render
 from core_main_app.utils.view_builders import data as data_view_builder
@@ -8,6 +23,9 @@ from core_oaipmh_harvester_app.components.oai_record import (
 )
 
 
+DATA_DETAIL_TEMPLATE = "core_explore_oaipmh_app/user/data/detail.html"
+
+
 def data_detail(request):
     """Display data's detail for OAI-PMH
 
@@ -19,43 +37,171 @@ def data_detail(request):
     """
     try:
         record = oai_record_api.get_by_id(request.GET["id"], request.user)
-        template = record.harvester_metadata_format.template
-
-        data_object = {
-            "record_id": record.id,
-            "title": record.identifier,
-            "content": record.content,
-            "template": {
-                "id": template.id if template is not None else "",
-                "format": template.format if template is not None else "",
-                "display_name": record.harvester_metadata_format.get_display_name(),
-                "hash": record.harvester_metadata_format.hash,
-            },
-        }
+        # the XSLT is resolved with the page, the ETag depends on it
+        data_object, page_context = _build_data_detail_page(record)
+        etag = _get_data_detail_etag(record, request.user, page_context)
+        last_modified = get_record_last_modified(record)
+        not_modified_response = get_not_modified_response(
+            request, etag, last_modified
+        )
+        if not_modified_response is not None:
+            return not_modified_response
+
+        # the content is only read for a full response
+        data_object["content"] = record.content
+        # rendered by the template only if needed, with the compiled XSLT pool
+        data_object["html_content"] = partial(
+            render_record_detail,
+            record,
+            xslt_id=page_context["context"].get("xsl_transformation_id"),
+        )
+
+        return set_conditional_headers(
+            data_view_builder.render_page(
+                request, render, DATA_DETAIL_TEMPLATE, page_context
+            ),
+            etag,
+            last_modified,
+        )
+    except AccessControlError:
+        error_message = "Access Forbidden"
+        status_code = 403
+    except Exception as exception:
+        error_message = f"An error occurred: {str(exception)}"
+        status_code = 400
+    return _render_error(request, error_message, status_code)
+
+
+async def data_detail_async(request):
+    """Display data's detail for OAI-PMH. Async version of data_detail for
+    ASGI deployments: the XSLT transformation runs in a bounded thread pool.
+
+    Args:
+        request:
+
+    Returns:
 
-        page_context = data_view_builder.build_page(data_object)
+    """
+    try:
+        user = await request.auser()
+        record = await sync_to_async(oai_record_api.get_by_id)(
+            request.GET["id"], user
+        )
+        # the XSLT is resolved with the page, the ETag depends on it
+        data_object, page_context = await sync_to_async(
+            _build_data_detail_page
+        )(record)
+        etag = await sync_to_async(_get_data_detail_etag)(
+            record, user, page_context
+        )
+        last_modified = get_record_last_modified(record)
+        not_modified_response = get_not_modified_response(
+            request, etag, last_modified
+        )
+        if not_modified_response is not None:
+            return not_modified_response
 
-        page_context["assets"]["js"].extend(
-            [
-                {
-                    "path": "core_explore_oaipmh_app/user/js/data/change_display.raw.js",
-                    "is_raw": True,
-                },
-            ]
+        # the content is only read for a full response
+        data_object["content"] = await sync_to_async(getattr)(
+            record, "content"
+        )
+        data_object["html_content"] = await render_record_detail_async(
+            record,
+            xslt_id=page_context["context"].get("xsl_transformation_id"),
         )
 
-        return data_view_builder.render_page(
-            request,
-            render,
-            "core_main_app/user/data/detail.html",
-            page_context,
+        response = await sync_to_async(data_view_builder.render_page)(
+            request, render, DATA_DETAIL_TEMPLATE, page_context
         )
+        return set_conditional_headers(response, etag, last_modified)
     except AccessControlError:
         error_message = "Access Forbidden"
         status_code = 403
     except Exception as exception:
         error_message = f"An error occurred: {str(exception)}"
         status_code = 400
+    return await sync_to_async(_render_error)(
+        request, error_message, status_code
+    )
+
+
+def _build_data_detail_page(record):
+    """Build the context of the data detail page of a record, without its
+    content: the page is built before the conditional request check.
+
+    Args:
+        record:
+
+    Returns:
+        data object, page context
+
+    """
+    template = record.harvester_metadata_format.template
+
+    data_object = {
+        "record_id": record.id,
+        "title": record.identifier,
+        "content": None,
+        "template": {
+            "id": template.id if template is not None else "",
+            "format": template.format if template is not None else "",
+            "display_name": record.harvester_metadata_format.get_display_name(),
+            "hash": record.harvester_metadata_format.hash,
+        },
+    }
+
+    page_context = data_view_builder.build_page(data_object)
+
+    page_context["assets"]["js"].extend(
+        [
+            {
+                "path": "core_explore_oaipmh_app/user/js/data/change_display.raw.js",
+                "is_raw": True,
+            },
+        ]
+    )
+    return data_object, page_context
+
+
+def _get_data_detail_etag(record, user, page_context):
+    """Return the ETag of the data detail page of a record. The page depends
+    on the record, on the user (menus) and on the detail XSLT: its id and
+    its content.
+
+    Args:
+        record:
+        user:
+        page_context:
+
+    Returns:
+        ETag (str).
+
+    """
+    template = record.harvester_metadata_format.template
+    xslt_id, xslt_hash = get_detail_xslt_version(
+        template_id=template.id if template is not None else None,
+        xslt_id=page_context["context"].get("xsl_transformation_id"),
+    )
+    return get_record_etag(
+        record,
+        record.harvester_metadata_format_id,
+        user.pk,
+        xslt_id,
+        xslt_hash,
+    )
+
+
+def _render_error(request, error_message, status_code):
+    """Render the error page
+
+    Args:
+        request:
+        error_message:
+        status_code:
+
+    Returns:
+
+    """
     return render(
         request,
         "core_main_app/common/commons/error.html",
@@ -0,0 +1,147 @@
+"""Unit tests for the data version api"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.components.data_version import (
+    api as data_version_api,
+)
+from core_explore_oaipmh_app.components.data_version import (
+    watch as data_version_watch,
+)
+from core_explore_oaipmh_app.utils import cache as cache_utils
+
+
+class TestGetVersions(SimpleTestCase):
+    """TestGetVersions"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+
+    def test_versions_are_stable(self):
+        """test_versions_are_stable"""
+        versions = data_version_api.get_versions([1, 2])
+
+        self.assertEqual(list(versions), [1, 2])
+        self.assertEqual(data_version_api.get_versions([1, 2]), versions)
+
+    def test_bump_increases_registry_version_only(self):
+        """test_bump_increases_registry_version_only"""
+        versions = data_version_api.get_versions([1, 2])
+
+        data_version_api.bump_versions(registry_ids=[1])
+
+        new_versions = data_version_api.get_versions([1, 2])
+        self.assertGreater(new_versions[1], versions[1])
+        self.assertEqual(new_versions[2], versions[2])
+
+    def test_bump_increases_metadata_format_version(self):
+        """test_bump_increases_metadata_format_version"""
+        versions = data_version_api.get_metadata_format_versions([3])
+
+        data_version_api.bump_versions(metadata_format_ids=[3])
+
+        self.assertGreater(
+            data_version_api.get_metadata_format_versions([3])[3],
+            versions[3],
+        )
+
+    def test_lost_version_does_not_decrease(self):
+        """test_lost_version_does_not_decrease"""
+        data_version_api.bump_versions(registry_ids=[1])
+        version = data_version_api.get_versions([1])[1]
+
+        cache_utils.clear_all()
+
+        self.assertGreater(data_version_api.get_versions([1])[1], version)
+
+
+class TestNotifyChange(SimpleTestCase):
+    """TestNotifyChange"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+        self.versions = data_version_api.get_versions([1])
+        self.metadata_format_versions = (
+            data_version_api.get_metadata_format_versions([3])
+        )
+
+    def tearDown(self):
+        """tearDown"""
+        data_version_api.end_batch(1)
+
+    def test_change_bumps_versions(self):
+        """test_change_bumps_versions"""
+        data_version_api.notify_change(1, 3)
+
+        self.assertGreater(
+            data_version_api.get_versions([1])[1], self.versions[1]
+        )
+        self.assertGreater(
+            data_version_api.get_metadata_format_versions([3])[3],
+            self.metadata_format_versions[3],
+        )
+
+    def test_changes_during_harvest_are_batched(self):
+        """test_changes_during_harvest_are_batched"""
+        data_version_api.start_batch(1)
+
+        data_version_api.notify_change(1, 3)
+        data_version_api.notify_change(1, 3)
+
+        self.assertEqual(data_version_api.get_versions([1]), self.versions)
+        data_version_api.end_batch(1)
+        self.assertEqual(
+            data_version_api.get_versions([1])[1], self.versions[1] + 1
+        )
+        self.assertEqual(
+            data_version_api.get_metadata_format_versions([3])[3],
+            self.metadata_format_versions[3] + 1,
+        )
+
+    @patch.object(
+        data_version_api, "EXPLORE_OAIPMH_DATA_VERSION_BATCH_INTERVAL", 0
+    )
+    def test_long_harvest_bumps_versions_periodically(self):
+        """test_long_harvest_bumps_versions_periodically"""
+        data_version_api.start_batch(1)
+
+        data_version_api.notify_change(1, 3)
+
+        self.assertGreater(
+            data_version_api.get_versions([1])[1], self.versions[1]
+        )
+
+
+class TestDataVersionWatch(SimpleTestCase):
+    """TestDataVersionWatch"""
+
+    @patch.object(data_version_api, "notify_change")
+    def test_saved_record_notifies_change(self, mock_notify_change):
+        """test_saved_record_notifies_change"""
+        data_version_watch.bump_record_versions(
+            None, MagicMock(registry_id=1, harvester_metadata_format_id=3)
+        )
+
+        mock_notify_change.assert_called_once_with(1, 3)
+
+    @patch.object(data_version_api, "start_batch")
+    def test_harvesting_registry_starts_batch(self, mock_start_batch):
+        """test_harvesting_registry_starts_batch"""
+        data_version_watch.batch_harvest_bumps(
+            None, MagicMock(id=1, is_harvesting=True)
+        )
+
+        mock_start_batch.assert_called_once_with(1)
+
+    @patch.object(data_version_api, "end_batch")
+    def test_harvested_registry_ends_batch(self, mock_end_batch):
+        """test_harvested_registry_ends_batch"""
+        data_version_watch.batch_harvest_bumps(
+            None, MagicMock(id=1, is_harvesting=False)
+        )
+
+        mock_end_batch.assert_called_once_with(1)
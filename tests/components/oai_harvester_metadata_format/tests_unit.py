@@ -0,0 +1,182 @@
+"""Unit tests for the template to metadata format index api"""
+
+from unittest.mock import patch, MagicMock
+
+from django.db.models.signals import post_save
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.components.oai_harvester_metadata_format import (
+    api as metadata_format_index_api,
+)
+from core_explore_oaipmh_app.utils import cache as cache_utils
+from core_main_app.utils.datetime import datetime_now
+from core_oaipmh_harvester_app.components.oai_harvester_metadata_format.models import (
+    OaiHarvesterMetadataFormat,
+)
+
+
+@patch(
+    "core_explore_oaipmh_app.components.oai_registry.api.get_activated_registry_ids"
+)
+@patch(
+    "core_oaipmh_harvester_app.components.oai_harvester_metadata_format.api.get_all_by_list_registry_ids"
+)
+class TestGetMetadataFormatIdsByTemplates(SimpleTestCase):
+    """TestGetMetadataFormatIdsByTemplates"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+
+    @staticmethod
+    def _mock_metadata_formats(
+        mock_get_all_by_list_registry_ids, mock_get_activated_registry_ids
+    ):
+        """Mock the metadata formats of two registries"""
+        mock_get_activated_registry_ids.return_value = [1, 2]
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [
+            (1, 10, 100),
+            (1, 11, 101),
+            (2, 10, 200),
+            (2, None, 201),
+        ]
+        mock_get_all_by_list_registry_ids.return_value = mock_queryset
+
+    def test_returns_metadata_formats_using_templates(
+        self,
+        mock_get_all_by_list_registry_ids,
+        mock_get_activated_registry_ids,
+    ):
+        """test_returns_metadata_formats_using_templates"""
+        self._mock_metadata_formats(
+            mock_get_all_by_list_registry_ids, mock_get_activated_registry_ids
+        )
+
+        self.assertEqual(
+            metadata_format_index_api.get_metadata_format_ids_by_templates(
+                [10], [1, 2]
+            ),
+            [100, 200],
+        )
+
+    def test_filters_metadata_formats_by_registry(
+        self,
+        mock_get_all_by_list_registry_ids,
+        mock_get_activated_registry_ids,
+    ):
+        """test_filters_metadata_formats_by_registry"""
+        self._mock_metadata_formats(
+            mock_get_all_by_list_registry_ids, mock_get_activated_registry_ids
+        )
+
+        self.assertEqual(
+            metadata_format_index_api.get_metadata_format_ids_by_templates(
+                ["10", 11], [1]
+            ),
+            [100, 101],
+        )
+
+    def test_index_is_built_once(
+        self,
+        mock_get_all_by_list_registry_ids,
+        mock_get_activated_registry_ids,
+    ):
+        """test_index_is_built_once"""
+        self._mock_metadata_formats(
+            mock_get_all_by_list_registry_ids, mock_get_activated_registry_ids
+        )
+
+        metadata_format_index_api.get_metadata_format_ids_by_templates(
+            [10], [1]
+        )
+        metadata_format_index_api.get_metadata_format_ids_by_templates(
+            [11], [1]
+        )
+
+        self.assertEqual(mock_get_all_by_list_registry_ids.call_count, 1)
+
+    def test_metadata_format_save_invalidates_index(
+        self,
+        mock_get_all_by_list_registry_ids,
+        mock_get_activated_registry_ids,
+    ):
+        """test_metadata_format_save_invalidates_index"""
+        self._mock_metadata_formats(
+            mock_get_all_by_list_registry_ids, mock_get_activated_registry_ids
+        )
+        metadata_format_index_api.get_metadata_format_ids_by_templates(
+            [10], [1]
+        )
+
+        post_save.send(
+            sender=OaiHarvesterMetadataFormat,
+            instance=OaiHarvesterMetadataFormat(),
+            created=True,
+        )
+        metadata_format_index_api.get_metadata_format_ids_by_templates(
+            [10], [1]
+        )
+
+        self.assertEqual(mock_get_all_by_list_registry_ids.call_count, 2)
+
+    def test_harvest_state_save_keeps_index(
+        self,
+        mock_get_all_by_list_registry_ids,
+        mock_get_activated_registry_ids,
+    ):
+        """test_harvest_state_save_keeps_index"""
+        self._mock_metadata_formats(
+            mock_get_all_by_list_registry_ids, mock_get_activated_registry_ids
+        )
+        metadata_format_index_api.get_metadata_format_ids_by_templates(
+            [10], [1]
+        )
+        generation = metadata_format_index_api.get_generation()
+        metadata_format = OaiHarvesterMetadataFormat(
+            id=1, registry_id=1, template_id=10
+        )
+
+        metadata_format.last_update = datetime_now()
+        post_save.send(
+            sender=OaiHarvesterMetadataFormat,
+            instance=metadata_format,
+            created=False,
+        )
+        metadata_format_index_api.get_metadata_format_ids_by_templates(
+            [10], [1]
+        )
+
+        self.assertEqual(mock_get_all_by_list_registry_ids.call_count, 1)
+        self.assertEqual(
+            metadata_format_index_api.get_generation(), generation
+        )
+
+    def test_template_change_invalidates_index(
+        self,
+        mock_get_all_by_list_registry_ids,
+        mock_get_activated_registry_ids,
+    ):
+        """test_template_change_invalidates_index"""
+        self._mock_metadata_formats(
+            mock_get_all_by_list_registry_ids, mock_get_activated_registry_ids
+        )
+        metadata_format_index_api.get_metadata_format_ids_by_templates(
+            [10], [1]
+        )
+        metadata_format = OaiHarvesterMetadataFormat(
+            id=1, registry_id=1, template_id=10
+        )
+
+        metadata_format.template_id = 11
+        post_save.send(
+            sender=OaiHarvesterMetadataFormat,
+            instance=metadata_format,
+            created=False,
+            update_fields=["template"],
+        )
+        metadata_format_index_api.get_metadata_format_ids_by_templates(
+            [10], [1]
+        )
+
+        self.assertEqual(mock_get_all_by_list_registry_ids.call_count, 2)
@@ -0,0 +1,32 @@
+"""Unit tests for the OaiRecord signals"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.components.oai_record import (
+    watch as oai_record_watch,
+)
+
+
+class TestPrerenderRecord(SimpleTestCase):
+    """TestPrerenderRecord"""
+
+    @patch.object(oai_record_watch, "prerender_record_detail")
+    def test_saved_record_is_prerendered(self, mock_prerender_record_detail):
+        """test_saved_record_is_prerendered"""
+        record = MagicMock()
+
+        oai_record_watch.prerender_record(None, record)
+
+        mock_prerender_record_detail.assert_called_once_with(record)
+
+    @patch.object(oai_record_watch, "prerender_record_detail")
+    def test_rendering_error_does_not_fail_the_save(
+        self, mock_prerender_record_detail
+    ):
+        """test_rendering_error_does_not_fail_the_save"""
+        mock_prerender_record_detail.side_effect = Exception("error")
+
+        with self.assertLogs(oai_record_watch.logger, level="WARNING"):
+            oai_record_watch.prerender_record(None, MagicMock())
@@ -0,0 +1,196 @@
+"""Unit tests for the activated OaiRegistry cache api"""
+
+from unittest.mock import patch, MagicMock
+
+from django.db.models.signals import post_save, post_delete
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.components.oai_registry import (
+    api as oai_registry_cache_api,
+)
+from core_explore_oaipmh_app.utils import cache as cache_utils
+from core_oaipmh_harvester_app.components.oai_registry.models import (
+    OaiRegistry,
+)
+
+
+class TestGetActivatedRegistryIds(SimpleTestCase):
+    """TestGetActivatedRegistryIds"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+
+    @patch(
+        "core_oaipmh_harvester_app.components.oai_registry.api.get_all_activated_registry"
+    )
+    def test_returns_activated_registry_ids(
+        self, mock_get_all_activated_registry
+    ):
+        """test_returns_activated_registry_ids"""
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [1, 2]
+        mock_get_all_activated_registry.return_value = mock_queryset
+
+        self.assertEqual(
+            oai_registry_cache_api.get_activated_registry_ids(), [1, 2]
+        )
+
+    @patch(
+        "core_oaipmh_harvester_app.components.oai_registry.api.get_all_activated_registry"
+    )
+    def test_second_call_does_not_query_database(
+        self, mock_get_all_activated_registry
+    ):
+        """test_second_call_does_not_query_database"""
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [1, 2]
+        mock_get_all_activated_registry.return_value = mock_queryset
+
+        oai_registry_cache_api.get_activated_registry_ids()
+        oai_registry_cache_api.get_activated_registry_ids()
+
+        self.assertEqual(mock_get_all_activated_registry.call_count, 1)
+
+    @patch(
+        "core_oaipmh_harvester_app.components.oai_registry.api.get_all_activated_registry"
+    )
+    def test_registry_save_invalidates_cache(
+        self, mock_get_all_activated_registry
+    ):
+        """test_registry_save_invalidates_cache"""
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [1]
+        mock_get_all_activated_registry.return_value = mock_queryset
+        oai_registry_cache_api.get_activated_registry_ids()
+        generation = oai_registry_cache_api.get_generation()
+
+        post_save.send(
+            sender=OaiRegistry, instance=OaiRegistry(id=2), created=True
+        )
+        mock_queryset.values_list.return_value = [1, 2]
+
+        self.assertEqual(
+            oai_registry_cache_api.get_activated_registry_ids(), [1, 2]
+        )
+        self.assertNotEqual(
+            oai_registry_cache_api.get_generation(), generation
+        )
+
+    @patch(
+        "core_oaipmh_harvester_app.components.oai_registry.api.get_all_activated_registry"
+    )
+    def test_registry_deactivation_invalidates_cache(
+        self, mock_get_all_activated_registry
+    ):
+        """test_registry_deactivation_invalidates_cache"""
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [1]
+        mock_get_all_activated_registry.return_value = mock_queryset
+        oai_registry_cache_api.get_activated_registry_ids()
+        registry = OaiRegistry(id=1, is_activated=True)
+
+        registry.is_activated = False
+        post_save.send(sender=OaiRegistry, instance=registry, created=False)
+        mock_queryset.values_list.return_value = []
+
+        self.assertEqual(
+            oai_registry_cache_api.get_activated_registry_ids(), []
+        )
+
+    @patch(
+        "core_oaipmh_harvester_app.components.oai_registry.api.get_all_activated_registry"
+    )
+    def test_harvest_state_save_keeps_cache(
+        self, mock_get_all_activated_registry
+    ):
+        """test_harvest_state_save_keeps_cache"""
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [1]
+        mock_get_all_activated_registry.return_value = mock_queryset
+        oai_registry_cache_api.get_activated_registry_ids()
+        generation = oai_registry_cache_api.get_generation()
+        registry = OaiRegistry(id=1, is_harvesting=False)
+
+        registry.is_harvesting = True
+        post_save.send(sender=OaiRegistry, instance=registry, created=False)
+        post_save.send(
+            sender=OaiRegistry,
+            instance=registry,
+            created=False,
+            update_fields=["is_harvesting", "last_update"],
+        )
+        oai_registry_cache_api.get_activated_registry_ids()
+
+        self.assertEqual(mock_get_all_activated_registry.call_count, 1)
+        self.assertEqual(oai_registry_cache_api.get_generation(), generation)
+
+    @patch(
+        "core_oaipmh_harvester_app.components.oai_registry.api.get_all_activated_registry"
+    )
+    def test_registry_delete_invalidates_cache(
+        self, mock_get_all_activated_registry
+    ):
+        """test_registry_delete_invalidates_cache"""
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [1]
+        mock_get_all_activated_registry.return_value = mock_queryset
+        oai_registry_cache_api.get_activated_registry_ids()
+
+        post_delete.send(sender=OaiRegistry, instance=OaiRegistry(id=1))
+        mock_queryset.values_list.return_value = []
+
+        self.assertEqual(
+            oai_registry_cache_api.get_activated_registry_ids(), []
+        )
+
+
+@patch(
+    "core_oaipmh_harvester_app.components.oai_registry.api.get_all_activated_registry"
+)
+class TestGetActivatedRegistryList(SimpleTestCase):
+    """TestGetActivatedRegistryList"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+
+    def test_returns_activated_registries_ordered_by_name(
+        self, mock_get_all_activated_registry
+    ):
+        """test_returns_activated_registries_ordered_by_name"""
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [(2, "a"), (1, "b")]
+        mock_get_all_activated_registry.return_value = mock_queryset
+
+        self.assertEqual(
+            oai_registry_cache_api.get_activated_registry_list(),
+            [
+                {"instance_id": 2, "instance_name": "a"},
+                {"instance_id": 1, "instance_name": "b"},
+            ],
+        )
+        mock_get_all_activated_registry.assert_called_with(
+            order_by_field="name"
+        )
+
+    def test_registry_save_invalidates_cache(
+        self, mock_get_all_activated_registry
+    ):
+        """test_registry_save_invalidates_cache"""
+        mock_queryset = MagicMock()
+        mock_queryset.values_list.return_value = [(1, "a")]
+        mock_get_all_activated_registry.return_value = mock_queryset
+        oai_registry_cache_api.get_activated_registry_list()
+        oai_registry_cache_api.get_activated_registry_list()
+
+        registry = OaiRegistry(id=1, name="a")
+        registry.name = "renamed"
+        post_save.send(sender=OaiRegistry, instance=registry, created=False)
+        mock_queryset.values_list.return_value = [(1, "renamed")]
+
+        self.assertEqual(
+            oai_registry_cache_api.get_activated_registry_list(),
+            [{"instance_id": 1, "instance_name": "renamed"}],
+        )
+        self.assertEqual(mock_get_all_activated_registry.call_count, 2)
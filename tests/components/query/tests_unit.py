@@ -0,0 +1,133 @@
+"""Unit tests for the OAI-PMH query api"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from core_explore_common_app.components.abstract_query.models import (
+    DataSource,
+)
+from core_explore_oaipmh_app.components.query import api as oaipmh_query_api
+from core_main_app.utils.tests_tools.MockUser import create_mock_user
+
+
+def _data_source(instance_id):
+    """Return an oaipmh data source"""
+    return DataSource(
+        name=f"registry {instance_id}",
+        url_query="http://example.com",
+        query_options={"instance_id": instance_id},
+    )
+
+
+@patch.object(oaipmh_query_api, "upsert")
+class TestUpdateOaiPmhDataSources(SimpleTestCase):
+    """TestUpdateOaiPmhDataSources"""
+
+    def setUp(self):
+        """setUp"""
+        self.user = create_mock_user("1", is_superuser=True)
+        self.local_data_source = DataSource(
+            name="Local", url_query="http://example.com"
+        )
+        self.query = MagicMock(
+            data_sources=[
+                self.local_data_source,
+                _data_source("1"),
+                _data_source("2"),
+            ]
+        )
+
+    def test_diff_is_applied_in_one_update(self, mock_upsert):
+        """test_diff_is_applied_in_one_update"""
+        oaipmh_query_api.update_oaipmh_data_sources(
+            self.query, [_data_source("2"), _data_source("3")], self.user
+        )
+
+        self.assertEqual(
+            self.query.data_sources,
+            [self.local_data_source, _data_source("2"), _data_source("3")],
+        )
+        mock_upsert.assert_called_once_with(self.query, self.user)
+
+    def test_unchanged_selection_is_not_saved(self, mock_upsert):
+        """test_unchanged_selection_is_not_saved"""
+        oaipmh_query_api.update_oaipmh_data_sources(
+            self.query, [_data_source("1"), _data_source("2")], self.user
+        )
+
+        mock_upsert.assert_not_called()
+
+    def test_empty_selection_keeps_other_data_sources(self, mock_upsert):
+        """test_empty_selection_keeps_other_data_sources"""
+        oaipmh_query_api.update_oaipmh_data_sources(self.query, [], self.user)
+
+        self.assertEqual(self.query.data_sources, [self.local_data_source])
+
+
+class TestGetOaiPmhDataSourceIndex(SimpleTestCase):
+    """TestGetOaiPmhDataSourceIndex"""
+
+    def test_index_contains_oaipmh_data_sources(self):
+        """test_index_contains_oaipmh_data_sources"""
+        query = MagicMock(
+            data_sources=[
+                DataSource(name="Local", url_query="http://example.com"),
+                _data_source("1"),
+                _data_source("2"),
+            ]
+        )
+
+        self.assertEqual(
+            oaipmh_query_api.get_oaipmh_data_source_index(query),
+            {"1": _data_source("1"), "2": _data_source("2")},
+        )
+
+
+@patch.object(oaipmh_query_api, "upsert")
+class TestAddRemoveOaiPmhDataSources(SimpleTestCase):
+    """TestAddRemoveOaiPmhDataSources"""
+
+    def setUp(self):
+        """setUp"""
+        self.user = create_mock_user("1", is_superuser=True)
+        self.query = MagicMock(data_sources=[_data_source("1")])
+
+    def test_add_data_sources_saves_once(self, mock_upsert):
+        """test_add_data_sources_saves_once"""
+        oaipmh_query_api.add_oaipmh_data_sources(
+            self.query,
+            [_data_source("1"), _data_source("2"), _data_source("3")],
+            self.user,
+        )
+
+        self.assertEqual(
+            self.query.data_sources,
+            [_data_source("1"), _data_source("2"), _data_source("3")],
+        )
+        mock_upsert.assert_called_once_with(self.query, self.user)
+
+    def test_add_present_data_source_is_not_saved(self, mock_upsert):
+        """test_add_present_data_source_is_not_saved"""
+        oaipmh_query_api.add_oaipmh_data_source(
+            self.query, _data_source("1"), self.user
+        )
+
+        mock_upsert.assert_not_called()
+
+    def test_remove_data_sources_saves_once(self, mock_upsert):
+        """test_remove_data_sources_saves_once"""
+        self.query.data_sources.append(_data_source("2"))
+
+        oaipmh_query_api.remove_oaipmh_data_sources(
+            self.query, ["1", "2", "3"], self.user
+        )
+
+        self.assertEqual(self.query.data_sources, [])
+        mock_upsert.assert_called_once_with(self.query, self.user)
+
+    def test_remove_absent_data_source_is_not_saved(self, mock_upsert):
+        """test_remove_absent_data_source_is_not_saved"""
+        oaipmh_query_api.remove_oaipmh_data_source(self.query, "2", self.user)
+
+        mock_upsert.assert_not_called()
@@ -5,9 +5,17 @@ from core_linked_records_app.components.pid_settings.models import PidSettings
 from core_main_app.components.data.models import Data
 from core_main_app.components.template.models import Template
 from core_main_app.components.workspace.models import Workspace
+from core_main_app.utils.datetime import datetime_now
 from core_main_app.utils.integration_tests.fixture_interface import (
     FixtureInterface,
 )
+from core_oaipmh_harvester_app.components.oai_harvester_metadata_format.models import (
+    OaiHarvesterMetadataFormat,
+)
+from core_oaipmh_harvester_app.components.oai_record.models import OaiRecord
+from core_oaipmh_harvester_app.components.oai_registry.models import (
+    OaiRegistry,
+)
 from tests import test_settings
 
 
@@ -225,3 +233,100 @@ class AccessControlRecordOaiFixture(FixtureInterface):
         """
         self.query_user1 = Query(user_id="1")
         self.query_user1.save()
+
+
+class OaiRecordFixture(FixtureInterface):
+    """OAI-PMH records fixture"""
+
+    template = None
+    registry = None
+    metadata_format = None
+    metadata_format_collection = None
+    record_collection = None
+
+    def insert_data(self, nb_records=5):
+        """Insert a set of OaiRecord.
+
+        Args:
+            nb_records:
+
+        Returns:
+
+        """
+        self.generate_template()
+        self.generate_registry()
+        self.generate_metadata_format()
+        self.generate_record_collection(nb_records)
+
+    def generate_template(self):
+        """Generate an unique Template.
+
+        Returns:
+
+        """
+        template = Template()
+        xsd = (
+            '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+            '<xs:element name="tag"></xs:element></xs:schema>'
+        )
+        template.content = xsd
+        template.hash = "template_hash"
+        template.filename = "filename"
+        self.template = template
+        self.template.save()
+
+    def generate_registry(self):
+        """Generate an activated registry.
+
+        Returns:
+
+        """
+        self.registry = OaiRegistry(
+            name="Registry", url="http://registry.test/oai"
+        )
+        self.registry.save()
+
+    def generate_metadata_format(self):
+        """Generate two metadata formats using the template.
+
+        Returns:
+
+        """
+        self.metadata_format_collection = []
+        for metadata_prefix in ("oai_test", "oai_other"):
+            metadata_format = OaiHarvesterMetadataFormat(
+                metadata_prefix=metadata_prefix,
+                schema=f"http://registry.test/{metadata_prefix}.xsd",
+                raw={},
+                template=self.template,
+                registry=self.registry,
+                hash="template_hash",
+            )
+            metadata_format.save()
+            self.metadata_format_collection.append(metadata_format)
+        self.metadata_format = self.metadata_format_collection[0]
+
+    def generate_record_collection(self, nb_records):
+        """Generate a collection of OaiRecord.
+
+        Args:
+            nb_records:
+
+        Returns:
+
+        """
+        self.record_collection = []
+        for index in range(nb_records):
+            record = OaiRecord(
+                identifier=f"oai:registry.test:{index}",
+                title=f"Record {index % 3}",
+                deleted=False,
+                harvester_metadata_format=self.metadata_format_collection[
+                    index % 2
+                ],
+                registry=self.registry,
+                last_modification_date=datetime_now(),
+            )
+            record.xml_content = f"<tag>Record {index}</tag>"
+            record.save()
+            self.record_collection.append(record)
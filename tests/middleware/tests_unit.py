@@ -0,0 +1,89 @@
+"""Unit tests for the explore OAI-PMH middlewares"""
+
+from unittest.mock import patch, MagicMock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+from django.test import SimpleTestCase, RequestFactory
+
+from core_explore_oaipmh_app.middleware import timing as timing_middleware
+from core_explore_oaipmh_app.utils.timing import timed_stage
+
+
+def _timed_view(request):
+    """View running a stage of the pipeline"""
+    with timed_stage(request, "build"):
+        pass
+    return HttpResponse()
+
+
+async def _timed_view_async(request):
+    """Async view running a stage of the pipeline"""
+    return _timed_view(request)
+
+
+class TestTimingMiddleware(SimpleTestCase):
+    """TestTimingMiddleware"""
+
+    def setUp(self):
+        """setUp"""
+        self.request = RequestFactory().get("/")
+
+    def test_timed_request_sets_server_timing_header(self):
+        """test_timed_request_sets_server_timing_header"""
+        middleware = timing_middleware.TimingMiddleware(_timed_view)
+
+        response = middleware(self.request)
+
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^explore_oaipmh_build;dur=[0-9.]+;desc="0 queries"$',
+        )
+
+    def test_async_request_is_timed_without_thread(self):
+        """test_async_request_is_timed_without_thread"""
+        middleware = timing_middleware.TimingMiddleware(_timed_view_async)
+
+        response = async_to_sync(middleware)(self.request)
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertIn("explore_oaipmh_build", response["Server-Timing"])
+
+    def test_timed_request_is_logged(self):
+        """test_timed_request_is_logged"""
+        middleware = timing_middleware.TimingMiddleware(_timed_view)
+
+        with self.assertLogs(timing_middleware.logger, "INFO") as logs:
+            middleware(self.request)
+
+        self.assertIn("build_queries=0", logs.output[0])
+
+    def test_other_request_is_not_reported(self):
+        """test_other_request_is_not_reported"""
+        middleware = timing_middleware.TimingMiddleware(
+            lambda request: HttpResponse()
+        )
+
+        response = middleware(self.request)
+
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @patch.object(
+        timing_middleware,
+        "EXPLORE_OAIPMH_TIMING_METRICS_HOOK",
+        "tests.middleware.tests_unit.metrics_hook",
+    )
+    def test_metrics_hook_receives_timings(self):
+        """test_metrics_hook_receives_timings"""
+        middleware = timing_middleware.TimingMiddleware(_timed_view)
+
+        middleware(self.request)
+
+        metrics_hook.assert_called_once()
+        self.assertEqual(
+            list(metrics_hook.call_args[0][1]),
+            ["build"],
+        )
+
+
+metrics_hook = MagicMock()
@@ -0,0 +1,519 @@
+"""Integration tests for Explore OAI-PMH REST API"""
+
+import json
+from unittest.mock import patch
+
+from django.core.paginator import Paginator
+from rest_framework import status
+
+from core_explore_oaipmh_app.components.data_version import (
+    api as data_version_api,
+)
+from core_explore_oaipmh_app.components.data_version import (
+    watch as data_version_watch,
+)
+from core_explore_oaipmh_app.components.oai_harvester_metadata_format import (
+    api as metadata_format_index_api,
+)
+from core_explore_oaipmh_app.components.oai_registry import (
+    api as oai_registry_cache_api,
+)
+from core_explore_oaipmh_app.rest.query import views as query_views
+from core_explore_oaipmh_app.utils import cache as cache_utils
+from core_explore_oaipmh_app.utils.timing import start_request_timer
+from core_main_app.commons.exceptions import ApiError
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_main_app.utils.tests_tools.MockUser import create_mock_user
+from core_main_app.utils.tests_tools.RequestMock import (
+    RequestMock,
+    create_mock_request,
+)
+from core_oaipmh_harvester_app.components.oai_record.models import OaiRecord
+from tests.fixtures.fixtures import OaiRecordFixture
+
+
+class TestFormatOaiPmhResults(IntegrationBaseTestCase):
+    """TestFormatOaiPmhResults"""
+
+    fixture = OaiRecordFixture()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.request = create_mock_request(user=create_mock_user("1"))
+
+    def test_format_oaipmh_results_returns_all_records(self):
+        """test_format_oaipmh_results_returns_all_records"""
+        page = Paginator(OaiRecord.objects.order_by("pk"), 10).page(1)
+
+        results = query_views.format_oaipmh_results(page, self.request)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(
+            [result.template_info["name"] for result in results[:2]],
+            [
+                metadata_format.get_display_name()
+                for metadata_format in self.fixture.metadata_format_collection
+            ],
+        )
+
+    def test_format_oaipmh_results_query_count_is_fixed(self):
+        """test_format_oaipmh_results_query_count_is_fixed"""
+        self.fixture.generate_record_collection(20)
+        page = Paginator(OaiRecord.objects.order_by("pk"), 50).page(1)
+
+        # one query for the records, one for the metadata formats/templates
+        with self.assertNumQueries(2):
+            results = query_views.format_oaipmh_results(page, self.request)
+
+        self.assertEqual(len(results), 25)
+
+
+class TestExecuteOaiPmhQuery(IntegrationBaseTestCase):
+    """TestExecuteOaiPmhQuery"""
+
+    fixture = OaiRecordFixture()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        cache_utils.clear_all()
+        self.request = create_mock_request(user=create_mock_user("1"))
+
+    def test_records_are_loaded_without_unused_fields(self):
+        """test_records_are_loaded_without_unused_fields"""
+        page = query_views.execute_oaipmh_query(
+            {"query": "{}"}, 1, self.request
+        )
+
+        deferred_fields = page.object_list[0].get_deferred_fields()
+        self.assertIn("dict_content", deferred_fields)
+        self.assertNotIn("file", deferred_fields)
+        self.assertEqual(page.result_mode, "full")
+
+    def test_summary_mode_does_not_load_content(self):
+        """test_summary_mode_does_not_load_content"""
+        page = query_views.execute_oaipmh_query(
+            {"query": "{}", "result_mode": "summary"}, 1, self.request
+        )
+
+        self.assertIn("file", page.object_list[0].get_deferred_fields())
+        # records are loaded by execute_oaipmh_query, only the metadata
+        # formats are loaded here
+        with self.assertNumQueries(1):
+            results = query_views.format_oaipmh_results(page, self.request)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result.content == "" for result in results))
+
+    def test_snippet_mode_loads_content(self):
+        """test_snippet_mode_loads_content"""
+        page = query_views.execute_oaipmh_query(
+            {"query": "{}", "result_mode": "snippet"},
+            1,
+            self.request,
+            result_modes=query_views.RESULT_MODES,
+        )
+
+        self.assertNotIn("file", page.object_list[0].get_deferred_fields())
+        self.assertEqual(page.result_mode, "snippet")
+        self.assertEqual(page.snippet_terms, [])
+
+    def test_snippet_mode_highlights_query_terms(self):
+        """test_snippet_mode_highlights_query_terms"""
+        page = query_views.execute_oaipmh_query(
+            {"query": "{}", "result_mode": "snippet"},
+            1,
+            self.request,
+            result_modes=query_views.RESULT_MODES,
+        )
+        # the fixture records are not indexed
+        page.snippet_terms = query_views._get_snippet_terms(
+            {"query": '{"$text": {"$search": "record"}}'}, "snippet"
+        )
+
+        # the fixture records are saved without file
+        with patch.object(
+            query_views,
+            "get_contents_by_record",
+            side_effect=lambda records: {
+                data.id: f"<tag>{data.title}</tag>" for data in records
+            },
+        ):
+            results = query_views.format_oaipmh_results(page, self.request)
+
+        self.assertEqual(len(results), 5)
+        for result in results:
+            self.assertRegex(result.content, r"^<mark>Record</mark> \d$")
+            self.assertEqual(
+                result.template_info["format"], query_views.SNIPPET_FORMAT
+            )
+            self.assertTrue(result.access_data_url)
+
+    def test_full_mode_keeps_template_format(self):
+        """test_full_mode_keeps_template_format"""
+        page = query_views.execute_oaipmh_query(
+            {"query": "{}"}, 1, self.request
+        )
+
+        results = query_views.format_oaipmh_results(page, self.request)
+
+        self.assertEqual(results[0].template_info["format"], "XSD")
+
+    def test_snippet_mode_is_not_listed_in_explore_pages(self):
+        """test_snippet_mode_is_not_listed_in_explore_pages"""
+        with self.assertRaises(ApiError):
+            query_views.execute_oaipmh_query(
+                {"query": "{}", "result_mode": "snippet"}, 1, self.request
+            )
+
+    def test_unknown_result_mode_raises_api_error(self):
+        """test_unknown_result_mode_raises_api_error"""
+        with self.assertRaises(ApiError):
+            query_views.execute_oaipmh_query(
+                {"query": "{}", "result_mode": "unknown"}, 1, self.request
+            )
+
+    @patch.object(query_views, "EXPLORE_OAIPMH_FANOUT_THREADS", 0)
+    def test_fanout_mode_merges_metadata_formats(self):
+        """test_fanout_mode_merges_metadata_formats"""
+        query_data = {
+            "query": "{}",
+            "templates": json.dumps([{"id": self.fixture.template.id}]),
+        }
+
+        page = query_views.execute_oaipmh_query(
+            dict(query_data, execution_mode="fanout"), 1, self.request
+        )
+
+        self.assertEqual(
+            [record.pk for record in page.object_list],
+            [
+                record.pk
+                for record in sorted(
+                    self.fixture.record_collection,
+                    key=lambda record: (record.title, record.pk),
+                )
+            ],
+        )
+        self.assertEqual(page.paginator.count, 5)
+        self.assertEqual(page.degraded_partitions, [])
+
+    @patch.object(query_views, "EXPLORE_OAIPMH_FANOUT_THREADS", 0)
+    @patch.object(query_views, "EXPLORE_OAIPMH_FANOUT_MAX_OFFSET", 1)
+    @patch.object(query_views, "RESULTS_PER_PAGE", 2)
+    def test_fanout_mode_runs_deep_pages_in_single_query(self):
+        """test_fanout_mode_runs_deep_pages_in_single_query"""
+        query_data = {
+            "query": "{}",
+            "templates": json.dumps([{"id": self.fixture.template.id}]),
+            "execution_mode": "fanout",
+        }
+
+        first_page = query_views.execute_oaipmh_query(
+            query_data, 1, self.request
+        )
+        second_page = query_views.execute_oaipmh_query(
+            query_data, 2, self.request
+        )
+
+        self.assertIsInstance(
+            first_page.paginator.object_list, query_views.FanOutResults
+        )
+        self.assertNotIsInstance(
+            second_page.paginator.object_list, query_views.FanOutResults
+        )
+        self.assertEqual(len(second_page.object_list), 2)
+
+    def test_timed_request_records_pipeline_stages(self):
+        """test_timed_request_records_pipeline_stages"""
+        timer = start_request_timer(self.request)
+
+        page = query_views.execute_oaipmh_query(
+            {"query": "{}"}, 1, self.request
+        )
+        query_views.format_oaipmh_results(page, self.request)
+
+        self.assertEqual(
+            list(timer.stages), ["build", "count", "execute", "format"]
+        )
+        self.assertEqual(timer.stages["count"]["queries"], 1)
+        self.assertEqual(timer.stages["execute"]["queries"], 1)
+
+    def test_unknown_execution_mode_raises_api_error(self):
+        """test_unknown_execution_mode_raises_api_error"""
+        with self.assertRaises(ApiError):
+            query_views.execute_oaipmh_query(
+                {"query": "{}", "execution_mode": "unknown"}, 1, self.request
+            )
+
+
+@patch.object(query_views, "EXPLORE_OAIPMH_PAGE_CACHE", True)
+class TestPageCache(IntegrationBaseTestCase):
+    """TestPageCache"""
+
+    fixture = OaiRecordFixture()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        cache_utils.clear_all()
+        self.request = create_mock_request(user=create_mock_user("1"))
+        self.query_data = {"query": "{}"}
+
+    def _search(self):
+        """Execute the query and format the results"""
+        page = query_views.execute_oaipmh_query(
+            self.query_data, 1, self.request
+        )
+        return page, query_views.format_oaipmh_results(page, self.request)
+
+    def test_cached_page_does_not_query_database(self):
+        """test_cached_page_does_not_query_database"""
+        page, results = self._search()
+
+        with self.assertNumQueries(0):
+            cached_page, cached_results = self._search()
+
+        self.assertEqual(
+            [result.detail_url for result in cached_results],
+            [result.detail_url for result in results],
+        )
+        self.assertEqual(cached_page.paginator.count, page.paginator.count)
+        self.assertFalse(cached_page.has_next())
+
+    def test_equivalent_query_shares_cached_page(self):
+        """test_equivalent_query_shares_cached_page"""
+        self.query_data = {"query": '{"a": 1, "b": 2}'}
+        self._search()
+        self.query_data = {"query": '{"b": 2, "a": 1}'}
+
+        with self.assertNumQueries(0):
+            self._search()
+
+    def test_harvested_record_invalidates_cached_page(self):
+        """test_harvested_record_invalidates_cached_page"""
+        self._search()
+
+        data_version_api.bump_versions([self.fixture.registry.id])
+
+        # count, records, metadata formats
+        with self.assertNumQueries(3):
+            self._search()
+
+    def test_other_registry_does_not_invalidate_cached_page(self):
+        """test_other_registry_does_not_invalidate_cached_page"""
+        self._search()
+
+        data_version_api.bump_versions([self.fixture.registry.id + 1])
+
+        with self.assertNumQueries(0):
+            self._search()
+
+    def test_registry_and_metadata_format_saves_keep_cached_page(self):
+        """test_registry_and_metadata_format_saves_keep_cached_page"""
+        self._search()
+
+        oai_registry_cache_api.invalidate()
+        metadata_format_index_api.invalidate()
+        page, _ = self._search()
+
+        self.assertTrue(hasattr(page, "cached_results"))
+
+    def test_deleted_template_invalidates_cached_page(self):
+        """test_deleted_template_invalidates_cached_page"""
+        self._search()
+
+        data_version_watch.bump_template_versions(
+            sender=None, instance=self.fixture.template
+        )
+        page, _ = self._search()
+
+        self.assertFalse(hasattr(page, "cached_results"))
+
+
+class TestExportOaiPmhQueryResults(IntegrationBaseTestCase):
+    """TestExportOaiPmhQueryResults"""
+
+    fixture = OaiRecordFixture()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        cache_utils.clear_all()
+        self.user = create_mock_user("1")
+
+    def test_export_streams_all_records_as_ndjson(self):
+        """test_export_streams_all_records_as_ndjson"""
+        response = RequestMock.do_request_post(
+            query_views.export_oaipmh_query_results,
+            self.user,
+            data={"query": "{}", "chunk_size": 2},
+        )
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            sorted(json.loads(line)["title"] for line in lines),
+            sorted(record.title for record in self.fixture.record_collection),
+        )
+
+    def test_export_streams_chunk_by_chunk(self):
+        """test_export_streams_chunk_by_chunk"""
+        stream = query_views.stream_oaipmh_query_results(
+            {"query": "{}", "chunk_size": 2},
+            create_mock_request(user=self.user),
+        )
+
+        chunks = list(stream)
+
+        self.assertEqual(
+            [len(chunk.splitlines()) for chunk in chunks], [2, 2, 1]
+        )
+
+    def test_export_without_query_returns_400(self):
+        """test_export_without_query_returns_400"""
+        response = RequestMock.do_request_post(
+            query_views.export_oaipmh_query_results, self.user, data={}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_with_list_payload_returns_400(self):
+        """test_export_with_list_payload_returns_400"""
+        response = RequestMock.do_request_post(
+            query_views.export_oaipmh_query_results,
+            self.user,
+            data=[{"query": "{}"}],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_with_invalid_chunk_size_returns_400(self):
+        """test_export_with_invalid_chunk_size_returns_400"""
+        response = RequestMock.do_request_post(
+            query_views.export_oaipmh_query_results,
+            self.user,
+            data={"query": "{}", "chunk_size": "all"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@patch.object(query_views, "RESULTS_PER_PAGE", 2)
+class TestGetOaiPmhQueryResults(IntegrationBaseTestCase):
+    """TestGetOaiPmhQueryResults"""
+
+    fixture = OaiRecordFixture()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        cache_utils.clear_all()
+        self.user = create_mock_user("1")
+
+    def _post(self, data):
+        """Post a query payload
+
+        Args:
+            data:
+
+        Returns:
+
+        """
+        return RequestMock.do_request_post(
+            query_views.get_oaipmh_query_results, self.user, data=data
+        )
+
+    def test_snippet_mode_returns_highlighted_json(self):
+        """test_snippet_mode_returns_highlighted_json"""
+        # the fixture records are saved without file, and not indexed
+        with patch.object(
+            query_views,
+            "get_contents_by_record",
+            side_effect=lambda records: {
+                data.id: f"<tag>{data.title} &lt;b&gt;</tag>"
+                for data in records
+            },
+        ), patch.object(
+            query_views, "_get_snippet_terms", return_value=["record"]
+        ):
+            response = self._post({"query": "{}", "result_mode": "snippet"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data["results"][0]
+        self.assertRegex(
+            result["content"], r"^<mark>Record</mark> \d &lt;b&gt;$"
+        )
+        self.assertEqual(
+            result["template_info"]["format"], query_views.SNIPPET_FORMAT
+        )
+
+    def test_cursor_mode_pages_through_all_records(self):
+        """test_cursor_mode_pages_through_all_records"""
+        data = {
+            "query": "{}",
+            "pagination_mode": "cursor",
+            "order_by_field": "+title",
+        }
+        pages = [self._post(data).data]
+        while pages[-1]["next_cursor"] is not None:
+            pages.append(
+                self._post(
+                    {
+                        **data,
+                        "cursor": pages[-1]["next_cursor"],
+                        "page": pages[-1]["next"],
+                    }
+                ).data
+            )
+
+        self.assertEqual([len(page["results"]) for page in pages], [2, 2, 1])
+        # the results are not counted
+        self.assertEqual([page["count"] for page in pages], [None] * 3)
+        self.assertEqual(
+            [(page["previous"], page["next"]) for page in pages],
+            [(None, 2), (1, 3), (2, None)],
+        )
+        self.assertEqual(
+            [result["title"] for page in pages for result in page["results"]],
+            sorted(record.title for record in self.fixture.record_collection),
+        )
+
+    def test_cursor_mode_counts_results_on_demand(self):
+        """test_cursor_mode_counts_results_on_demand"""
+        response = self._post(
+            {
+                "query": "{}",
+                "pagination_mode": "cursor",
+                "count_mode": "capped",
+            }
+        )
+
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(response.data["count_display"], "5")
+
+    def test_page_mode_has_no_cursor(self):
+        """test_page_mode_has_no_cursor"""
+        response = self._post({"query": "{}", "page": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next_cursor"])
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(
+            (response.data["previous"], response.data["next"]), (1, 3)
+        )
+
+    def test_invalid_payload_returns_400(self):
+        """test_invalid_payload_returns_400"""
+        self.assertEqual(
+            self._post(["{}"]).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self._post(
+                {"query": "{}", "pagination_mode": "cursor", "cursor": "x"}
+            ).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
@@ -5,7 +5,13 @@ from unittest.mock import patch, MagicMock
 from django.core import paginator as django_paginator
 from django.test import SimpleTestCase, tag, override_settings
 
+from core_explore_oaipmh_app.components.oai_registry import (
+    api as oai_registry_cache_api,
+)
 from core_explore_oaipmh_app.rest.query import views as query_views
+from core_explore_oaipmh_app.settings import EXPLORE_OAIPMH_CACHE_TIMEOUT
+from core_explore_oaipmh_app.utils import cache as cache_utils
+from core_explore_oaipmh_app.utils.pagination.keyset import KeysetPage
 from core_main_app.commons.exceptions import ApiError
 from core_main_app.utils.pagination.mongoengine_paginator import (
     paginator as mongo_paginator,
@@ -19,6 +25,10 @@ from core_main_app.utils.tests_tools.RequestMock import (
 class TestExecuteExecuteOaiPmhQuery(SimpleTestCase):
     """TestExecuteExecuteOaiPmhQuery"""
 
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+
     @patch(
         "core_oaipmh_harvester_app.components.oai_registry.api.get_all_activated_registry"
     )
@@ -127,6 +137,7 @@ class TestExecuteExecuteOaiPmhQuery(SimpleTestCase):
         mock_request = create_mock_request(user=mock_user)
         mock_queryset = MagicMock()
         mock_queryset.count.return_value = 0
+        mock_queryset.only.return_value = mock_queryset
         mock_execute_json_query.return_value = mock_queryset
         mock_activated_registries_response = MagicMock()
         mock_activated_registries_response.values_list.return_value = []
@@ -145,6 +156,36 @@ class TestExecuteExecuteOaiPmhQuery(SimpleTestCase):
             isinstance(page.paginator, mongo_paginator.MongoenginePaginator)
         )
 
+    @patch(
+        "core_explore_oaipmh_app.components.oai_registry.api.get_activated_registry_ids"
+    )
+    @patch(
+        "core_oaipmh_harvester_app.components.oai_record.api.execute_json_query"
+    )
+    def test_execute_oaipmh_query_in_cursor_mode_returns_keyset_page(
+        self, mock_execute_json_query, mock_get_activated_registry_ids
+    ):
+        """test_execute_oaipmh_query_in_cursor_mode_returns_keyset_page
+
+        Returns:
+
+        """
+        # Arrange
+        mock_user = create_mock_user(1)
+        mock_query_data = {"query": {}, "pagination_mode": "cursor"}
+        mock_request = create_mock_request(user=mock_user)
+        mock_execute_json_query.return_value = MagicMock()
+        mock_get_activated_registry_ids.return_value = []
+
+        # Act
+        page = query_views.execute_oaipmh_query(
+            query_data=mock_query_data, page=1, request=mock_request
+        )
+
+        # Assert
+        self.assertTrue(isinstance(page, KeysetPage))
+        self.assertFalse(page.has_next())
+
     def test_execute_oaipmh_query_none_raises_api_error(self):
         """test_execute_oaipmh_query_none_raises_api_error
 
@@ -189,8 +230,11 @@ class TestFormatOaiPmhResults(SimpleTestCase):
         self.assertIsInstance(results, list)
 
     @override_settings(INSTALLED_APPS=[])
+    @patch(
+        "core_explore_oaipmh_app.rest.query.views.get_metadata_formats_by_id"
+    )
     def test_format_oaipmh_results_returns_list(
-        self,
+        self, mock_get_metadata_formats_by_id
     ):
         """test_format_oaipmh_results_returns_list
 
@@ -208,6 +252,7 @@ class TestFormatOaiPmhResults(SimpleTestCase):
         mock_results = MagicMock()
         mock_results.object_list = [mock_data]
         mock_request = create_mock_request(user=mock_user)
+        mock_get_metadata_formats_by_id.return_value = {}
 
         # Act
         results = query_views.format_oaipmh_results(
@@ -217,3 +262,113 @@ class TestFormatOaiPmhResults(SimpleTestCase):
         # Assert
         self.assertIsInstance(results, list)
         self.assertTrue(len(results), 1)
+
+
+@patch(
+    "core_explore_oaipmh_app.components.oai_registry.api.get_activated_registry_ids"
+)
+class TestBuildOaiPmhQuery(SimpleTestCase):
+    """TestBuildOaiPmhQuery"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+
+    def test_build_oaipmh_query_returns_raw_query(
+        self, mock_get_activated_registry_ids
+    ):
+        """test_build_oaipmh_query_returns_raw_query"""
+        mock_get_activated_registry_ids.return_value = [1]
+
+        raw_query = query_views.build_oaipmh_query({"query": {}})
+
+        self.assertEqual(
+            raw_query,
+            {"$and": [{}, {"registry": {"$in": [1]}}, {"deleted": False}]},
+        )
+
+    @patch("core_explore_oaipmh_app.rest.query.views.OaiPmhQueryBuilder")
+    def test_same_query_is_built_once(
+        self, mock_query_builder, mock_get_activated_registry_ids
+    ):
+        """test_same_query_is_built_once"""
+        mock_get_activated_registry_ids.return_value = [1]
+        mock_query_builder.return_value.get_raw_query.return_value = {}
+
+        query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+        query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+
+        self.assertEqual(mock_query_builder.call_count, 1)
+        self.assertEqual(query_views.get_query_cache_stats()["hits"], 1)
+
+    @patch("core_explore_oaipmh_app.rest.query.views.OaiPmhQueryBuilder")
+    def test_different_queries_are_built(
+        self, mock_query_builder, mock_get_activated_registry_ids
+    ):
+        """test_different_queries_are_built"""
+        mock_get_activated_registry_ids.return_value = [1]
+        mock_query_builder.return_value.get_raw_query.return_value = {}
+
+        query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+        query_views.build_oaipmh_query({"query": '{"title": "b"}'})
+
+        self.assertEqual(mock_query_builder.call_count, 2)
+
+    @patch("core_explore_oaipmh_app.rest.query.views.OaiPmhQueryBuilder")
+    def test_registry_change_rebuilds_query(
+        self, mock_query_builder, mock_get_activated_registry_ids
+    ):
+        """test_registry_change_rebuilds_query"""
+        mock_get_activated_registry_ids.return_value = [1]
+        mock_query_builder.return_value.get_raw_query.return_value = {}
+
+        query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+        mock_get_activated_registry_ids.return_value = [1, 2]
+        query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+
+        self.assertEqual(mock_query_builder.call_count, 2)
+
+    @patch("core_explore_oaipmh_app.rest.query.views.OaiPmhQueryBuilder")
+    def test_registry_save_without_change_keeps_query(
+        self, mock_query_builder, mock_get_activated_registry_ids
+    ):
+        """test_registry_save_without_change_keeps_query"""
+        mock_get_activated_registry_ids.return_value = [1]
+        mock_query_builder.return_value.get_raw_query.return_value = {}
+
+        query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+        oai_registry_cache_api.invalidate()
+        query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+
+        self.assertEqual(mock_query_builder.call_count, 1)
+
+    @patch("core_explore_oaipmh_app.rest.query.views.OaiPmhQueryBuilder")
+    def test_compiled_query_expires(
+        self, mock_query_builder, mock_get_activated_registry_ids
+    ):
+        """test_compiled_query_expires"""
+        mock_get_activated_registry_ids.return_value = [1]
+        mock_query_builder.return_value.get_raw_query.return_value = {}
+
+        with patch("core_explore_oaipmh_app.utils.cache.time.monotonic") as (
+            mock_monotonic
+        ):
+            mock_monotonic.return_value = 0
+            query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+            mock_monotonic.return_value = EXPLORE_OAIPMH_CACHE_TIMEOUT + 1
+            query_views.build_oaipmh_query({"query": '{"title": "a"}'})
+
+        self.assertEqual(mock_query_builder.call_count, 2)
+
+    def test_cached_query_is_not_altered_by_caller(
+        self, mock_get_activated_registry_ids
+    ):
+        """test_cached_query_is_not_altered_by_caller"""
+        mock_get_activated_registry_ids.return_value = [1]
+
+        raw_query = query_views.build_oaipmh_query({"query": {}})
+        raw_query["$and"].clear()
+
+        self.assertEqual(
+            len(query_views.build_oaipmh_query({"query": {}})["$and"]), 3
+        )
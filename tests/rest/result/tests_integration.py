@@ -0,0 +1,262 @@
+"""Integration tests for OAI Explore Result Rest API"""
+
+import base64
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytz
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser, User
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from core_explore_oaipmh_app.rest import renderers
+from core_explore_oaipmh_app.rest.result import views as result_views
+from core_explore_oaipmh_app.utils.http import get_record_etag
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_main_app.utils.tests_tools.MockUser import create_mock_user
+from core_main_app.utils.tests_tools.RequestMock import RequestMock
+from tests.fixtures.fixtures import OaiRecordFixture
+
+
+class TestGetResultsFromDataIds(IntegrationBaseTestCase):
+    """TestGetResultsFromDataIds"""
+
+    fixture = OaiRecordFixture()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.user = create_mock_user("1")
+        self.record_ids = [
+            str(record.id) for record in self.fixture.record_collection
+        ]
+
+    def test_get_returns_result_for_each_id(self):
+        """test_get_returns_result_for_each_id"""
+        response = RequestMock.do_request_get(
+            result_views.get_results_from_data_ids,
+            self.user,
+            data={"ids": ",".join(self.record_ids[:3])},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data], self.record_ids[:3]
+        )
+        self.assertTrue(
+            all(item["status"] == status.HTTP_200_OK for item in response.data)
+        )
+
+    def test_post_returns_error_for_unknown_ids(self):
+        """test_post_returns_error_for_unknown_ids"""
+        response = RequestMock.do_request_post(
+            result_views.get_results_from_data_ids,
+            self.user,
+            data={"ids": [self.record_ids[0], "-1", "unknown"]},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in response.data],
+            [
+                status.HTTP_200_OK,
+                status.HTTP_404_NOT_FOUND,
+                status.HTTP_404_NOT_FOUND,
+            ],
+        )
+        self.assertEqual(
+            response.data[0]["result"]["title"], self.record_ids[0]
+        )
+
+    def test_records_are_retrieved_in_one_query(self):
+        """test_records_are_retrieved_in_one_query"""
+        with self.assertNumQueries(1):
+            RequestMock.do_request_post(
+                result_views.get_results_from_data_ids,
+                self.user,
+                data={"ids": self.record_ids},
+            )
+
+    def test_missing_ids_returns_400(self):
+        """test_missing_ids_returns_400"""
+        response = RequestMock.do_request_get(
+            result_views.get_results_from_data_ids, self.user
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_post_accepts_list_body(self):
+        """test_post_accepts_list_body"""
+        response = RequestMock.do_request_post(
+            result_views.get_results_from_data_ids,
+            self.user,
+            data=self.record_ids[:2],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data], self.record_ids[:2]
+        )
+
+    def test_post_invalid_body_returns_400(self):
+        """test_post_invalid_body_returns_400"""
+        for data in ("1,2", 1, {"ids": {"id": 1}}):
+            response = RequestMock.do_request_post(
+                result_views.get_results_from_data_ids,
+                self.user,
+                data=data,
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_too_many_ids_returns_400(self):
+        """test_too_many_ids_returns_400"""
+        response = RequestMock.do_request_post(
+            result_views.get_results_from_data_ids,
+            self.user,
+            data={"ids": [str(index) for index in range(101)]},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestGetResultFromDataId(IntegrationBaseTestCase):
+    """TestGetResultFromDataId"""
+
+    fixture = OaiRecordFixture()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.user = create_mock_user("1")
+        self.record = self.fixture.record_collection[0]
+
+    def _get(self, **extra):
+        """Send a GET request with the given headers"""
+        request = APIRequestFactory().get(
+            "/dummy_url", data={"id": self.record.id}, **extra
+        )
+        request.user = self.user
+        return result_views.get_result_from_data_id(request)
+
+    def test_response_has_validators(self):
+        """test_response_has_validators"""
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], get_record_etag(self.record))
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_matching_etag_returns_304(self):
+        """test_matching_etag_returns_304"""
+        etag = self._get()["ETag"]
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_etag_changes_when_record_is_updated(self):
+        """test_etag_changes_when_record_is_updated"""
+        etag = self._get()["ETag"]
+        self.record.last_modification_date = datetime(
+            2030, 1, 1, tzinfo=pytz.UTC
+        )
+        self.record.save()
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class TestGetResultFromDataIdAsync(TestGetResultFromDataId):
+    """TestGetResultFromDataIdAsync"""
+
+    def _get(self, **extra):
+        """Send a GET request with the given headers"""
+        request = APIRequestFactory().get(
+            "/dummy_url", data={"id": self.record.id}, **extra
+        )
+        request.user = self.user
+        return async_to_sync(result_views.get_result_from_data_id_async)(
+            request
+        )
+
+    def test_result_content(self):
+        """test_result_content"""
+        response = self._get()
+
+        self.assertEqual(
+            json.loads(response.content)["title"], str(self.record.id)
+        )
+
+
+@patch.object(renderers, "EXPLORE_OAIPMH_FAST_JSON", True)
+@patch.object(result_views, "EXPLORE_OAIPMH_FAST_JSON", True)
+class TestGetResultFromDataIdAsyncAuthentication(IntegrationBaseTestCase):
+    """TestGetResultFromDataIdAsyncAuthentication"""
+
+    fixture = OaiRecordFixture()
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.record = self.fixture.record_collection[0]
+        self.user = User.objects.create_user("user", password="password")
+
+    def _get(self, username, password):
+        """Send a GET request with basic authentication"""
+        credentials = base64.b64encode(
+            f"{username}:{password}".encode("utf-8")
+        ).decode("ascii")
+        request = APIRequestFactory().get(
+            "/dummy_url",
+            data={"id": self.record.id},
+            HTTP_AUTHORIZATION=f"Basic {credentials}",
+        )
+        request.user = AnonymousUser()
+        return async_to_sync(result_views.get_result_from_data_id_async)(
+            request
+        )
+
+    @patch.object(result_views.oai_record_api, "get_by_id")
+    def test_basic_authentication_is_accepted(self, mock_get_by_id):
+        """test_basic_authentication_is_accepted"""
+        mock_get_by_id.return_value = self.record
+
+        response = self._get("user", "password")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_get_by_id.call_args.args[1], self.user)
+
+    def test_invalid_credentials_are_rejected(self):
+        """test_invalid_credentials_are_rejected"""
+        response = self._get("user", "wrong")
+
+        self.assertIn(
+            response.status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+
+class TestGetResultFromDataIdAsyncFastJson(TestGetResultFromDataIdAsync):
+    """TestGetResultFromDataIdAsyncFastJson"""
+
+    def test_content_matches_stock_path(self):
+        """test_content_matches_stock_path"""
+        response = self._get()
+
+        with patch.object(
+            renderers, "EXPLORE_OAIPMH_FAST_JSON", False
+        ), patch.object(result_views, "EXPLORE_OAIPMH_FAST_JSON", False):
+            stock_response = self._get()
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(response.content), json.loads(stock_response.content)
+        )
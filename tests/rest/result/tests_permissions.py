@@ -80,3 +80,59 @@ class TestGetResultQueryRegistry(SimpleTestCase):
 
         # Assert
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TestGetResultsFromDataIds(SimpleTestCase):
+    """Test Get Results From Data Ids"""
+
+    def setUp(self):
+        """setUp"""
+        super().setUp()
+        self.data = {"ids": "1,2"}
+
+    @patch.object(oai_record_api, "execute_query")
+    def test_anonymous_returns_http_200(self, mock_execute_query):
+        """test_anonymous_returns_http_200"""
+
+        # Arrange
+        mock_execute_query.return_value.only.return_value = []
+
+        # Act
+        response = RequestMock.do_request_get(
+            result_views.get_results_from_data_ids, None, data=self.data
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @patch.object(oai_record_api, "execute_query")
+    def test_authenticated_returns_http_200(self, mock_execute_query):
+        """test_authenticated_returns_http_200"""
+
+        # Arrange
+        user = create_mock_user("1")
+        mock_execute_query.return_value.only.return_value = []
+
+        # Act
+        response = RequestMock.do_request_get(
+            result_views.get_results_from_data_ids, user=user, data=self.data
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @patch.object(oai_record_api, "execute_query")
+    def test_staff_returns_http_200(self, mock_execute_query):
+        """test_staff_returns_http_200"""
+
+        # Arrange
+        user = create_mock_user("1", is_staff=True)
+        mock_execute_query.return_value.only.return_value = []
+
+        # Act
+        response = RequestMock.do_request_get(
+            result_views.get_results_from_data_ids, user=user, data=self.data
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,70 @@
+"""Unit tests for the explore OAI-PMH REST renderers"""
+
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytz
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from core_explore_oaipmh_app.rest import renderers
+from core_explore_oaipmh_app.utils.result import (
+    OaiPmhResult,
+    serialize_result,
+)
+
+
+class TestFastJSONRenderer(SimpleTestCase):
+    """TestFastJSONRenderer"""
+
+    def setUp(self):
+        """setUp"""
+        self.data = [
+            serialize_result(
+                OaiPmhResult(
+                    title="titre",
+                    content='<tag>é\n"quoted"</tag>',
+                    last_modification_date=datetime(
+                        2024, 1, 1, tzinfo=pytz.UTC
+                    ),
+                )
+            )
+        ]
+
+    def test_output_matches_json_renderer(self):
+        """test_output_matches_json_renderer"""
+        self.assertEqual(
+            json.loads(renderers.FastJSONRenderer().render(self.data)),
+            json.loads(JSONRenderer().render(self.data)),
+        )
+
+    @patch.object(renderers, "orjson", None)
+    def test_output_without_orjson_matches_json_renderer(self):
+        """test_output_without_orjson_matches_json_renderer"""
+        self.assertEqual(
+            renderers.FastJSONRenderer().render(self.data),
+            JSONRenderer().render(self.data),
+        )
+
+    def test_none_renders_empty_body(self):
+        """test_none_renders_empty_body"""
+        self.assertEqual(renderers.FastJSONRenderer().render(None), b"")
+
+
+class TestGetRendererClasses(SimpleTestCase):
+    """TestGetRendererClasses"""
+
+    @patch.object(renderers, "EXPLORE_OAIPMH_FAST_JSON", True)
+    def test_fast_json_uses_fast_renderer(self):
+        """test_fast_json_uses_fast_renderer"""
+        self.assertEqual(
+            renderers.get_renderer_classes(), [renderers.FastJSONRenderer]
+        )
+
+    @patch.object(renderers, "EXPLORE_OAIPMH_FAST_JSON", False)
+    def test_stock_path_uses_default_renderers(self):
+        """test_stock_path_uses_default_renderers"""
+        self.assertNotIn(
+            renderers.FastJSONRenderer, renderers.get_renderer_classes()
+        )
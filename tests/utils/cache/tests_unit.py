@@ -0,0 +1,48 @@
+"""Unit tests for the explore OAI-PMH cache utils"""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.utils.cache import LocalCache
+
+
+class TestLocalCache(SimpleTestCase):
+    """TestLocalCache"""
+
+    def test_get_returns_set_value(self):
+        """test_get_returns_set_value"""
+        cache = LocalCache("test")
+        cache.set("key", "value")
+
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual(cache.get_stats()["hits"], 1)
+
+    def test_get_missing_key_returns_default(self):
+        """test_get_missing_key_returns_default"""
+        cache = LocalCache("test")
+
+        self.assertEqual(cache.get("key", "default"), "default")
+        self.assertEqual(cache.get_stats()["misses"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """test_least_recently_used_entry_is_evicted"""
+        cache = LocalCache("test", max_size=2)
+        cache.set("key1", 1)
+        cache.set("key2", 2)
+        cache.get("key1")
+        cache.set("key3", 3)
+
+        self.assertEqual(cache.get("key1"), 1)
+        self.assertIsNone(cache.get("key2"))
+        self.assertEqual(cache.get("key3"), 3)
+
+    @patch("core_explore_oaipmh_app.utils.cache.time.monotonic")
+    def test_expired_entry_is_not_returned(self, mock_monotonic):
+        """test_expired_entry_is_not_returned"""
+        cache = LocalCache("test", timeout=10)
+        mock_monotonic.return_value = 100
+        cache.set("key", "value")
+        mock_monotonic.return_value = 111
+
+        self.assertIsNone(cache.get("key"))
@@ -0,0 +1,251 @@
+"""Unit tests for the explore OAI-PMH fan-out utils"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.utils import fanout as fanout_utils
+from core_explore_oaipmh_app.utils.fanout import FanOutResults, split_raw_query
+
+
+class TestSplitRawQuery(SimpleTestCase):
+    """TestSplitRawQuery"""
+
+    def test_query_is_split_by_registry(self):
+        """test_query_is_split_by_registry"""
+        raw_query = {
+            "$and": [
+                {"title": "a"},
+                {"registry": {"$in": [1, 2]}},
+                {"deleted": False},
+            ]
+        }
+
+        self.assertEqual(
+            split_raw_query(raw_query),
+            {
+                1: {
+                    "$and": [
+                        {"title": "a"},
+                        {"registry": {"$in": [1]}},
+                        {"deleted": False},
+                    ]
+                },
+                2: {
+                    "$and": [
+                        {"title": "a"},
+                        {"registry": {"$in": [2]}},
+                        {"deleted": False},
+                    ]
+                },
+            },
+        )
+
+    def test_query_is_split_by_metadata_format(self):
+        """test_query_is_split_by_metadata_format"""
+        raw_query = {
+            "$and": [
+                {},
+                {"harvester_metadata_format": {"$in": [3, 4]}},
+                {"deleted": False},
+            ]
+        }
+
+        self.assertEqual(list(split_raw_query(raw_query)), [3, 4])
+
+    def test_query_without_partition_is_not_split(self):
+        """test_query_without_partition_is_not_split"""
+        self.assertEqual(split_raw_query({"title": "a"}), {})
+
+
+class _QuerySet(list):
+    """List of records, already sorted, behaving like a queryset"""
+
+    db = "default"
+
+    def order_by(self, *args):
+        """order_by"""
+        return self
+
+    def count(self):
+        """count"""
+        return len(self)
+
+    def values_list(self, *fields, flat=False):
+        """values_list"""
+        return _QuerySet(record.pk for record in self)
+
+    def filter(self, pk__in):
+        """filter"""
+        return _QuerySet(record for record in self if record.pk in pk__in)
+
+    def __getitem__(self, key):
+        """__getitem__"""
+        item = super().__getitem__(key)
+        return _QuerySet(item) if isinstance(key, slice) else item
+
+
+class _BlockedQuerySet(_QuerySet):
+    """Queryset blocked until the event is set"""
+
+    def __init__(self, records, event):
+        super().__init__(records)
+        self.event = event
+
+    def count(self):
+        """count"""
+        self.event.wait()
+        return len(self)
+
+
+def _create_querysets(*titles_by_partition):
+    """Create a queryset of records per partition"""
+    querysets = {}
+    pk = 0
+    for partition_id, titles in enumerate(titles_by_partition):
+        records = []
+        for title in titles:
+            pk += 1
+            records.append(SimpleNamespace(pk=pk, title=title))
+        querysets[partition_id] = _QuerySet(records)
+    return querysets
+
+
+def _merge_querysets(querysets, key=lambda record: (record.title, record.pk)):
+    """Create the queryset of all the partitions, ordered by the database"""
+    return _QuerySet(
+        sorted(
+            (record for queryset in querysets.values() for record in queryset),
+            key=key,
+        )
+    )
+
+
+def _create_results(querysets, **kwargs):
+    """Create the fan-out results of the partitions"""
+    return FanOutResults(
+        querysets, _merge_querysets(querysets), ["+title"], **kwargs
+    )
+
+
+class TestFanOutResults(SimpleTestCase):
+    """TestFanOutResults"""
+
+    def test_count_sums_partitions(self):
+        """test_count_sums_partitions"""
+        results = _create_results(
+            _create_querysets(["a", "c"], ["b"]), threads=2
+        )
+
+        self.assertEqual(results.count(), 3)
+        self.assertEqual(results.count_up_to(2), 2)
+
+    def test_slice_merges_partitions_on_sorting_fields(self):
+        """test_slice_merges_partitions_on_sorting_fields"""
+        results = _create_results(
+            _create_querysets(["a", "d", "e"], ["b", "c", "f"]), threads=2
+        )
+
+        self.assertEqual(
+            [record.title for record in results[1:4]], ["b", "c", "d"]
+        )
+
+    def test_merged_records_are_ordered_by_database(self):
+        """test_merged_records_are_ordered_by_database"""
+        querysets = _create_querysets(["a", "C"], ["B"])
+        # case insensitive collation
+        results = FanOutResults(
+            querysets,
+            _merge_querysets(
+                querysets, key=lambda record: record.title.lower()
+            ),
+            ["+title"],
+            threads=2,
+        )
+
+        self.assertEqual(
+            [record.title for record in results[0:3]], ["a", "B", "C"]
+        )
+
+    def test_page_ids_are_returned_with_count(self):
+        """test_page_ids_are_returned_with_count"""
+        querysets = _create_querysets(["a", "c"], ["b"])
+        results = _create_results(querysets, threads=2, prefetch=2)
+        results.count()
+
+        with patch.object(results, "_run") as mock_run:
+            records = results[0:2]
+
+        mock_run.assert_not_called()
+        self.assertEqual([record.title for record in records], ["a", "b"])
+
+    def test_slow_partition_is_left_out(self):
+        """test_slow_partition_is_left_out"""
+        event = threading.Event()
+        querysets = _create_querysets(["a"], ["b"])
+        querysets[1] = _BlockedQuerySet(querysets[1], event)
+        results = _create_results(
+            querysets, timeout=0.05, threads=2, prefetch=2
+        )
+
+        try:
+            self.assertEqual(results.count(), 1)
+        finally:
+            event.set()
+        self.assertEqual(results.degraded, {1})
+        self.assertEqual([record.title for record in results[0:2]], ["a"])
+
+    def test_deadline_is_shared_by_count_and_page(self):
+        """test_deadline_is_shared_by_count_and_page"""
+        results = _create_results(
+            _create_querysets(["a"], ["b"]), timeout=0.05, threads=2
+        )
+        time.sleep(0.06)
+
+        self.assertEqual(results.count(), 0)
+        self.assertEqual(results.degraded, {0, 1})
+        self.assertEqual(results[0:2], [])
+
+    def test_sub_query_started_after_deadline_is_not_run(self):
+        """test_sub_query_started_after_deadline_is_not_run"""
+        func = MagicMock()
+
+        with self.assertRaises(TimeoutError):
+            fanout_utils._run_in_thread(func, _QuerySet([]), deadline=0)
+        func.assert_not_called()
+
+    @patch.object(fanout_utils, "connections")
+    def test_postgresql_sub_query_is_bounded_by_statement_timeout(
+        self, mock_connections
+    ):
+        """test_postgresql_sub_query_is_bounded_by_statement_timeout"""
+        connection = mock_connections.__getitem__.return_value
+        connection.vendor = "postgresql"
+        cursor = connection.cursor.return_value.__enter__.return_value
+
+        fanout_utils._run_in_thread(
+            len, _QuerySet([]), deadline=time.monotonic() + 10
+        )
+
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertEqual(
+            statements,
+            ["SET statement_timeout = %s", "RESET statement_timeout"],
+        )
+        self.assertLessEqual(
+            cursor.execute.call_args_list[0].args[1][0], 10000
+        )
+
+    @patch.object(fanout_utils.settings, "MONGODB_INDEXING", True)
+    def test_mongo_sub_query_is_bounded_by_max_time(self):
+        """test_mongo_sub_query_is_bounded_by_max_time"""
+        queryset = MagicMock()
+
+        fanout_utils._run_in_thread(
+            len, queryset, deadline=time.monotonic() + 10
+        )
+
+        self.assertLessEqual(queryset.max_time_ms.call_args.args[0], 10000)
@@ -0,0 +1,59 @@
+"""Unit tests for the explore OAI-PMH HTTP utils"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytz
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.utils.http import (
+    get_record_etag,
+    get_record_last_modified,
+)
+
+
+class TestGetRecordEtag(SimpleTestCase):
+    """TestGetRecordEtag"""
+
+    def setUp(self):
+        """setUp"""
+        self.record = SimpleNamespace(
+            id=1,
+            last_modification_date=datetime(2020, 1, 1, tzinfo=pytz.UTC),
+        )
+
+    def test_etag_is_strong_and_stable(self):
+        """test_etag_is_strong_and_stable"""
+        etag = get_record_etag(self.record)
+
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertEqual(etag, get_record_etag(self.record))
+
+    def test_etag_depends_on_last_modification_date(self):
+        """test_etag_depends_on_last_modification_date"""
+        etag = get_record_etag(self.record)
+        self.record.last_modification_date = datetime(
+            2021, 1, 1, tzinfo=pytz.UTC
+        )
+
+        self.assertNotEqual(etag, get_record_etag(self.record))
+
+    def test_etag_depends_on_extra_values(self):
+        """test_etag_depends_on_extra_values"""
+        self.assertNotEqual(
+            get_record_etag(self.record, "xslt_1"),
+            get_record_etag(self.record, "xslt_2"),
+        )
+
+    def test_last_modified_of_naive_date_is_utc(self):
+        """test_last_modified_of_naive_date_is_utc"""
+        self.record.last_modification_date = datetime(2020, 1, 1)
+
+        self.assertEqual(get_record_last_modified(self.record), 1577836800)
+
+    def test_last_modified_without_date_is_none(self):
+        """test_last_modified_without_date_is_none"""
+        self.record.last_modification_date = None
+
+        self.assertIsNone(get_record_last_modified(self.record))
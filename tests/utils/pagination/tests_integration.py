@@ -0,0 +1,198 @@
+"""Integration tests for the keyset paginator"""
+
+from django.core.paginator import EmptyPage
+
+from core_explore_oaipmh_app.utils.pagination.keyset import KeysetPaginator
+from core_explore_oaipmh_app.utils.pagination.paginator import (
+    OaiPmhPaginator,
+)
+from core_main_app.commons.exceptions import ApiError
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_oaipmh_harvester_app.components.oai_record.models import OaiRecord
+from tests.fixtures.fixtures import OaiRecordFixture
+
+
+class TestKeysetPaginatorGetPage(IntegrationBaseTestCase):
+    """TestKeysetPaginatorGetPage"""
+
+    fixture = OaiRecordFixture()
+
+    def _get_all_pages(self, order_by_field, per_page):
+        """Return the ids of the records of all the pages
+
+        Args:
+            order_by_field:
+            per_page:
+
+        Returns:
+
+        """
+        paginator = KeysetPaginator(
+            OaiRecord.objects.all(), order_by_field, per_page
+        )
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        return [[record.id for record in page.object_list] for page in pages]
+
+    def test_pages_follow_ascending_order(self):
+        """test_pages_follow_ascending_order"""
+        expected_ids = list(
+            OaiRecord.objects.order_by("title", "pk").values_list(
+                "id", flat=True
+            )
+        )
+
+        pages = self._get_all_pages(["+title"], 2)
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), expected_ids)
+
+    def test_pages_follow_descending_order(self):
+        """test_pages_follow_descending_order"""
+        expected_ids = list(
+            OaiRecord.objects.order_by("-title", "pk").values_list(
+                "id", flat=True
+            )
+        )
+
+        pages = self._get_all_pages(["-title"], 2)
+
+        self.assertEqual(sum(pages, []), expected_ids)
+
+    def test_pages_follow_order_with_null_values(self):
+        """test_pages_follow_order_with_null_values"""
+        OaiRecord.objects.filter(
+            pk__in=[record.pk for record in self.fixture.record_collection[:2]]
+        ).update(last_modification_date=None)
+        expected_ids = [
+            record.pk for record in self.fixture.record_collection[:2]
+        ] + [record.pk for record in self.fixture.record_collection[2:]]
+
+        pages = self._get_all_pages(["+last_modification_date"], 2)
+
+        self.assertEqual(sum(pages, []), expected_ids)
+
+    def test_last_page_has_no_next_cursor(self):
+        """test_last_page_has_no_next_cursor"""
+        paginator = KeysetPaginator(OaiRecord.objects.all(), ["+title"], 10)
+
+        page = paginator.get_page()
+
+        self.assertEqual(len(page), 5)
+        self.assertFalse(page.has_next())
+        self.assertFalse(page.has_other_pages())
+
+
+class TestOaiPmhPaginatorCount(IntegrationBaseTestCase):
+    """TestOaiPmhPaginatorCount"""
+
+    fixture = OaiRecordFixture()
+
+    def _get_paginator(self, count_mode, page_number=1):
+        """Return a paginator of the fixture records
+
+        Args:
+            count_mode:
+            page_number:
+
+        Returns:
+
+        """
+        return OaiPmhPaginator(
+            OaiRecord.objects.order_by("pk"),
+            1,
+            count_mode=count_mode,
+            count_cap=2,
+            page_number=page_number,
+        )
+
+    def test_exact_count_returns_number_of_records(self):
+        """test_exact_count_returns_number_of_records"""
+        page = self._get_paginator("exact").get_page(1)
+
+        self.assertEqual(page.paginator.count, 5)
+        self.assertTrue(page.count_is_exact)
+        self.assertEqual(page.count_display, "5")
+
+    def test_capped_count_stops_after_cap(self):
+        """test_capped_count_stops_after_cap"""
+        page = self._get_paginator("capped").get_page(1)
+
+        self.assertEqual(page.paginator.count, 3)
+        self.assertFalse(page.count_is_exact)
+        self.assertEqual(page.count_display, "2+")
+
+    def test_capped_count_covers_requested_page(self):
+        """test_capped_count_covers_requested_page"""
+        page = self._get_paginator("capped", page_number=4).get_page(4)
+
+        self.assertEqual(page.number, 4)
+        self.assertTrue(page.has_next())
+        self.assertEqual(page.count_display, "4+")
+
+    def test_capped_count_under_cap_is_exact(self):
+        """test_capped_count_under_cap_is_exact"""
+        page = self._get_paginator("capped", page_number=5).get_page(5)
+
+        self.assertEqual(page.paginator.count, 5)
+        self.assertTrue(page.count_is_exact)
+
+    def test_estimated_count_without_statistics_falls_back_to_capped(self):
+        """test_estimated_count_without_statistics_falls_back_to_capped"""
+        page = self._get_paginator("estimated").get_page(1)
+
+        self.assertEqual(page.count_mode, "capped")
+        self.assertEqual(page.paginator.count, 3)
+
+    def test_unknown_count_mode_raises_api_error(self):
+        """test_unknown_count_mode_raises_api_error"""
+        with self.assertRaises(ApiError):
+            self._get_paginator("unknown")
+
+
+class TestKeysetPage(IntegrationBaseTestCase):
+    """TestKeysetPage"""
+
+    fixture = OaiRecordFixture()
+
+    def test_page_has_the_django_page_interface(self):
+        """test_page_has_the_django_page_interface"""
+        paginator = KeysetPaginator(OaiRecord.objects.all(), ["+title"], 2)
+        first_page = paginator.get_page()
+
+        page = paginator.get_page(first_page.next_cursor, 2)
+
+        self.assertEqual(page.paginator.count, 5)
+        self.assertEqual(page.paginator.num_pages, 3)
+        self.assertEqual(page.previous_page_number(), 1)
+        self.assertEqual(page.next_page_number(), 3)
+        self.assertEqual((page.start_index(), page.end_index()), (3, 4))
+
+    def test_first_and_last_pages_raise_empty_page(self):
+        """test_first_and_last_pages_raise_empty_page"""
+        page = KeysetPaginator(
+            OaiRecord.objects.all(), ["+title"], 10
+        ).get_page()
+
+        with self.assertRaises(EmptyPage):
+            page.previous_page_number()
+        with self.assertRaises(EmptyPage):
+            page.next_page_number()
+
+    def test_count_uses_count_paginator(self):
+        """test_count_uses_count_paginator"""
+        count_paginator = OaiPmhPaginator(
+            OaiRecord.objects.all(), 2, count_mode="capped", count_cap=2
+        )
+
+        page = KeysetPaginator(
+            OaiRecord.objects.all(),
+            ["+title"],
+            2,
+            count_paginator=count_paginator,
+        ).get_page()
+
+        self.assertEqual(page.paginator.count, 3)
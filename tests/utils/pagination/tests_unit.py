@@ -0,0 +1,46 @@
+"""Unit tests for the paginators"""
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.utils.pagination.keyset import (
+    encode_cursor,
+    decode_cursor,
+)
+from core_explore_oaipmh_app.utils.pagination.paginator import OaiPmhPaginator
+from core_main_app.commons.exceptions import ApiError
+from core_main_app.utils.datetime import datetime_now
+
+
+class TestCursor(SimpleTestCase):
+    """TestCursor"""
+
+    def test_decode_cursor_returns_encoded_values(self):
+        """test_decode_cursor_returns_encoded_values"""
+        now = datetime_now()
+
+        cursor = encode_cursor(["title", now, None], 42)
+
+        self.assertEqual(decode_cursor(cursor), (["title", now, None], 42))
+
+    def test_decode_invalid_cursor_raises_api_error(self):
+        """test_decode_invalid_cursor_raises_api_error"""
+        with self.assertRaises(ApiError):
+            decode_cursor("invalid")
+
+
+class _DegradedResults(list):
+    """Results with partitions left out"""
+
+    degraded = {1}
+
+
+class TestOaiPmhPaginatorDegradedResults(SimpleTestCase):
+    """TestOaiPmhPaginatorDegradedResults"""
+
+    def test_degraded_results_count_is_approximate(self):
+        """test_degraded_results_count_is_approximate"""
+        page = OaiPmhPaginator(_DegradedResults([1, 2, 3]), 2).get_page(1)
+
+        self.assertFalse(page.count_is_exact)
+        self.assertEqual(page.count_mode, "estimated")
+        self.assertEqual(page.count_display, "~3")
@@ -0,0 +1,161 @@
+"""Unit tests for the explore OAI-PMH rendering utils"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytz
+from asgiref.sync import async_to_sync
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.utils import cache as cache_utils
+from core_explore_oaipmh_app.utils.rendering import (
+    get_prerendered_record_detail,
+    prerender_record_detail,
+    render_record_detail,
+    render_record_detail_async,
+)
+
+
+@patch("core_explore_oaipmh_app.utils.rendering.render_xml_as_html_detail")
+class TestRenderRecordDetail(SimpleTestCase):
+    """TestRenderRecordDetail"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+        self.record = _create_record()
+
+    def test_rendering_is_reused(self, mock_render):
+        """test_rendering_is_reused"""
+        mock_render.return_value = "<div/>"
+
+        render_record_detail(self.record, xslt_id="1")
+        html = render_record_detail(self.record, xslt_id="1")
+
+        self.assertEqual(html, "<div/>")
+        self.assertEqual(mock_render.call_count, 1)
+
+    def test_each_xslt_has_its_rendering(self, mock_render):
+        """test_each_xslt_has_its_rendering"""
+        render_record_detail(self.record, xslt_id="1")
+        render_record_detail(self.record, xslt_id="2")
+
+        self.assertEqual(mock_render.call_count, 2)
+
+    def test_updated_record_is_rendered_again(self, mock_render):
+        """test_updated_record_is_rendered_again"""
+        render_record_detail(self.record)
+        self.record.last_modification_date = datetime(
+            2021, 1, 1, tzinfo=pytz.UTC
+        )
+        render_record_detail(self.record)
+
+        self.assertEqual(mock_render.call_count, 2)
+
+    def test_record_without_template_is_rendered_as_xml(self, mock_render):
+        """test_record_without_template_is_rendered_as_xml"""
+        self.record.harvester_metadata_format.template = None
+
+        html = render_record_detail(self.record)
+
+        self.assertEqual(html, "<test/>")
+        mock_render.assert_not_called()
+
+    def test_record_without_template_is_rendered_as_xml_async(
+        self, mock_render
+    ):
+        """test_record_without_template_is_rendered_as_xml_async"""
+        self.record.harvester_metadata_format.template = None
+
+        html = async_to_sync(render_record_detail_async)(self.record)
+
+        self.assertEqual(html, "<test/>")
+        mock_render.assert_not_called()
+
+
+@patch(
+    "core_explore_oaipmh_app.utils.rendering.get_detail_xslt",
+    return_value=(1, "xslt"),
+)
+@patch(
+    "core_explore_oaipmh_app.utils.rendering.transform_xml",
+    return_value="<div>prerendered</div>",
+)
+class TestPrerenderRecordDetail(SimpleTestCase):
+    """TestPrerenderRecordDetail"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+        self.record = _create_record()
+
+    def test_prerendered_html_is_returned(self, *mocks):
+        """test_prerendered_html_is_returned"""
+        prerender_record_detail(self.record)
+
+        self.assertEqual(
+            get_prerendered_record_detail(self.record),
+            "<div>prerendered</div>",
+        )
+        self.assertEqual(
+            get_prerendered_record_detail(self.record, xslt_id="1"),
+            "<div>prerendered</div>",
+        )
+
+    def test_other_xslt_is_not_prerendered(self, *mocks):
+        """test_other_xslt_is_not_prerendered"""
+        prerender_record_detail(self.record)
+
+        self.assertIsNone(
+            get_prerendered_record_detail(self.record, xslt_id="2")
+        )
+
+    def test_updated_record_is_not_prerendered(self, *mocks):
+        """test_updated_record_is_not_prerendered"""
+        prerender_record_detail(self.record)
+        self.record.last_modification_date = datetime(
+            2021, 1, 1, tzinfo=pytz.UTC
+        )
+
+        self.assertIsNone(get_prerendered_record_detail(self.record))
+
+    def test_deleted_record_is_not_prerendered(self, *mocks):
+        """test_deleted_record_is_not_prerendered"""
+        self.record.deleted = True
+
+        prerender_record_detail(self.record)
+
+        self.assertIsNone(get_prerendered_record_detail(self.record))
+
+    @patch(
+        "core_explore_oaipmh_app.utils.rendering.EXPLORE_OAIPMH_PRERENDER",
+        True,
+    )
+    @patch("core_explore_oaipmh_app.utils.rendering.render_xml_as_html_detail")
+    def test_render_serves_prerendered_html(self, mock_render, *mocks):
+        """test_render_serves_prerendered_html"""
+        prerender_record_detail(self.record)
+
+        html = render_record_detail(self.record)
+
+        self.assertEqual(html, "<div>prerendered</div>")
+        mock_render.assert_not_called()
+
+
+def _create_record():
+    """Return a record
+
+    Returns:
+
+    """
+    return SimpleNamespace(
+        id=1,
+        last_modification_date=datetime(2020, 1, 1, tzinfo=pytz.UTC),
+        harvester_metadata_format=SimpleNamespace(
+            template=SimpleNamespace(id=1, hash="template_hash")
+        ),
+        xml_content="<test/>",
+        deleted=False,
+    )
@@ -0,0 +1,77 @@
+"""Unit tests for the explore OAI-PMH result utils"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytz
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.utils.result import OaiPmhResult, serialize_result
+from core_explore_common_app.components.result.models import Result
+from core_explore_common_app.rest.result.serializers import ResultSerializer
+from core_explore_common_app.templatetags import result_to_html
+
+
+class TestSerializeResult(SimpleTestCase):
+    """TestSerializeResult"""
+
+    def test_output_matches_result_serializer(self):
+        """test_output_matches_result_serializer"""
+        values = {
+            "title": "title",
+            "content": "<tag>content</tag>",
+            "template_info": {"id": 1, "name": "name", "hash": "hash"},
+            "detail_url": "/detail?id=1",
+            "access_data_url": "/result?id=1",
+            "last_modification_date": datetime(
+                2024, 1, 2, 3, 4, 5, 6000, tzinfo=pytz.UTC
+            ),
+        }
+
+        self.assertEqual(
+            serialize_result(OaiPmhResult(**values)),
+            ResultSerializer(Result(**values)).data,
+        )
+
+    def test_default_output_matches_result_serializer(self):
+        """test_default_output_matches_result_serializer"""
+        self.assertEqual(
+            serialize_result(OaiPmhResult()),
+            ResultSerializer(Result()).data,
+        )
+
+    def test_result_serializer_accepts_result(self):
+        """test_result_serializer_accepts_result"""
+        result = OaiPmhResult(title="title", content="content")
+
+        self.assertEqual(
+            ResultSerializer(result).data, serialize_result(result)
+        )
+
+    @patch.object(result_to_html, "_get_template_html_rendering")
+    def test_result_list_html_renders_result(
+        self, mock_get_template_html_rendering
+    ):
+        """test_result_list_html_renders_result"""
+        mock_get_template_html_rendering.return_value = (
+            "<b>{{ dict_content.tag }}</b>"
+        )
+        result = OaiPmhResult(
+            content="<tag>list</tag>",
+            template_info={"id": 1, "hash": "hash", "format": "XSD"},
+        )
+
+        self.assertEqual(
+            result_to_html.result_list_html(result), "<b>list</b>"
+        )
+
+    def test_result_fields_are_attributes(self):
+        """test_result_fields_are_attributes"""
+        result = OaiPmhResult(title="title")
+        result.content = "content"
+
+        self.assertEqual(result.title, "title")
+        self.assertEqual(result["content"], "content")
+        with self.assertRaises(AttributeError):
+            result.unknown = "unknown"
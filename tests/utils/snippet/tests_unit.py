@@ -0,0 +1,100 @@
+"""Unit tests for the explore OAI-PMH snippet utils"""
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.utils.snippet import (
+    extract_query_terms,
+    get_snippet,
+)
+
+
+class TestExtractQueryTerms(SimpleTestCase):
+    """TestExtractQueryTerms"""
+
+    def test_text_search_keywords_and_phrases(self):
+        """test_text_search_keywords_and_phrases"""
+        terms = extract_query_terms(
+            '{"$text": {"$search": "steel \\"heat treatment\\" -iron"}}'
+        )
+
+        self.assertEqual(terms, ["heat treatment", "steel"])
+
+    def test_criteria_values(self):
+        """test_criteria_values"""
+        terms = extract_query_terms(
+            {
+                "$and": [
+                    {"dict_content.a.b": "alloy"},
+                    {"dict_content.a.c": {"$in": ["Copper", "zinc"]}},
+                    {"dict_content.a.d": {"$gt": 10}},
+                    {"dict_content.a.e": {"$regex": "^nickel$"}},
+                ]
+            }
+        )
+
+        self.assertCountEqual(terms, ["alloy", "Copper", "zinc", "nickel"])
+
+    def test_negated_and_pattern_criteria_are_ignored(self):
+        """test_negated_and_pattern_criteria_are_ignored"""
+        terms = extract_query_terms(
+            {
+                "dict_content.a": {"$not": "alloy"},
+                "dict_content.b": {"$ne": "copper"},
+                "dict_content.c": "/zi.c/",
+                "dict_content.d": "x",
+            }
+        )
+
+        self.assertEqual(terms, [])
+
+    def test_invalid_query_returns_no_terms(self):
+        """test_invalid_query_returns_no_terms"""
+        self.assertEqual(extract_query_terms("{invalid"), [])
+
+
+class TestGetSnippet(SimpleTestCase):
+    """TestGetSnippet"""
+
+    def test_short_text_is_highlighted(self):
+        """test_short_text_is_highlighted"""
+        snippet = get_snippet(
+            "<a><b>Steel &amp; Copper</b><c>steel</c></a>", ["steel"], 300, 3
+        )
+
+        self.assertEqual(
+            snippet, "<mark>Steel</mark> &amp; Copper <mark>steel</mark>"
+        )
+
+    def test_long_text_is_bounded_around_the_matches(self):
+        """test_long_text_is_bounded_around_the_matches"""
+        xml_content = f"<a>{'filler ' * 100}<b>steel</b>{'filler ' * 100}</a>"
+
+        snippet = get_snippet(xml_content, ["steel"], 50, 3)
+
+        self.assertTrue(snippet.startswith("&hellip;"))
+        self.assertTrue(snippet.endswith("&hellip;"))
+        self.assertIn("<mark>steel</mark>", snippet)
+        text = snippet.replace("&hellip;", "").replace("<mark>", "")
+        self.assertLessEqual(len(text.replace("</mark>", "")), 50)
+
+    def test_distant_matches_are_separate_fragments(self):
+        """test_distant_matches_are_separate_fragments"""
+        xml_content = f"<a>steel{' filler' * 100} copper{' filler' * 100}</a>"
+
+        snippet = get_snippet(xml_content, ["steel", "copper"], 60, 3)
+
+        self.assertEqual(snippet.count("&hellip;"), 3)
+        self.assertIn("<mark>steel</mark>", snippet)
+        self.assertIn("<mark>copper</mark>", snippet)
+
+    def test_no_match_returns_the_beginning(self):
+        """test_no_match_returns_the_beginning"""
+        snippet = get_snippet(f"<a>start{' filler' * 100}</a>", [], 20, 3)
+
+        self.assertEqual(snippet, "start filler filler &hellip;")
+
+    def test_text_is_escaped(self):
+        """test_text_is_escaped"""
+        snippet = get_snippet("<a>&lt;script&gt;</a>", ["script"], 300, 3)
+
+        self.assertEqual(snippet, "&lt;<mark>script</mark>&gt;")
@@ -0,0 +1,88 @@
+"""Unit tests for the explore OAI-PMH XSLT utils"""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core_explore_oaipmh_app.utils import cache as cache_utils
+from core_explore_oaipmh_app.utils import xslt as xslt_utils
+from core_explore_oaipmh_app.utils.xslt import (
+    get_compiled_xslt,
+    get_xslt_pool_stats,
+    render_xml_as_html_detail,
+)
+from core_main_app.templatetags.xsl_transform_tag import _render_xml_as_html
+
+
+XSLT = """<xsl:stylesheet version="1.0"
+    xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+    <xsl:template match="/"><p><xsl:value-of select="{0}"/></p></xsl:template>
+</xsl:stylesheet>"""
+
+
+class TestXsltPool(SimpleTestCase):
+    """TestXsltPool"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+
+    def test_compiled_xslt_is_reused(self):
+        """test_compiled_xslt_is_reused"""
+        transform = get_compiled_xslt(1, XSLT.format("/test"))
+
+        self.assertIs(get_compiled_xslt(1, XSLT.format("/test")), transform)
+        self.assertEqual(get_xslt_pool_stats()["compiles"], 1)
+        self.assertEqual(get_xslt_pool_stats()["reuses"], 1)
+
+    def test_edited_xslt_is_compiled_again(self):
+        """test_edited_xslt_is_compiled_again"""
+        transform = get_compiled_xslt(1, XSLT.format("/test"))
+
+        self.assertIsNot(
+            get_compiled_xslt(1, XSLT.format("/other")), transform
+        )
+        self.assertEqual(get_xslt_pool_stats()["compiles"], 2)
+
+    def test_render_without_template_uses_default_xslt(self):
+        """test_render_without_template_uses_default_xslt"""
+        xml_content = "<test><message>Hello</message></test>"
+
+        self.assertEqual(
+            render_xml_as_html_detail(xml_content),
+            _render_xml_as_html("test", xml_content=xml_content),
+        )
+
+    def test_render_invalid_xml_returns_xml(self):
+        """test_render_invalid_xml_returns_xml"""
+        self.assertEqual(render_xml_as_html_detail("<test>"), "<test>")
+
+    @patch.object(xslt_utils, "warm_up")
+    @patch.object(xslt_utils, "_are_tables_ready", return_value=True)
+    def test_init_warms_up_pool(self, mock_tables_ready, mock_warm_up):
+        """test_init_warms_up_pool"""
+        xslt_utils.init()
+
+        mock_warm_up.assert_called_once_with()
+
+    @patch.object(xslt_utils, "warm_up")
+    @patch.object(xslt_utils, "_are_tables_ready", return_value=False)
+    def test_init_without_tables_skips_warm_up(
+        self, mock_tables_ready, mock_warm_up
+    ):
+        """test_init_without_tables_skips_warm_up"""
+        xslt_utils.init()
+
+        mock_warm_up.assert_not_called()
+
+    @patch.object(xslt_utils, "warm_up")
+    @patch.object(
+        xslt_utils, "_are_tables_ready", side_effect=Exception("no database")
+    )
+    def test_init_without_database_skips_warm_up(
+        self, mock_tables_ready, mock_warm_up
+    ):
+        """test_init_without_database_skips_warm_up"""
+        xslt_utils.init()
+
+        mock_warm_up.assert_not_called()
@@ -4,10 +4,14 @@ from unittest import TestCase
 from unittest.mock import patch, MagicMock
 import json
 
+from django.core.cache import cache
 from django.test import RequestFactory
 from rest_framework import status
 
 from core_explore_oaipmh_app.views.user.ajax import (
+    get_data_source_list_oaipmh,
+    get_data_source_list_oaipmh_json,
+    set_data_source_list_oaipmh,
     update_data_source_list_oaipmh,
     change_data_display,
 )
@@ -28,6 +32,181 @@ from core_main_app.templatetags.xsl_transform_tag import (
 )
 
 
+class TestGetDataSourceListOaipmh(TestCase):
+    """Test get_data_source_list_oaipmh function"""
+
+    def setUp(self):
+        """setUp"""
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = create_mock_user(user_id="1")
+
+    def _send_request(self):
+        """_send_request"""
+        request = self.factory.get("core_explore_oaipmh_app_get_data_sources")
+        request.user = self.user
+        request.GET = {"id_query": "1"}
+
+        return get_data_source_list_oaipmh(request)
+
+    @patch(
+        "core_explore_oaipmh_app.views.user.ajax.oai_registry_cache_api.get_generation",
+        return_value="generation",
+    )
+    @patch(
+        "core_explore_oaipmh_app.views.user.ajax.oai_registry_cache_api.get_activated_registry_list"
+    )
+    @patch("core_explore_oaipmh_app.views.user.ajax.api_query.get_by_id")
+    def test_checked_instances_are_sent_as_json(
+        self, mock_query_get_by_id, mock_get_activated_registry_list, *mocks
+    ):
+        """test_checked_instances_are_sent_as_json"""
+        mock_query_get_by_id.return_value = MagicMock(
+            data_sources=[{"query_options": {"instance_id": "2"}}]
+        )
+        mock_get_activated_registry_list.return_value = [
+            {"instance_id": 1, "instance_name": "registry 1"},
+            {"instance_id": 2, "instance_name": "registry 2"},
+        ]
+
+        content = self._send_request().content.decode()
+
+        self.assertIn("registry 2", content)
+        self.assertIn(
+            '<script id="checked-instances-oaipmh" type="application/json">["2"]</script>',
+            content,
+        )
+        self.assertNotIn("checked\n", content)
+        # the fragment checks the data sources of the query itself
+        self.assertIn('$("#checked-instances-oaipmh").text()', content)
+
+    @patch(
+        "core_explore_oaipmh_app.views.user.ajax.oai_registry_cache_api.get_generation",
+        return_value="generation",
+    )
+    @patch(
+        "core_explore_oaipmh_app.views.user.ajax.oai_registry_cache_api.get_activated_registry_list"
+    )
+    @patch("core_explore_oaipmh_app.views.user.ajax.api_query.get_by_id")
+    def test_fragment_is_shared_within_a_generation(
+        self,
+        mock_query_get_by_id,
+        mock_get_activated_registry_list,
+        mock_get_generation,
+    ):
+        """test_fragment_is_shared_within_a_generation"""
+        mock_query_get_by_id.return_value = MagicMock(data_sources=[])
+        mock_get_activated_registry_list.return_value = [
+            {"instance_id": 1, "instance_name": "registry 1"}
+        ]
+        self._send_request()
+        mock_get_activated_registry_list.return_value = [
+            {"instance_id": 1, "instance_name": "renamed"}
+        ]
+
+        self.assertIn("registry 1", self._send_request().content.decode())
+        mock_get_generation.return_value = "new_generation"
+        self.assertIn("renamed", self._send_request().content.decode())
+
+
+@patch(
+    "core_explore_oaipmh_app.views.user.ajax.oai_registry_cache_api.get_activated_registry_list"
+)
+@patch("core_explore_oaipmh_app.views.user.ajax.api_query.get_by_id")
+class TestGetDataSourceListOaipmhJson(TestCase):
+    """Test get_data_source_list_oaipmh_json function"""
+
+    def setUp(self):
+        """setUp"""
+        self.factory = RequestFactory()
+        self.user = create_mock_user(user_id="1")
+
+    def _send_request(self, data=None, **extra):
+        """_send_request"""
+        request = self.factory.get(
+            "core_explore_oaipmh_app_get_data_source_list", data=data, **extra
+        )
+        request.user = self.user
+
+        return get_data_source_list_oaipmh_json(request)
+
+    def _set_data_sources(
+        self, mock_query_get_by_id, mock_get_activated_registry_list
+    ):
+        """_set_data_sources"""
+        mock_query_get_by_id.return_value = MagicMock(
+            data_sources=[{"query_options": {"instance_id": "2"}}]
+        )
+        mock_get_activated_registry_list.return_value = [
+            {"instance_id": 1, "instance_name": "registry 1"},
+            {"instance_id": 2, "instance_name": "registry 2"},
+        ]
+
+    def test_id_query_none_returns_400(self, *mocks):
+        """test_id_query_none_returns_400"""
+        self.assertEqual(
+            self._send_request().status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_returns_instances_with_checked_state(
+        self, mock_query_get_by_id, mock_get_activated_registry_list
+    ):
+        """test_returns_instances_with_checked_state"""
+        self._set_data_sources(
+            mock_query_get_by_id, mock_get_activated_registry_list
+        )
+
+        response = self._send_request({"id_query": "1"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            [
+                {
+                    "instance_id": 1,
+                    "instance_name": "registry 1",
+                    "is_checked": False,
+                },
+                {
+                    "instance_id": 2,
+                    "instance_name": "registry 2",
+                    "is_checked": True,
+                },
+            ],
+        )
+
+    def test_matching_etag_returns_304(
+        self, mock_query_get_by_id, mock_get_activated_registry_list
+    ):
+        """test_matching_etag_returns_304"""
+        self._set_data_sources(
+            mock_query_get_by_id, mock_get_activated_registry_list
+        )
+        etag = self._send_request({"id_query": "1"})["ETag"]
+
+        response = self._send_request(
+            {"id_query": "1"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_selection_change_changes_etag(
+        self, mock_query_get_by_id, mock_get_activated_registry_list
+    ):
+        """test_selection_change_changes_etag"""
+        self._set_data_sources(
+            mock_query_get_by_id, mock_get_activated_registry_list
+        )
+        etag = self._send_request({"id_query": "1"})["ETag"]
+        mock_query_get_by_id.return_value = MagicMock(data_sources=[])
+
+        response = self._send_request(
+            {"id_query": "1"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
 class TestUpdateDataSourceListOaipmh(TestCase):
     """Test update_data_source_list_oaipmh function"""
 
@@ -294,6 +473,98 @@ class TestUpdateDataSourceListOaipmh(TestCase):
         )
 
 
+class TestSetDataSourceListOaipmh(TestCase):
+    """Test set_data_source_list_oaipmh function"""
+
+    def setUp(self):
+        """setUp"""
+        self.factory = RequestFactory()
+        self.view = "core_explore_oaipmh_app_set_data_sources"
+        self.user = create_mock_user(user_id="1")
+
+    def _send_request(self, data: dict = None):
+        """_send_request"""
+        request = self.factory.post(self.view)
+        request.user = self.user
+        request.POST = {} if not data else data
+
+        return set_data_source_list_oaipmh(request)
+
+    def test_instance_ids_none_returns_400(self):
+        """test_instance_ids_none_returns_400"""
+        self.assertEqual(
+            self._send_request({"id_query": "1"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    @patch(
+        "core_explore_oaipmh_app.views.user.ajax.oai_registry_api.get_all_activated_registry"
+    )
+    @patch("core_explore_oaipmh_app.views.user.ajax.api_query.get_by_id")
+    def test_unknown_registry_returns_400(
+        self, mock_query_get_by_id, mock_get_all_activated_registry
+    ):
+        """test_unknown_registry_returns_400"""
+        mock_get_all_activated_registry.return_value = [
+            OaiRegistry(id=1, name="registry 1")
+        ]
+
+        self.assertEqual(
+            self._send_request(
+                {"id_query": "1", "instance_ids": json.dumps(["1", "2"])}
+            ).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    @patch(
+        "core_explore_oaipmh_app.views.user.ajax.oaipmh_query_api.update_oaipmh_data_sources"
+    )
+    @patch(
+        "core_explore_oaipmh_app.views.user.ajax.oai_registry_api.get_all_activated_registry"
+    )
+    @patch("core_explore_oaipmh_app.views.user.ajax.api_query.get_by_id")
+    def test_selected_data_sources_are_set_at_once(
+        self,
+        mock_query_get_by_id,
+        mock_get_all_activated_registry,
+        mock_update_oaipmh_data_sources,
+    ):
+        """test_selected_data_sources_are_set_at_once"""
+        mock_query_get_by_id.return_value = "mock_query"
+        mock_get_all_activated_registry.return_value = [
+            OaiRegistry(id=1, name="registry 1"),
+            OaiRegistry(id=2, name="registry 2"),
+            OaiRegistry(id=3, name="registry 3"),
+        ]
+
+        response = self._send_request(
+            {"id_query": "1", "instance_ids": json.dumps(["1", "3"])}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_update_oaipmh_data_sources.assert_called_once()
+        data_sources = mock_update_oaipmh_data_sources.call_args.args[1]
+        self.assertEqual(
+            [
+                data_source["query_options"]["instance_id"]
+                for data_source in data_sources
+            ],
+            ["1", "3"],
+        )
+
+    @patch("core_explore_oaipmh_app.views.user.ajax.api_query.get_by_id")
+    def test_query_acl_error_returns_403(self, mock_query_get_by_id):
+        """test_query_acl_error_returns_403"""
+        mock_query_get_by_id.side_effect = AccessControlError("error")
+
+        self.assertEqual(
+            self._send_request(
+                {"id_query": "1", "instance_ids": json.dumps([])}
+            ).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+
 class TestChangeDataDisplayOaipmh(TestCase):
     """Test change_data_display function"""
 
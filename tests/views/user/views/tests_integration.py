@@ -0,0 +1,247 @@
+"""Integration tests on views"""
+
+import json
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from rest_framework import status
+
+from core_explore_oaipmh_app.utils import cache as cache_utils
+from core_explore_oaipmh_app.utils.xslt import get_xslt_pool_stats
+from core_explore_oaipmh_app.views.user.ajax import change_data_display_async
+from core_explore_oaipmh_app.views.user.views import (
+    data_detail,
+    data_detail_async,
+)
+from core_main_app.components.template.models import Template
+from core_main_app.utils.datetime import datetime_now
+from core_main_app.utils.integration_tests.integration_base_test_case import (
+    IntegrationBaseTestCase,
+)
+from core_main_app.utils.tests_tools.MockUser import create_mock_user
+from core_oaipmh_harvester_app.components.oai_harvester_metadata_format.models import (
+    OaiHarvesterMetadataFormat,
+)
+from core_oaipmh_harvester_app.components.oai_record.models import OaiRecord
+
+
+@patch("core_explore_oaipmh_app.views.user.views.oai_record_api.get_by_id")
+class TestDataDetail(IntegrationBaseTestCase):
+    """TestDataDetail"""
+
+    def setUp(self):
+        """setUp"""
+        cache_utils.clear_all()
+        self.factory = RequestFactory()
+        self.user = create_mock_user(user_id="1")
+        self.record = OaiRecord(
+            identifier="oai:test/id.0006",
+            last_modification_date=datetime_now(),
+        )
+        self.record.harvester_metadata_format = OaiHarvesterMetadataFormat()
+        self.record.harvester_metadata_format.template = Template(
+            id=1, format="XSD"
+        )
+        self.record.xml_content = "<test><message>Hello</message></test>"
+        pid_settings_patcher = patch(
+            "core_linked_records_app.system.pid_settings.api.get",
+            return_value=MagicMock(auto_set_pid=False),
+        )
+        pid_settings_patcher.start()
+        self.addCleanup(pid_settings_patcher.stop)
+
+    def _get(self):
+        """Send a GET request to the detail page"""
+        request = self.factory.get("core_explore_oaipmh_app_data_detail")
+        request.user = self.user
+        request.GET = {"id": "1"}
+        return data_detail(request)
+
+    def test_content_is_rendered_with_the_detail_xslt(self, mock_get_by_id):
+        """test_content_is_rendered_with_the_detail_xslt"""
+        mock_get_by_id.return_value = self.record
+
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Hello", response.content.decode())
+
+    def test_compiled_xslt_is_reused(self, mock_get_by_id):
+        """test_compiled_xslt_is_reused"""
+        mock_get_by_id.return_value = self.record
+
+        self._get()
+        self._get()
+
+        self.assertEqual(get_xslt_pool_stats()["compiles"], 1)
+        self.assertEqual(get_xslt_pool_stats()["reuses"], 1)
+
+
+class TestDataDetailAsync(TestDataDetail):
+    """TestDataDetailAsync"""
+
+    def _get(self):
+        """Send a GET request to the async detail page"""
+        request = self.factory.get("core_explore_oaipmh_app_data_detail_async")
+        request.user = self.user
+        request.auser = _get_auser(self.user)
+        request.GET = {"id": "1"}
+        return async_to_sync(data_detail_async)(request)
+
+
+@patch("core_explore_oaipmh_app.views.user.views.oai_record_api.get_by_id")
+class TestDataDetailTemplate(IntegrationBaseTestCase):
+    """TestDataDetailTemplate"""
+
+    def setUp(self):
+        """setUp"""
+        TestDataDetail.setUp(self)
+
+    def _get(self):
+        """Send a GET request to the detail page"""
+        return TestDataDetail._get(self)
+
+    def test_json_content_is_rendered_by_main_app_template(
+        self, mock_get_by_id
+    ):
+        """test_json_content_is_rendered_by_main_app_template"""
+        self.record.harvester_metadata_format.template.format = "JSON"
+        self.record.xml_content = '{"message": "Hello"}'
+        mock_get_by_id.return_value = self.record
+
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('class="display-detail"', response.content.decode())
+        self.assertEqual(get_xslt_pool_stats()["compiles"], 0)
+
+
+@patch("core_explore_oaipmh_app.views.user.views.oai_record_api.get_by_id")
+class TestDataDetailEtag(IntegrationBaseTestCase):
+    """TestDataDetailEtag"""
+
+    def setUp(self):
+        """setUp"""
+        TestDataDetail.setUp(self)
+        self.xslt = ("xslt_id", "<xsl:stylesheet/>")
+        xslt_patcher = patch(
+            "core_explore_oaipmh_app.utils.xslt.get_detail_xslt",
+            side_effect=lambda **kwargs: self.xslt,
+        )
+        xslt_patcher.start()
+        self.addCleanup(xslt_patcher.stop)
+
+    def _get(self, etag=None):
+        """Send a GET request to the detail page"""
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        request = self.factory.get(
+            "core_explore_oaipmh_app_data_detail", **headers
+        )
+        request.user = self.user
+        request.GET = {"id": "1"}
+        return data_detail(request)
+
+    def test_matching_etag_returns_304(self, mock_get_by_id):
+        """test_matching_etag_returns_304"""
+        mock_get_by_id.return_value = self.record
+        etag = self._get()["ETag"]
+
+        response = self._get(etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_not_modified_response_does_not_read_content(self, mock_get_by_id):
+        """test_not_modified_response_does_not_read_content"""
+        mock_get_by_id.return_value = self.record
+        etag = self._get()["ETag"]
+
+        with patch.object(
+            OaiRecord, "content", new_callable=PropertyMock
+        ) as mock_content:
+            response = self._get(etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        mock_content.assert_not_called()
+
+    def test_etag_changes_when_xslt_is_edited(self, mock_get_by_id):
+        """test_etag_changes_when_xslt_is_edited"""
+        mock_get_by_id.return_value = self.record
+        etag = self._get()["ETag"]
+        self.xslt = ("xslt_id", "<xsl:stylesheet version='2.0'/>")
+
+        response = self._get(etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_changes_when_xslt_is_replaced(self, mock_get_by_id):
+        """test_etag_changes_when_xslt_is_replaced"""
+        mock_get_by_id.return_value = self.record
+        etag = self._get()["ETag"]
+        self.xslt = ("other_xslt_id", self.xslt[1])
+
+        response = self._get(etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class TestDataDetailEtagAsync(TestDataDetailEtag):
+    """TestDataDetailEtagAsync"""
+
+    def _get(self, etag=None):
+        """Send a GET request to the async detail page"""
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        request = self.factory.get(
+            "core_explore_oaipmh_app_data_detail_async", **headers
+        )
+        request.user = self.user
+        request.auser = _get_auser(self.user)
+        request.GET = {"id": "1"}
+        return async_to_sync(data_detail_async)(request)
+
+
+@patch("core_explore_oaipmh_app.views.user.ajax.oai_record_api.get_by_id")
+class TestChangeDataDisplayAsync(TestDataDetail):
+    """TestChangeDataDisplayAsync"""
+
+    def _get(self):
+        """Send a POST request to the async change data display view"""
+        request = self.factory.post(
+            "core_explore_oaipmh_app_change_data_display_async",
+            data={"data_id": "1"},
+        )
+        request.user = self.user
+        request.auser = _get_auser(self.user)
+        return async_to_sync(change_data_display_async)(request)
+
+    def test_content_is_rendered_with_the_detail_xslt(
+        self, mock_ajax_get_by_id
+    ):
+        """test_content_is_rendered_with_the_detail_xslt"""
+        mock_ajax_get_by_id.return_value = self.record
+
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Hello", json.loads(response.content)["template"])
+
+    def test_compiled_xslt_is_reused(self, mock_ajax_get_by_id):
+        """test_compiled_xslt_is_reused"""
+        mock_ajax_get_by_id.return_value = self.record
+
+        self._get()
+        self._get()
+
+        self.assertEqual(get_xslt_pool_stats()["compiles"], 1)
+        self.assertEqual(get_xslt_pool_stats()["reuses"], 1)
+
+
+def _get_auser(user):
+    """Return the async user getter of a request"""
+
+    async def auser():
+        return user
+
+    return auser